@@ -1,16 +1,41 @@
 import json
 import time
 from datetime import timedelta
+from functools import partial
 import logging
-from src.logging_config import setup_logging
+from src.logging_config import set_log_trace_id, setup_logging
 
 from src.core.entities.release import Release
+from src.core.entities.trace_context import PROFILE_ATTRIBUTE, TraceContext
+from src.core.use_cases.invocation_profiler import InvocationProfiler
 from src.core.use_cases.message_queuer import MessageQueuer
+from src.core.use_cases.nca_parquet_exporter import NCAParquetExporter
+from src.core.use_cases.page_cost_estimator import PageCostEstimator
 from src.core.use_cases.release_batcher import ReleaseBatcher
+from src.core.use_cases.span_tracer import SpanTracer
 
-from src.infrastructure.adapters.sqs_queue import SQSQueue
+from src.infrastructure.adapter_factory import (
+    create_columnar,
+    create_metrics,
+    create_parser,
+    create_queue,
+    create_span_recorder,
+    create_storage,
+)
 from src.infrastructure.config import settings
-from src.infrastructure.constants import BATCH_SIZE
+from src.infrastructure.constants import (
+    AVG_PAGE_DURATION_S,
+    BATCH_SIZE,
+    BATCH_TARGET_DURATION_S,
+    EXPORT_STORAGE_PREFIX,
+    MAX_BATCH_SIZE,
+    ORCHESTRATOR_FUNCTION_NAME,
+    PROFILE_STORAGE_PREFIX,
+    PROFILE_TOP_ALLOCATIONS,
+    PROFILE_TOP_FUNCTIONS,
+)
+from src.infrastructure.lazy_adapter import lazy
+from src.infrastructure.sqs_event import get_message_attributes
 
 # <test>
 NUMBER_OF_BATCHES_TO_QUEUE = None
@@ -20,48 +45,94 @@ NUMBER_OF_BATCHES_TO_QUEUE = None
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# adapters
-queue = SQSQueue(queue_url=settings.AWS_SQS_RELEASE_BATCH_QUEUE_URL)
+# adapters (built on first use)
+queue = lazy(partial(create_queue, queue_url=settings.AWS_SQS_RELEASE_BATCH_QUEUE_URL))
+storage = lazy(create_storage)
+parser = lazy(create_parser)
+columnar = lazy(create_columnar)
+metrics = create_metrics(ORCHESTRATOR_FUNCTION_NAME)
+span_recorder = create_span_recorder(ORCHESTRATOR_FUNCTION_NAME)
 
 # use cases
-queuer_job = MessageQueuer(queue=queue)
-batcher_job = ReleaseBatcher(batch_size=BATCH_SIZE)
+queuer_job = MessageQueuer(queue=queue, metrics=metrics)
+page_cost_estimator_job = PageCostEstimator(
+    storage=storage, parser=parser, metrics=metrics
+)
+batcher_job = ReleaseBatcher(
+    batch_size=BATCH_SIZE,
+    target_batch_duration_s=BATCH_TARGET_DURATION_S,
+    avg_page_duration_s=AVG_PAGE_DURATION_S,
+    max_batch_size=MAX_BATCH_SIZE,
+)
+exporter_job = NCAParquetExporter(
+    storage=storage, columnar=columnar, storage_prefix=EXPORT_STORAGE_PREFIX
+)
+tracer = SpanTracer(recorder=span_recorder, function_name=ORCHESTRATOR_FUNCTION_NAME)
+profiler_job = InvocationProfiler(
+    storage=storage,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    storage_prefix=PROFILE_STORAGE_PREFIX,
+    top_functions=PROFILE_TOP_FUNCTIONS,
+    top_allocations=PROFILE_TOP_ALLOCATIONS,
+)
+
+
+def queue_release_batches(release: Release, trace: TraceContext) -> None:
+    # a new or changed release is exported from scratch by its batches
+    if settings.PARQUET_EXPORT:
+        exporter_job.clear(release)
+
+    # page cost estimator
+    page_costs = page_cost_estimator_job.run(release)
+
+    # batcher
+    logger.info("Starting batcher job...")
+    batches = batcher_job.run(release, page_costs)
+    logger.info("Batcher job completed.")
+
+    # <test>
+    if NUMBER_OF_BATCHES_TO_QUEUE is not None:
+        batch_count = min(NUMBER_OF_BATCHES_TO_QUEUE, len(batches))
+        batches = batches[:batch_count]
+        logger.info(f"Limiting to {batch_count} batches for testing purposes.")
+    # </test>
+
+    # queuer
+    logger.info("Starting queuer job...")
+    succcess_count = 0
+    for batch in batches:
+        is_queued = queuer_job.run(batch, trace)
+        if is_queued:
+            succcess_count += 1
+    logger.info(
+        f"Successfully queued {succcess_count}/{len(batches)} batches for "
+        f"{release.filename}."
+    )
+    logger.info("Queuer job completed.")
 
 
 def lambda_handler(event, context):
     start_time = time.monotonic()
 
+    # sampled, or forced by a message with the profile attribute
+    profile_session = profiler_job.start(
+        force=any(
+            get_message_attributes(record).get(PROFILE_ATTRIBUTE) == "true"
+            for record in event.get("Records", [])
+        )
+    )
+    trace = None
     for record in event.get("Records", []):
         try:
             payload = record.get("body")
             if isinstance(payload, str):
                 payload = json.loads(payload)
             release = Release(**payload)
+            trace = tracer.resume_trace(get_message_attributes(record))
+            set_log_trace_id(trace.trace_id)
 
-            # batcher
-            logger.info("Starting batcher job...")
-            batches = batcher_job.run(release)
-            logger.info("Batcher job completed.")
-
-            # <test>
-            if NUMBER_OF_BATCHES_TO_QUEUE is not None:
-                batch_count = min(NUMBER_OF_BATCHES_TO_QUEUE, len(batches))
-                batches = batches[:batch_count]
-                logger.info(f"Limiting to {batch_count} batches for testing purposes.")
-            # </test>
-
-            # queuer
-            logger.info("Starting queuer job...")
-            succcess_count = 0
-            for batch in batches:
-                is_queued = queuer_job.run(batch)
-                if is_queued:
-                    succcess_count += 1
-            logger.info(
-                f"Successfully queued {succcess_count}/{len(batches)} batches for "
-                f"{release.filename}."
-            )
-            logger.info("Queuer job completed.")
+            with tracer.span(trace, "orchestrate", release_id=release.id):
+                queue_release_batches(release, trace)
 
         except Exception as e:
             logger.error(
@@ -69,6 +140,14 @@ def lambda_handler(event, context):
                 exc_info=True,
             )
 
+    metrics.flush()
+    # context is None when invoked locally
+    request_id = getattr(context, "aws_request_id", "local")
+    profiler_job.stop(
+        profile_session,
+        run_id=trace.trace_id if trace else "untraced",
+        name=f"{ORCHESTRATOR_FUNCTION_NAME}-{request_id}",
+    )
     end_time = time.monotonic()
     elapsed_time = timedelta(seconds=end_time - start_time)
     logger.info(f"Total elapsed time: {elapsed_time}")
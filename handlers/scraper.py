@@ -1,38 +1,47 @@
 import time
 import logging
 from datetime import timedelta
+from functools import partial
 
 from src.core.use_cases.enable_lambda_triggers import EnableLambdaTriggers
-from src.infrastructure.adapters.bs4_scraper import Bs4Scraper
-from src.infrastructure.adapters.lambda_serverless_function import (
-    LambdaServerlessFunction,
+from src.infrastructure.adapter_factory import (
+    create_metrics,
+    create_parser,
+    create_queue,
+    create_repository,
+    create_scraper,
+    create_serverless_function,
+    create_span_recorder,
+    create_storage,
 )
-from src.logging_config import setup_logging
+from src.infrastructure.lazy_adapter import lazy
+from src.logging_config import set_log_trace_id, setup_logging
+from src.core.use_cases.invocation_profiler import InvocationProfiler
 from src.core.use_cases.message_queuer import MessageQueuer
 from src.core.use_cases.releases_scraper import ReleasesScraper
-from src.infrastructure.adapters.s3_storage import S3Storage
-from src.infrastructure.adapters.sqs_queue import SQSQueue
+from src.core.use_cases.span_tracer import SpanTracer
 from src.infrastructure.config import settings
-
-from src.infrastructure.adapters.supabase_repository import SupabaseRepository
-from src.infrastructure.adapters.pdf_parser import PDFParser
 from src.infrastructure.constants import (
-    BASE_STORAGE_PATH,
-    DB_BULK_SIZE,
     ORCHESTRATOR_FUNCTION_NAME,
+    PROFILE_STORAGE_PREFIX,
+    PROFILE_TOP_ALLOCATIONS,
+    PROFILE_TOP_FUNCTIONS,
+    SCRAPER_FUNCTION_NAME,
     WORKER_FUNCTION_NAME,
 )
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# adapters
-serverless_function = LambdaServerlessFunction()
-scraper = Bs4Scraper()
-parser = PDFParser()
-storage = S3Storage(base_storage_path=BASE_STORAGE_PATH)
-repository = SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
-queue = SQSQueue(queue_url=settings.AWS_SQS_RELEASE_QUEUE_URL)
+# adapters (built on first use)
+serverless_function = lazy(create_serverless_function)
+scraper = lazy(create_scraper)
+parser = lazy(create_parser)
+storage = lazy(create_storage)
+repository = lazy(create_repository)
+queue = lazy(partial(create_queue, queue_url=settings.AWS_SQS_RELEASE_QUEUE_URL))
+metrics = create_metrics(SCRAPER_FUNCTION_NAME)
+span_recorder = create_span_recorder(SCRAPER_FUNCTION_NAME)
 
 # use cases
 enable_triggers_job = EnableLambdaTriggers(serverless_function=serverless_function)
@@ -41,8 +50,18 @@ scraper_job = ReleasesScraper(
     parser=parser,
     storage=storage,
     repository=repository,
+    metrics=metrics,
+    staged_reload=settings.STAGED_RELOAD,
+)
+queuer_job = MessageQueuer(queue=queue, metrics=metrics)
+tracer = SpanTracer(recorder=span_recorder, function_name=SCRAPER_FUNCTION_NAME)
+profiler_job = InvocationProfiler(
+    storage=storage,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    storage_prefix=PROFILE_STORAGE_PREFIX,
+    top_functions=PROFILE_TOP_FUNCTIONS,
+    top_allocations=PROFILE_TOP_ALLOCATIONS,
 )
-queuer_job = MessageQueuer(queue=queue)
 
 TARGET_FUNCTIONS = [ORCHESTRATOR_FUNCTION_NAME, WORKER_FUNCTION_NAME]
 
@@ -50,27 +69,42 @@ TARGET_FUNCTIONS = [ORCHESTRATOR_FUNCTION_NAME, WORKER_FUNCTION_NAME]
 def lambda_handler(event, context):
     start_time = time.monotonic()
 
+    # the trace (run) id follows every release and batch of this scrape
+    trace = tracer.start_trace()
+    set_log_trace_id(trace.trace_id)
+    logger.info(f"Starting trace {trace.trace_id}")
+    profile_session = profiler_job.start()
+
     # enable lambda triggers
     logger.info("Starting Lambda Trigger Management Job...")
     for function_name in TARGET_FUNCTIONS:
         enable_triggers_job.run(function_name)
     logger.info("Lambda Trigger Management Job completed successfully.")
 
-    # scrape
-    logger.info("Starting Scraping Job...")
-    releases = scraper_job.run(oldest_release_year=2024)
-    logger.info("Scraper Job completed successfully.")
+    with tracer.span(trace, "scrape"):
+        # scrape
+        logger.info("Starting Scraping Job...")
+        releases = scraper_job.run(oldest_release_year=2024)
+        logger.info("Scraper Job completed successfully.")
 
-    # queue
-    logger.info("Starting Queueing Job...")
-    success_count = 0
-    for release in releases:
-        is_queued = queuer_job.run(release)
-        if is_queued:
-            success_count += 1
-    logger.info(f"Successfully queued {success_count}/{len(releases)} releases.")
-    logger.info("Queuer completed successfully.")
+        # queue
+        logger.info("Starting Queueing Job...")
+        success_count = 0
+        for release in releases:
+            is_queued = queuer_job.run(release, trace)
+            if is_queued:
+                success_count += 1
+        logger.info(f"Successfully queued {success_count}/{len(releases)} releases.")
+        logger.info("Queuer completed successfully.")
 
+    metrics.flush()
+    # context is None when invoked locally
+    request_id = getattr(context, "aws_request_id", "local")
+    profiler_job.stop(
+        profile_session,
+        run_id=trace.trace_id,
+        name=f"{SCRAPER_FUNCTION_NAME}-{request_id}",
+    )
     end_time = time.monotonic()
     elapsed_time = timedelta(seconds=end_time - start_time)
     logger.info(f"Total elapsed time: {elapsed_time}")
@@ -3,11 +3,9 @@ import json
 import logging
 import time
 
+from src.core.interfaces.serverless_function import ServerlessFunctionProvider
 from src.core.use_cases.disable_lambda_triggers import DisableLambdaTriggers
-
-from src.infrastructure.adapters.lambda_serverless_function import (
-    LambdaServerlessFunction,
-)
+from src.infrastructure.lazy_adapter import lazy
 
 from src.logging_config import setup_logging
 
@@ -19,8 +17,21 @@ from src.infrastructure.constants import (
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# adapters
-serverless_function = LambdaServerlessFunction()
+
+def create_serverless_function() -> ServerlessFunctionProvider:
+    """
+    not the adapter_factory one: teardown is deployed without pydantic,
+    boto3 is imported on the first alarm instead of at init
+    """
+    from src.infrastructure.adapters.lambda_serverless_function import (
+        LambdaServerlessFunction,
+    )
+
+    return LambdaServerlessFunction()
+
+
+# adapters (built on first use)
+serverless_function = lazy(create_serverless_function)
 
 # use cases
 disable_triggers_job = DisableLambdaTriggers(serverless_function=serverless_function)
@@ -1,53 +1,223 @@
-from io import BytesIO
 import json
 import time
 import logging
 from datetime import timedelta
+from functools import partial
+from src.core.entities.nca_data import NCAData
 from src.core.entities.release_batch import ReleaseBatch
+from src.core.entities.trace_context import PROFILE_ATTRIBUTE, TraceContext
 from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.invocation_profiler import InvocationProfiler
+from src.core.use_cases.message_queuer import MessageQueuer
+from src.core.use_cases.nca_data_spooler import NCADataSpooler
 from src.core.use_cases.nca_db_loader import NCADBLoader
-from src.core.use_cases.raw_table_cleaner import RawTableCleaner
+from src.core.use_cases.nca_parquet_exporter import NCAParquetExporter
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.pipelined_batch_processor import PipelinedBatchProcessor
+from src.core.use_cases.raw_table_cache import RawTableCache
 from src.core.use_cases.raw_table_extractor import RawTableExtractor
-from src.infrastructure.adapters.s3_storage import S3Storage
-from src.logging_config import setup_logging
-
-from src.infrastructure.adapters.supabase_repository import SupabaseRepository
-from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
-from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.core.use_cases.release_batch_splitter import ReleaseBatchSplitter
+from src.core.use_cases.span_tracer import SpanTracer
+from src.core.use_cases.spool_loader import SpoolLoader
+from src.infrastructure.adapter_factory import (
+    create_columnar,
+    create_data_cleaner,
+    create_metrics,
+    create_parser,
+    create_queue,
+    create_repository,
+    create_span_recorder,
+    create_storage,
+)
+from src.infrastructure.config import settings
+from src.logging_config import set_log_trace_id, setup_logging
 from src.infrastructure.constants import (
-    ALLOCATION_COLUMNS,
-    BASE_STORAGE_PATH,
-    DB_BULK_SIZE,
-    RECORD_COLUMNS,
-    VALID_COLUMNS,
+    EXPORT_STORAGE_PREFIX,
+    PIPELINE_CHUNK_PAGES,
+    PIPELINE_QUEUE_SIZE,
+    PROFILE_STORAGE_PREFIX,
+    PROFILE_TOP_ALLOCATIONS,
+    PROFILE_TOP_FUNCTIONS,
+    RAW_CACHE_STORAGE_PREFIX,
+    SPOOL_LOAD_ROWS,
+    SPOOL_MERGE_LEASE_S,
+    SPOOL_MERGE_MAX_ATTEMPTS,
+    SPOOL_MERGE_MIN_REMAINING_MS,
+    SPOOL_STORAGE_PREFIX,
+    STITCH_LOOKAHEAD_PAGES,
+    WORKER_DEADLINE_MARGIN_MS,
+    WORKER_FUNCTION_NAME,
 )
+from src.infrastructure.lazy_adapter import lazy
+from src.infrastructure.sqs_event import get_message_attributes
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# adapters
-storage = S3Storage(base_storage_path=BASE_STORAGE_PATH)
-parser = PDFParser()
-data_cleaner = PdDataCleaner(
-    allocation_comumns=ALLOCATION_COLUMNS,
-    record_columns=RECORD_COLUMNS,
-    valid_columns=VALID_COLUMNS,
-)
-repository = SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
+# adapters (built on first use)
+storage = lazy(create_storage)
+parser = lazy(create_parser)
+data_cleaner = lazy(create_data_cleaner)
+repository = lazy(create_repository)
+columnar = lazy(create_columnar)
+queue = lazy(partial(create_queue, queue_url=settings.AWS_SQS_RELEASE_BATCH_QUEUE_URL))
+metrics = create_metrics(WORKER_FUNCTION_NAME)
+span_recorder = create_span_recorder(WORKER_FUNCTION_NAME)
 
 # use cases
-file_bytes_loader_job = FileBytesMemoLoader(storage=storage)
-extractor_job = RawTableExtractor(storage=storage, parser=parser)
-cleaner_job = RawTableCleaner(data_cleaner=data_cleaner)
+file_bytes_loader_job = FileBytesMemoLoader(storage=storage, metrics=metrics)
+# raw tables cached for re-cleaning (src/reclean.py) without re-parsing
+raw_cache = (
+    RawTableCache(
+        storage=storage, parser=parser, storage_prefix=RAW_CACHE_STORAGE_PREFIX
+    )
+    if settings.RAW_CACHE_ENABLED
+    else None
+)
+extractor_job = RawTableExtractor(
+    storage=storage, parser=parser, metrics=metrics, cache=raw_cache
+)
+page_cleaner_job = PageTableCleaner(data_cleaner=data_cleaner, metrics=metrics)
+continuation_reader_job = PageContinuationReader(
+    extractor=extractor_job,
+    page_cleaner=page_cleaner_job,
+    max_lookahead_pages=STITCH_LOOKAHEAD_PAGES,
+)
+stitcher_job = PageStitcher(data_cleaner=data_cleaner, metrics=metrics)
 db_loader_job = NCADBLoader(
     data_cleaner=data_cleaner,
     repository=repository,
+    metrics=metrics,
+)
+spooler_job = NCADataSpooler(
+    storage=storage, storage_prefix=SPOOL_STORAGE_PREFIX, metrics=metrics
+)
+spool_loader_job = SpoolLoader(
+    storage=storage,
+    repository=repository,
+    storage_prefix=SPOOL_STORAGE_PREFIX,
+    load_rows=SPOOL_LOAD_ROWS,
+    lease_duration_s=SPOOL_MERGE_LEASE_S,
+    metrics=metrics,
+)
+# spool mode: batches go to storage, the release is loaded once complete
+loader_job = spooler_job if settings.SPOOL_MODE else db_loader_job
+# pyarrow doesn't fit the lambda package next to pandas (over the 250MB
+# unzipped limit), the worker exports when run locally (src.local_queue_runner)
+if settings.PARQUET_EXPORT and settings.AWS_LAMBDA_FUNCTION_NAME:
+    raise ValueError(
+        "PARQUET_EXPORT is not supported on the worker lambda, "
+        "export with src.local_queue_runner instead"
+    )
+exporter_job = (
+    NCAParquetExporter(
+        storage=storage,
+        columnar=columnar,
+        storage_prefix=EXPORT_STORAGE_PREFIX,
+        metrics=metrics,
+    )
+    if settings.PARQUET_EXPORT
+    else None
+)
+pipeline_job = PipelinedBatchProcessor(
+    extractor=extractor_job,
+    page_cleaner=page_cleaner_job,
+    continuation_reader=continuation_reader_job,
+    stitcher=stitcher_job,
+    db_loader=loader_job,
+    chunk_pages=PIPELINE_CHUNK_PAGES,
+    queue_size=PIPELINE_QUEUE_SIZE,
+    exporter=exporter_job,
+)
+queuer_job = MessageQueuer(queue=queue, metrics=metrics)
+splitter_job = ReleaseBatchSplitter()
+tracer = SpanTracer(recorder=span_recorder, function_name=WORKER_FUNCTION_NAME)
+profiler_job = InvocationProfiler(
+    storage=storage,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    storage_prefix=PROFILE_STORAGE_PREFIX,
+    top_functions=PROFILE_TOP_FUNCTIONS,
+    top_allocations=PROFILE_TOP_ALLOCATIONS,
 )
 
 
+def has_time_for_next_page(context, page_durations_ms: list) -> bool:
+    """
+    keep the margin free for cleaning/loading the finished pages
+    and re-enqueueing the rest, plus room for one average page.
+    the first page is always read, so a re-enqueued remainder (e.g.
+    after a slow cold start) still makes progress
+    """
+    if context is None or not page_durations_ms:
+        return True
+    avg_page_ms = (
+        sum(page_durations_ms) / len(page_durations_ms) if page_durations_ms else 0
+    )
+    remaining_ms = context.get_remaining_time_in_millis()
+    return remaining_ms > WORKER_DEADLINE_MARGIN_MS + avg_page_ms
+
+
+def requeue_remaining_pages(
+    batch: ReleaseBatch, next_page_num: int, trace: TraceContext
+) -> None:
+    remaining_batch = splitter_job.run(batch, next_page_num)
+    if not remaining_batch:
+        return
+    is_queued = queuer_job.run(remaining_batch, trace)
+    if not is_queued:
+        logger.error(
+            f"Failed to re-enqueue {batch.release.filename} "
+            f"batch-{batch.batch_id} pages "
+            f"{remaining_batch.start_page_num}-"
+            f"{remaining_batch.end_page_num}"
+        )
+
+
+def merge_spool(batch: ReleaseBatch, context, trace: TraceContext) -> None:
+    """
+    merge the release's spool once every page is in, a merge without the
+    time left to finish (or that fails) is queued again as its own message
+    """
+    if not spool_loader_job.is_complete(batch.release.id):
+        return
+    remaining_ms = context.get_remaining_time_in_millis() if context else None
+    if remaining_ms is None or remaining_ms > SPOOL_MERGE_MIN_REMAINING_MS:
+        if spool_loader_job.run(batch.release.id):
+            return
+        # merged by another loader meanwhile
+        if not spool_loader_job.is_complete(batch.release.id):
+            return
+    else:
+        logger.warning(
+            f"Deadline approaching for {batch.release.filename}: "
+            f"not merging its spool ({remaining_ms}ms left)"
+        )
+
+    attempt = batch.spool_merge_attempt + 1
+    if attempt > SPOOL_MERGE_MAX_ATTEMPTS:
+        logger.error(
+            f"Spool of {batch.release.filename} was not merged after "
+            f"{SPOOL_MERGE_MAX_ATTEMPTS} attempts, run src.load_spool"
+        )
+        return
+    merge_batch = batch.model_copy(update={"spool_merge_attempt": attempt})
+    if not queuer_job.run(merge_batch, trace):
+        logger.error(f"Failed to queue the spool merge of {batch.release.filename}")
+
+
 def lambda_handler(event, context):
     start_time = time.monotonic()
 
+    # sampled, or forced by a message with the profile attribute
+    profile_session = profiler_job.start(
+        force=any(
+            get_message_attributes(record).get(PROFILE_ATTRIBUTE) == "true"
+            for record in event.get("Records", [])
+        )
+    )
+    trace = None
     for record in event.get("Records", []):
         try:
             payload = record.get("body")
@@ -55,56 +225,137 @@ def lambda_handler(event, context):
                 payload = json.loads(payload)
 
             batch = ReleaseBatch(**payload)
+            trace = tracer.resume_trace(get_message_attributes(record))
+            set_log_trace_id(trace.trace_id)
 
-            # file bytes memo loader
-            file_bytes = file_bytes_loader_job.run(batch.release.filename)
-            if not file_bytes:
-                continue
+            with tracer.span(
+                trace,
+                "process",
+                release_id=batch.release.id,
+                batch_num=batch.batch_num,
+                split_num=batch.split_num,
+                start_page_num=batch.start_page_num,
+                end_page_num=batch.end_page_num,
+            ):
+                if batch.spool_merge_attempt:
+                    merge_spool(batch, context, trace)
+                    continue
 
-            # extractor
-            logger.debug(
-                f"Extracting {batch.release.filename} "
-                f"batch-{batch.batch_num} tables..."
-            )
-            extracted_table = []
-            for i in range(batch.start_page_num, batch.end_page_num + 1):
-                table = extractor_job.run(BytesIO(file_bytes), i)
-                if not table:
+                # file bytes memo loader
+                file_bytes = file_bytes_loader_job.run(batch.release.filename)
+                if not file_bytes:
+                    continue
+
+                # pipelined extractor/cleaner -> stitcher -> loader
+                if settings.WORKER_PIPELINE_MODE:
+                    logger.debug(
+                        f"Processing {batch.release.filename} "
+                        f"batch-{batch.batch_id} in pipeline mode..."
+                    )
+                    next_page_num = pipeline_job.run(
+                        batch,
+                        file_bytes,
+                        lambda durations: has_time_for_next_page(context, durations),
+                    )
+                    requeue_remaining_pages(batch, next_page_num, trace)
+                    logger.debug(
+                        f"Loaded {batch.release.filename} batch-{batch.batch_id} "
+                        f"pages {batch.start_page_num}-{next_page_num - 1} to db"
+                    )
+                    if settings.SPOOL_MODE:
+                        merge_spool(batch, context, trace)
+                    continue
+
+                # extractor & page cleaner
+                logger.debug(
+                    f"Extracting {batch.release.filename} "
+                    f"batch-{batch.batch_id} tables..."
+                )
+                pages = []
+                page_durations_ms = []
+                next_page_num = batch.start_page_num
+                while next_page_num <= batch.end_page_num:
+                    if not has_time_for_next_page(context, page_durations_ms):
+                        logger.warning(
+                            f"Deadline approaching for {batch.release.filename} "
+                            f"batch-{batch.batch_id}: "
+                            f"stopping before page-{next_page_num}"
+                        )
+                        break
+
+                    page_num = next_page_num
+                    page_start_time = time.monotonic()
+                    table = extractor_job.run(file_bytes, page_num)
+                    page_durations_ms.append(
+                        (time.monotonic() - page_start_time) * 1000
+                    )
+                    next_page_num += 1
+                    if not table:
+                        logger.warning(
+                            f"No tables extracted for {batch.release.filename} "
+                            f"batch-{batch.batch_id} page-{page_num}"
+                        )
+                        continue
+                    pages.append(
+                        page_cleaner_job.run(table, batch.release.id, page_num)
+                    )
+
+                # re-enqueue unfinished pages before loading the finished ones
+                requeue_remaining_pages(batch, next_page_num, trace)
+
+                page_nums = list(range(batch.start_page_num, next_page_num))
+                if not pages:
                     logger.warning(
                         f"No tables extracted for {batch.release.filename} "
-                        f"batch-{batch.batch_num} page-{i}"
+                        f"batch-{batch.batch_id}"
                     )
+                    if batch.release.reload or settings.SPOOL_MODE:
+                        # the pages still count towards the staged reload
+                        # (or the spooled release)
+                        loader_job.run(
+                            batch.release,
+                            NCAData(records=[], allocations=[]),
+                            batch.batch_num,
+                            page_nums,
+                        )
+                    if settings.SPOOL_MODE:
+                        merge_spool(batch, context, trace)
                     continue
-                extracted_table.extend(table)
-
-            if not extracted_table:
-                logger.warning(
-                    f"No tables extracted for {batch.release.filename} "
-                    f"batch-{batch.batch_num}"
+                logger.debug(
+                    f"Extracted {len(pages)} pages for "
+                    f"{batch.release.filename} batch-{batch.batch_id}"
                 )
-                continue
-            logger.debug(
-                f"Extracted {len(extracted_table)} rows for "
-                f"{batch.release.filename} batch-{batch.batch_num}"
-            )
-            # cleaner
-            logger.debug(
-                f"Cleaning {batch.release.id} batch-{batch.batch_num} tables..."
-            )
-            nca_data = cleaner_job.run(extracted_table, batch.release.id)
-            logger.debug(
-                f"Cleaned data for {batch.release.filename} batch-{batch.batch_num}: "
-                f"{len(nca_data.allocations)} allocations, "
-                f"{len(nca_data.records)} records"
-            )
-            # loader
-            logger.debug(
-                f"Loading {batch.release.id} batch-{batch.batch_num} data to db..."
-            )
-            db_loader_job.run(batch.release, nca_data, batch.batch_num)
-            logger.debug(
-                f"Loaded {batch.release.filename} batch-{batch.batch_num} data to db"
-            )
+                # stitcher
+                logger.debug(
+                    f"Stitching {batch.release.id} batch-{batch.batch_id} pages..."
+                )
+                pages.extend(
+                    continuation_reader_job.run(
+                        file_bytes, batch.release, next_page_num - 1
+                    )
+                )
+                nca_data = stitcher_job.run(pages, batch.release.id)
+                logger.debug(
+                    f"Cleaned data for {batch.release.filename} "
+                    f"batch-{batch.batch_id}: "
+                    f"{len(nca_data.allocations)} allocations, "
+                    f"{len(nca_data.records)} records"
+                )
+                # loader
+                logger.debug(
+                    f"Loading {batch.release.id} batch-{batch.batch_id} data to db..."
+                )
+                loader_job.run(batch.release, nca_data, batch.batch_num, page_nums)
+                logger.debug(
+                    f"Loaded {batch.release.filename} "
+                    f"batch-{batch.batch_id} data to db"
+                )
+                if exporter_job:
+                    exporter_job.run(
+                        batch.release, nca_data, batch.batch_num, page_nums
+                    )
+                if settings.SPOOL_MODE:
+                    merge_spool(batch, context, trace)
 
         except Exception as e:
             logger.error(
@@ -112,6 +363,14 @@ def lambda_handler(event, context):
                 exc_info=True,
             )
 
+    metrics.flush()
+    # context is None when invoked locally
+    request_id = getattr(context, "aws_request_id", "local")
+    profiler_job.stop(
+        profile_session,
+        run_id=trace.trace_id if trace else "untraced",
+        name=f"{WORKER_FUNCTION_NAME}-{request_id}",
+    )
     end_time = time.monotonic()
     elapsed_time = timedelta(seconds=end_time - start_time)
     logger.info(f"Total elapsed time: {elapsed_time}")
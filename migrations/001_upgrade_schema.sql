@@ -0,0 +1,857 @@
+-- bring a database created with an older supabase_schema.sql (uuid keys)
+-- up to the current schema: record and allocation get bigint identity ids,
+-- allocations reference their record by its id instead of the text
+-- nca_number, the indexes that duplicated primary/unique keys are dropped,
+-- the search columns and indexes are added, the summary tables are created
+-- and filled, and the staged reload, work lease and spool merge tables and
+-- functions are created.
+--
+-- run once on a database created with an older supabase_schema.sql, the
+-- rows are kept (allocations are relinked to their records). the tables are
+-- rewritten, run `VACUUM (FULL, ANALYZE) public.record, public.allocation;`
+-- afterwards (outside the transaction) to hand the space back.
+
+BEGIN;
+
+-- ---------------------
+-- keys
+-- ---------------------
+
+ALTER TABLE public.record ADD COLUMN new_id bigint GENERATED ALWAYS AS IDENTITY;
+ALTER TABLE public.allocation ADD COLUMN record_id bigint;
+
+UPDATE public.allocation a
+SET record_id = r.new_id
+FROM public.record r
+WHERE r.nca_number = a.nca_number;
+
+ALTER TABLE public.allocation DROP COLUMN nca_number;
+ALTER TABLE public.allocation DROP COLUMN updated_at;
+ALTER TABLE public.allocation DROP COLUMN id;
+ALTER TABLE public.allocation ADD COLUMN id bigint GENERATED ALWAYS AS IDENTITY;
+ALTER TABLE public.allocation ADD PRIMARY KEY (id);
+
+ALTER TABLE public.record DROP COLUMN id;
+ALTER TABLE public.record RENAME COLUMN new_id TO id;
+ALTER SEQUENCE public.record_new_id_seq RENAME TO record_id_seq;
+ALTER TABLE public.record ADD PRIMARY KEY (id);
+
+ALTER TABLE public.allocation ALTER COLUMN record_id SET NOT NULL;
+ALTER TABLE public.allocation
+  ADD FOREIGN KEY (record_id) REFERENCES public.record(id) ON DELETE CASCADE;
+
+-- ---------------------
+-- indeces
+-- ---------------------
+
+-- duplicates of the primary and unique key indexes
+DROP INDEX IF EXISTS public.idx_release_id;
+DROP INDEX IF EXISTS public.idx_record_id;
+DROP INDEX IF EXISTS public.idx_record_nca_number;
+DROP INDEX IF EXISTS public.idx_allocation_id;
+DROP INDEX IF EXISTS public.idx_allocation_nca_number;
+
+CREATE INDEX IF NOT EXISTS idx_allocation_record_id ON public.allocation(record_id);
+
+-- ---------------------
+-- search
+-- ---------------------
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.record ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(department, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(purpose, '')), 'B')
+) STORED;
+ALTER TABLE public.allocation ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(agency, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(operating_unit, '')), 'B')
+) STORED;
+-- search: the tsvector indexes find whole words, the trigram ones the
+-- substrings that ILIKE '%...%' used to scan the tables for
+CREATE INDEX IF NOT EXISTS idx_record_search_vector ON public.record USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS idx_record_purpose_trgm ON public.record USING gin (purpose gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_record_department_trgm ON public.record USING gin (department gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_allocation_search_vector ON public.allocation USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS idx_allocation_agency_trgm ON public.allocation USING gin (agency gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_allocation_operating_unit_trgm ON public.allocation USING gin (operating_unit gin_trgm_ops);
+
+-- search records by the words (full text) or substrings (trigrams) of their
+-- purpose and department and of their allocations' agency and operating
+-- unit; a page of records by rank, word matches ranked above substring
+-- ones, optionally within a release year
+CREATE OR REPLACE FUNCTION public.search_records(
+  p_query text,
+  p_limit int DEFAULT 20,
+  p_offset int DEFAULT 0,
+  p_year int DEFAULT NULL
+)
+RETURNS TABLE (
+  id bigint,
+  nca_number text,
+  nca_type text,
+  department text,
+  released_date timestamptz,
+  purpose text,
+  release_id text,
+  rank real
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_tsquery tsquery := websearch_to_tsquery('english', p_query);
+  v_pattern text := '%' || replace(replace(replace(
+    p_query, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+  -- trigrams need three characters, shorter queries only match words
+  v_is_substring boolean := length(p_query) >= 3;
+  v_release_ids text[];
+BEGIN
+  IF p_year IS NOT NULL THEN
+    v_release_ids := ARRAY(SELECT rel.id FROM public.release rel WHERE rel.year = p_year);
+  END IF;
+
+  RETURN QUERY
+  WITH hits AS (
+    SELECT r.id AS record_id,
+      ts_rank_cd(r.search_vector, v_tsquery) AS rank
+    FROM public.record r
+    WHERE r.search_vector @@ v_tsquery
+      AND (p_year IS NULL OR r.release_id = ANY (v_release_ids))
+    UNION ALL
+    SELECT a.record_id, ts_rank_cd(a.search_vector, v_tsquery)
+    FROM public.allocation a
+    WHERE a.search_vector @@ v_tsquery
+      AND (p_year IS NULL OR a.record_id IN (
+        SELECT r.id FROM public.record r WHERE r.release_id = ANY (v_release_ids)
+      ))
+    UNION ALL
+    SELECT r.id, 0.1 * word_similarity(p_query, r.department || ' ' || r.purpose)
+    FROM public.record r
+    WHERE v_is_substring
+      AND (p_year IS NULL OR r.release_id = ANY (v_release_ids))
+      AND (r.purpose ILIKE v_pattern OR r.department ILIKE v_pattern)
+    UNION ALL
+    SELECT a.record_id,
+      0.1 * word_similarity(p_query, a.agency || ' ' || a.operating_unit)
+    FROM public.allocation a
+    WHERE v_is_substring
+      AND (p_year IS NULL OR a.record_id IN (
+        SELECT r.id FROM public.record r WHERE r.release_id = ANY (v_release_ids)
+      ))
+      AND (a.agency ILIKE v_pattern OR a.operating_unit ILIKE v_pattern)
+  ),
+  -- the page is cut right after the ranks are summed, only its records
+  -- are read back
+  ranked AS (
+    SELECT h.record_id, sum(h.rank)::real AS rank
+    FROM hits h
+    GROUP BY h.record_id
+    ORDER BY sum(h.rank)::real DESC, h.record_id
+    LIMIT least(p_limit, 100) OFFSET p_offset
+  )
+  SELECT r.id, r.nca_number, r.nca_type, r.department, r.released_date,
+    r.purpose, r.release_id, k.rank
+  FROM ranked k
+  JOIN public.record r ON r.id = k.record_id
+  ORDER BY k.rank DESC, r.id;
+END;
+$$;
+
+-- ---------------------
+-- summaries
+-- ---------------------
+
+-- summaries: totals by department, by agency & operating unit and by month
+-- of released_date, kept up to date by the load functions (through the
+-- deltas below) so dashboards read these instead of scanning allocation
+-- joined to record
+CREATE TABLE IF NOT EXISTS public.summary_department (
+  department text,
+  record_count bigint NOT NULL DEFAULT 0,
+  allocation_count bigint NOT NULL DEFAULT 0,
+  total_amount numeric NOT NULL DEFAULT 0,
+  updated_at timestamptz DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE NULLS NOT DISTINCT (department)
+);
+
+CREATE TABLE IF NOT EXISTS public.summary_agency (
+  agency text NOT NULL,
+  operating_unit text NOT NULL,
+  allocation_count bigint NOT NULL DEFAULT 0,
+  total_amount numeric NOT NULL DEFAULT 0,
+  updated_at timestamptz DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (agency, operating_unit)
+);
+
+-- month is the first day of the released_date's month (dates are loaded
+-- as utc midnights), NULL for records without a released_date
+CREATE TABLE IF NOT EXISTS public.summary_month (
+  month date,
+  record_count bigint NOT NULL DEFAULT 0,
+  allocation_count bigint NOT NULL DEFAULT 0,
+  total_amount numeric NOT NULL DEFAULT 0,
+  updated_at timestamptz DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE NULLS NOT DISTINCT (month)
+);
+
+-- the load functions append their summary changes to these delta tables
+-- instead of updating the summary rows, so concurrent batches never wait on
+-- each other's summary rows; fold_summaries() adds them to the summaries
+-- once a release is loaded
+CREATE TABLE IF NOT EXISTS public.summary_department_delta (
+  department text,
+  record_count bigint NOT NULL DEFAULT 0,
+  allocation_count bigint NOT NULL DEFAULT 0,
+  total_amount numeric NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS public.summary_agency_delta (
+  agency text NOT NULL,
+  operating_unit text NOT NULL,
+  allocation_count bigint NOT NULL DEFAULT 0,
+  total_amount numeric NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS public.summary_month_delta (
+  month date,
+  record_count bigint NOT NULL DEFAULT 0,
+  allocation_count bigint NOT NULL DEFAULT 0,
+  total_amount numeric NOT NULL DEFAULT 0
+);
+
+-- add (p_sign 1) or remove (p_sign -1) records and their allocations from
+-- the summaries: called with -1 before records change or go, and with 1
+-- once they are written; the changes are appended to the summary deltas
+CREATE OR REPLACE FUNCTION public.summarize_records(
+  p_record_ids bigint[],
+  p_sign int
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO public.summary_department_delta (
+    department, record_count, allocation_count, total_amount
+  )
+  SELECT r.department, p_sign * count(DISTINCT r.id), p_sign * count(a.id),
+    p_sign * coalesce(sum(a.amount::numeric), 0)
+  FROM public.record r
+  LEFT JOIN public.allocation a ON a.record_id = r.id
+  WHERE r.id = ANY (p_record_ids)
+  GROUP BY r.department;
+
+  INSERT INTO public.summary_agency_delta (
+    agency, operating_unit, allocation_count, total_amount
+  )
+  SELECT a.agency, a.operating_unit, p_sign * count(*),
+    p_sign * sum(a.amount::numeric)
+  FROM public.record r
+  JOIN public.allocation a ON a.record_id = r.id
+  WHERE r.id = ANY (p_record_ids)
+  GROUP BY a.agency, a.operating_unit;
+
+  INSERT INTO public.summary_month_delta (
+    month, record_count, allocation_count, total_amount
+  )
+  SELECT date_trunc('month', r.released_date AT TIME ZONE 'UTC')::date,
+    p_sign * count(DISTINCT r.id), p_sign * count(a.id),
+    p_sign * coalesce(sum(a.amount::numeric), 0)
+  FROM public.record r
+  LEFT JOIN public.allocation a ON a.record_id = r.id
+  WHERE r.id = ANY (p_record_ids)
+  GROUP BY 1;
+$$;
+
+-- add (or remove) allocations alone, for allocations written after their
+-- records were summarized
+CREATE OR REPLACE FUNCTION public.summarize_allocations(
+  p_allocation_ids bigint[],
+  p_sign int
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO public.summary_department_delta (
+    department, allocation_count, total_amount
+  )
+  SELECT r.department, p_sign * count(*), p_sign * sum(a.amount::numeric)
+  FROM public.allocation a
+  JOIN public.record r ON r.id = a.record_id
+  WHERE a.id = ANY (p_allocation_ids)
+  GROUP BY r.department;
+
+  INSERT INTO public.summary_agency_delta (
+    agency, operating_unit, allocation_count, total_amount
+  )
+  SELECT a.agency, a.operating_unit, p_sign * count(*),
+    p_sign * sum(a.amount::numeric)
+  FROM public.allocation a
+  WHERE a.id = ANY (p_allocation_ids)
+  GROUP BY a.agency, a.operating_unit;
+
+  INSERT INTO public.summary_month_delta (month, allocation_count, total_amount)
+  SELECT date_trunc('month', r.released_date AT TIME ZONE 'UTC')::date,
+    p_sign * count(*), p_sign * sum(a.amount::numeric)
+  FROM public.allocation a
+  JOIN public.record r ON r.id = a.record_id
+  WHERE a.id = ANY (p_allocation_ids)
+  GROUP BY 1;
+$$;
+
+-- add the summary deltas to the summaries and delete them, return the
+-- summary rows updated; deltas of loads still running are left for the
+-- next fold
+CREATE OR REPLACE FUNCTION public.fold_summaries()
+RETURNS TABLE (department_count int, agency_count int, month_count int)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_department_count int;
+  v_agency_count int;
+  v_month_count int;
+BEGIN
+  -- one fold at a time, the summary rows are only ever updated here
+  PERFORM pg_advisory_xact_lock(hashtext('fold_summaries'));
+
+  WITH folded AS (
+    DELETE FROM public.summary_department_delta RETURNING *
+  )
+  INSERT INTO public.summary_department AS s (
+    department, record_count, allocation_count, total_amount
+  )
+  SELECT f.department, sum(f.record_count), sum(f.allocation_count),
+    sum(f.total_amount)
+  FROM folded f
+  GROUP BY f.department
+  ON CONFLICT (department) DO UPDATE
+  SET record_count = s.record_count + EXCLUDED.record_count,
+      allocation_count = s.allocation_count + EXCLUDED.allocation_count,
+      total_amount = s.total_amount + EXCLUDED.total_amount,
+      updated_at = CURRENT_TIMESTAMP;
+  GET DIAGNOSTICS v_department_count = ROW_COUNT;
+
+  WITH folded AS (
+    DELETE FROM public.summary_agency_delta RETURNING *
+  )
+  INSERT INTO public.summary_agency AS s (
+    agency, operating_unit, allocation_count, total_amount
+  )
+  SELECT f.agency, f.operating_unit, sum(f.allocation_count),
+    sum(f.total_amount)
+  FROM folded f
+  GROUP BY f.agency, f.operating_unit
+  ON CONFLICT (agency, operating_unit) DO UPDATE
+  SET allocation_count = s.allocation_count + EXCLUDED.allocation_count,
+      total_amount = s.total_amount + EXCLUDED.total_amount,
+      updated_at = CURRENT_TIMESTAMP;
+  GET DIAGNOSTICS v_agency_count = ROW_COUNT;
+
+  WITH folded AS (
+    DELETE FROM public.summary_month_delta RETURNING *
+  )
+  INSERT INTO public.summary_month AS s (
+    month, record_count, allocation_count, total_amount
+  )
+  SELECT f.month, sum(f.record_count), sum(f.allocation_count),
+    sum(f.total_amount)
+  FROM folded f
+  GROUP BY f.month
+  ON CONFLICT (month) DO UPDATE
+  SET record_count = s.record_count + EXCLUDED.record_count,
+      allocation_count = s.allocation_count + EXCLUDED.allocation_count,
+      total_amount = s.total_amount + EXCLUDED.total_amount,
+      updated_at = CURRENT_TIMESTAMP;
+  GET DIAGNOSTICS v_month_count = ROW_COUNT;
+
+  RETURN QUERY SELECT v_department_count, v_agency_count, v_month_count;
+END;
+$$;
+
+-- recompute every summary from record and allocation in one transaction
+-- (after writes that bypass the load functions, or to correct drift),
+-- return the rows written per summary
+CREATE OR REPLACE FUNCTION public.rebuild_summaries()
+RETURNS TABLE (department_count int, agency_count int, month_count int)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_department_count int;
+  v_agency_count int;
+  v_month_count int;
+BEGIN
+  -- the deltas are recomputed too
+  TRUNCATE public.summary_department, public.summary_agency, public.summary_month,
+    public.summary_department_delta, public.summary_agency_delta,
+    public.summary_month_delta;
+
+  INSERT INTO public.summary_department (
+    department, record_count, allocation_count, total_amount
+  )
+  SELECT r.department, count(DISTINCT r.id), count(a.id),
+    coalesce(sum(a.amount::numeric), 0)
+  FROM public.record r
+  LEFT JOIN public.allocation a ON a.record_id = r.id
+  GROUP BY r.department;
+  GET DIAGNOSTICS v_department_count = ROW_COUNT;
+
+  INSERT INTO public.summary_agency (
+    agency, operating_unit, allocation_count, total_amount
+  )
+  SELECT a.agency, a.operating_unit, count(*), sum(a.amount::numeric)
+  FROM public.allocation a
+  GROUP BY a.agency, a.operating_unit;
+  GET DIAGNOSTICS v_agency_count = ROW_COUNT;
+
+  INSERT INTO public.summary_month (
+    month, record_count, allocation_count, total_amount
+  )
+  SELECT date_trunc('month', r.released_date AT TIME ZONE 'UTC')::date,
+    count(DISTINCT r.id), count(a.id), coalesce(sum(a.amount::numeric), 0)
+  FROM public.record r
+  LEFT JOIN public.allocation a ON a.record_id = r.id
+  GROUP BY 1;
+  GET DIAGNOSTICS v_month_count = ROW_COUNT;
+
+  RETURN QUERY SELECT v_department_count, v_agency_count, v_month_count;
+END;
+$$;
+
+-- delete a release, its records leave the summaries first (the delete
+-- cascades to them and their allocations)
+CREATE OR REPLACE FUNCTION public.drop_release(p_release_id text)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  PERFORM public.summarize_records(
+    ARRAY(SELECT id FROM public.record WHERE release_id = p_release_id), -1
+  );
+  DELETE FROM public.release WHERE id = p_release_id;
+END;
+$$;
+
+-- ---------------------
+-- loads
+-- ---------------------
+
+-- same definitions as supabase_schema.sql: allocations are linked to their
+-- record's id when loaded, and the summaries follow every load
+
+CREATE OR REPLACE FUNCTION public.load_nca_batch(
+  p_records jsonb,
+  p_allocations jsonb
+)
+RETURNS TABLE (record_count int, allocation_count int)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_record_count int;
+  v_allocation_count int;
+  v_nca_numbers text[];
+BEGIN
+  v_nca_numbers := ARRAY(
+    SELECT x.nca_number FROM jsonb_to_recordset(p_records) AS x (nca_number text)
+  );
+  -- the batch's existing records leave the summaries with their old values
+  PERFORM public.summarize_records(
+    ARRAY(SELECT id FROM public.record WHERE nca_number = ANY (v_nca_numbers)), -1
+  );
+
+  INSERT INTO public.record (
+    nca_number, nca_type, department, released_date, purpose, release_id
+  )
+  SELECT DISTINCT ON (r.nca_number)
+    r.nca_number, r.nca_type, r.department, r.released_date, r.purpose,
+    r.release_id
+  FROM jsonb_to_recordset(p_records) AS r (
+    nca_number text,
+    nca_type text,
+    department text,
+    released_date timestamptz,
+    purpose text,
+    release_id text
+  )
+  ORDER BY r.nca_number
+  ON CONFLICT (nca_number) DO UPDATE
+  SET nca_type = EXCLUDED.nca_type,
+      department = EXCLUDED.department,
+      released_date = EXCLUDED.released_date,
+      purpose = EXCLUDED.purpose,
+      release_id = EXCLUDED.release_id,
+      updated_at = CURRENT_TIMESTAMP;
+  GET DIAGNOSTICS v_record_count = ROW_COUNT;
+
+  DELETE FROM public.allocation a
+  USING public.record r
+  WHERE a.record_id = r.id AND r.nca_number = ANY (v_nca_numbers);
+
+  -- and come back with the new ones, their allocations are summarized as
+  -- they are inserted
+  PERFORM public.summarize_records(
+    ARRAY(SELECT id FROM public.record WHERE nca_number = ANY (v_nca_numbers)), 1
+  );
+  v_allocation_count := public.insert_allocations(p_allocations);
+
+  RETURN QUERY SELECT v_record_count, v_allocation_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.insert_allocations(p_allocations jsonb)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_allocation_ids bigint[];
+BEGIN
+  WITH inserted AS (
+    INSERT INTO public.allocation (record_id, operating_unit, agency, amount)
+    SELECT r.id, a.operating_unit, a.agency, a.amount
+    FROM jsonb_to_recordset(p_allocations) AS a (
+      nca_number text,
+      operating_unit text,
+      agency text,
+      amount double precision
+    )
+    JOIN public.record r ON r.nca_number = a.nca_number
+    RETURNING id
+  )
+  SELECT coalesce(array_agg(id), '{}') INTO v_allocation_ids FROM inserted;
+
+  PERFORM public.summarize_allocations(v_allocation_ids, 1);
+  RETURN cardinality(v_allocation_ids);
+END;
+$$;
+
+-- ---------------------
+-- staged reloads
+-- ---------------------
+
+-- staged reloads: a changed release is loaded next to its live rows, which
+-- readers keep seeing, and swapped in once every page has been staged
+CREATE TABLE IF NOT EXISTS public.record_staging (
+  release_id text NOT NULL REFERENCES public.release(id) ON DELETE CASCADE,
+  nca_number text NOT NULL,
+  nca_type text,
+  department text,
+  released_date timestamptz DEFAULT NULL,
+  purpose text,
+  PRIMARY KEY (release_id, nca_number)
+);
+
+CREATE TABLE IF NOT EXISTS public.allocation_staging (
+  release_id text NOT NULL REFERENCES public.release(id) ON DELETE CASCADE,
+  nca_number text NOT NULL,
+  operating_unit text NOT NULL,
+  agency text NOT NULL,
+  amount double precision NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS public.release_staging_page (
+  release_id text NOT NULL REFERENCES public.release(id) ON DELETE CASCADE,
+  page_num int NOT NULL,
+  PRIMARY KEY (release_id, page_num)
+);
+
+CREATE INDEX IF NOT EXISTS idx_allocation_staging_nca_number ON public.allocation_staging(release_id, nca_number);
+
+-- drop a release's staged rows (a new reload starts, or the swap is done)
+CREATE OR REPLACE FUNCTION public.clear_staged_release(p_release_id text)
+RETURNS void
+LANGUAGE sql
+AS $$
+  DELETE FROM public.allocation_staging WHERE release_id = p_release_id;
+  DELETE FROM public.record_staging WHERE release_id = p_release_id;
+  DELETE FROM public.release_staging_page WHERE release_id = p_release_id;
+$$;
+
+CREATE OR REPLACE FUNCTION public.swap_staged_release(p_release_id text)
+RETURNS TABLE (record_count int, allocation_count int)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_record_count int;
+  v_allocation_count int;
+  v_allocation_ids bigint[];
+BEGIN
+  -- the release's records, and the ones about to move to it, leave the
+  -- summaries
+  PERFORM public.summarize_records(
+    ARRAY(
+      SELECT r.id FROM public.record r
+      WHERE r.release_id = p_release_id
+         OR r.nca_number IN (
+           SELECT s.nca_number FROM public.record_staging s
+           WHERE s.release_id = p_release_id
+         )
+    ),
+    -1
+  );
+
+  -- cascades to the release's allocations
+  DELETE FROM public.record WHERE release_id = p_release_id;
+
+  -- nca numbers re-released from another release move to this one
+  INSERT INTO public.record (
+    nca_number, nca_type, department, released_date, purpose, release_id
+  )
+  SELECT s.nca_number, s.nca_type, s.department, s.released_date, s.purpose,
+    s.release_id
+  FROM public.record_staging s
+  WHERE s.release_id = p_release_id
+  ON CONFLICT (nca_number) DO UPDATE
+  SET nca_type = EXCLUDED.nca_type,
+      department = EXCLUDED.department,
+      released_date = EXCLUDED.released_date,
+      purpose = EXCLUDED.purpose,
+      release_id = EXCLUDED.release_id,
+      updated_at = CURRENT_TIMESTAMP;
+  GET DIAGNOSTICS v_record_count = ROW_COUNT;
+
+  -- moved records keep their id, so drop the allocations they brought along
+  DELETE FROM public.allocation a
+  USING public.record r
+  WHERE a.record_id = r.id AND r.release_id = p_release_id;
+
+  PERFORM public.summarize_records(
+    ARRAY(SELECT id FROM public.record WHERE release_id = p_release_id), 1
+  );
+
+  WITH inserted AS (
+    INSERT INTO public.allocation (record_id, operating_unit, agency, amount)
+    SELECT r.id, s.operating_unit, s.agency, s.amount
+    FROM public.allocation_staging s
+    JOIN public.record r ON r.nca_number = s.nca_number
+    WHERE s.release_id = p_release_id
+    RETURNING id
+  )
+  SELECT coalesce(array_agg(id), '{}') INTO v_allocation_ids FROM inserted;
+  PERFORM public.summarize_allocations(v_allocation_ids, 1);
+  v_allocation_count := cardinality(v_allocation_ids);
+
+  PERFORM public.clear_staged_release(p_release_id);
+  RETURN QUERY SELECT v_record_count, v_allocation_count;
+END;
+$$;
+
+-- stage a batch's records, allocations and pages in one call, the batch
+-- that stages the release's last page gets is_complete and swaps the
+-- release in with complete_staged_release once this call has committed
+CREATE OR REPLACE FUNCTION public.stage_nca_batch(
+  p_release_id text,
+  p_page_count int,
+  p_page_nums int[],
+  p_records jsonb,
+  p_allocations jsonb
+)
+RETURNS TABLE (record_count int, allocation_count int, is_complete boolean)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_record_count int;
+  v_allocation_count int;
+  v_is_complete boolean;
+BEGIN
+  -- batches of one release stage one at a time (and not during its swap),
+  -- so the last one to commit sees every page staged by the others
+  PERFORM pg_advisory_xact_lock(hashtext('stage_nca_batch:' || p_release_id));
+
+  INSERT INTO public.record_staging (
+    release_id, nca_number, nca_type, department, released_date, purpose
+  )
+  SELECT DISTINCT ON (r.nca_number)
+    p_release_id, r.nca_number, r.nca_type, r.department, r.released_date,
+    r.purpose
+  FROM jsonb_to_recordset(p_records) AS r (
+    nca_number text,
+    nca_type text,
+    department text,
+    released_date timestamptz,
+    purpose text
+  )
+  ORDER BY r.nca_number
+  ON CONFLICT (release_id, nca_number) DO UPDATE
+  SET nca_type = EXCLUDED.nca_type,
+      department = EXCLUDED.department,
+      released_date = EXCLUDED.released_date,
+      purpose = EXCLUDED.purpose;
+  GET DIAGNOSTICS v_record_count = ROW_COUNT;
+
+  DELETE FROM public.allocation_staging
+  WHERE release_id = p_release_id
+    AND nca_number IN (
+      SELECT r.nca_number FROM jsonb_to_recordset(p_records) AS r (nca_number text)
+    );
+
+  INSERT INTO public.allocation_staging (
+    release_id, nca_number, operating_unit, agency, amount
+  )
+  SELECT p_release_id, a.nca_number, a.operating_unit, a.agency, a.amount
+  FROM jsonb_to_recordset(p_allocations) AS a (
+    nca_number text,
+    operating_unit text,
+    agency text,
+    amount double precision
+  );
+  GET DIAGNOSTICS v_allocation_count = ROW_COUNT;
+
+  INSERT INTO public.release_staging_page (release_id, page_num)
+  SELECT p_release_id, page_num FROM unnest(p_page_nums) AS page_num
+  ON CONFLICT DO NOTHING;
+
+  SELECT count(*) >= p_page_count INTO v_is_complete
+  FROM public.release_staging_page
+  WHERE release_id = p_release_id;
+
+  RETURN QUERY SELECT v_record_count, v_allocation_count, v_is_complete;
+END;
+$$;
+
+-- swap a release in once all of its pages are staged, in its own call after
+-- the staging has committed: a swap that fails or hits the statement timeout
+-- rolls back whole and leaves the staged rows for another call, a swap that
+-- ran cleared them, so calling it again returns is_swapped false
+CREATE OR REPLACE FUNCTION public.complete_staged_release(
+  p_release_id text,
+  p_page_count int
+)
+RETURNS TABLE (record_count int, allocation_count int, is_swapped boolean)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_is_complete boolean;
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('stage_nca_batch:' || p_release_id));
+
+  SELECT p_page_count > 0 AND count(*) >= p_page_count INTO v_is_complete
+  FROM public.release_staging_page
+  WHERE release_id = p_release_id;
+
+  IF NOT v_is_complete THEN
+    RETURN QUERY SELECT 0, 0, false;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+  SELECT s.record_count, s.allocation_count, true
+  FROM public.swap_staged_release(p_release_id) s;
+END;
+$$;
+
+-- ---------------------
+-- work leases
+-- ---------------------
+
+-- work leases: claimable page chunks for dynamic work claiming
+CREATE TABLE IF NOT EXISTS public.work_lease (
+  id text PRIMARY KEY,
+  release_id text NOT NULL REFERENCES public.release(id) ON DELETE CASCADE,
+  start_page_num int NOT NULL,
+  batch jsonb NOT NULL,
+  status text NOT NULL DEFAULT 'pending',
+  lease_owner text,
+  lease_expires_at timestamptz,
+  attempts int NOT NULL DEFAULT 0,
+  created_at timestamptz DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_work_lease_claim ON public.work_lease(status, release_id, start_page_num);
+
+-- lease the next pending (or expired) chunk; SKIP LOCKED lets concurrent
+-- workers claim different chunks without waiting on each other
+CREATE OR REPLACE FUNCTION public.claim_work_lease(
+  p_worker_id text,
+  p_lease_seconds int,
+  p_max_attempts int
+)
+RETURNS SETOF public.work_lease
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  UPDATE public.work_lease
+  SET status = 'failed'
+  WHERE status = 'leased'
+    AND lease_expires_at < now()
+    AND attempts >= p_max_attempts;
+
+  RETURN QUERY
+  UPDATE public.work_lease w
+  SET status = 'leased',
+      lease_owner = p_worker_id,
+      lease_expires_at = now() + make_interval(secs => p_lease_seconds),
+      attempts = w.attempts + 1
+  WHERE w.id = (
+    SELECT id FROM public.work_lease
+    WHERE status = 'pending'
+       OR (status = 'leased' AND lease_expires_at < now())
+    ORDER BY release_id, start_page_num
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+  )
+  RETURNING w.*;
+END;
+$$;
+
+-- extend a lease still owned by the worker, NULL if it was lost
+CREATE OR REPLACE FUNCTION public.renew_work_lease(
+  p_id text,
+  p_worker_id text,
+  p_lease_seconds int
+)
+RETURNS timestamptz
+LANGUAGE sql
+AS $$
+  UPDATE public.work_lease
+  SET lease_expires_at = now() + make_interval(secs => p_lease_seconds)
+  WHERE id = p_id AND lease_owner = p_worker_id AND status = 'leased'
+  RETURNING lease_expires_at;
+$$;
+
+-- ---------------------
+-- spool merges
+-- ---------------------
+
+-- spool merge leases: one loader merges a release's spooled batches at a
+-- time, an expired lease (a loader that died) can be taken over
+CREATE TABLE IF NOT EXISTS public.spool_merge_lease (
+  release_id text PRIMARY KEY REFERENCES public.release(id) ON DELETE CASCADE,
+  lease_owner text NOT NULL,
+  lease_expires_at timestamptz NOT NULL
+);
+
+-- lease a release's merge, false while another owner's lease is live
+CREATE OR REPLACE FUNCTION public.claim_spool_merge(
+  p_release_id text,
+  p_owner text,
+  p_lease_seconds int
+)
+RETURNS boolean
+LANGUAGE sql
+AS $$
+  WITH claimed AS (
+    INSERT INTO public.spool_merge_lease AS l (
+      release_id, lease_owner, lease_expires_at
+    )
+    VALUES (p_release_id, p_owner, now() + make_interval(secs => p_lease_seconds))
+    ON CONFLICT (release_id) DO UPDATE
+    SET lease_owner = EXCLUDED.lease_owner,
+        lease_expires_at = EXCLUDED.lease_expires_at
+    WHERE l.lease_expires_at < now() OR l.lease_owner = EXCLUDED.lease_owner
+    RETURNING 1
+  )
+  SELECT EXISTS (SELECT 1 FROM claimed);
+$$;
+
+-- give up a merge lease still held by the owner
+CREATE OR REPLACE FUNCTION public.end_spool_merge(p_release_id text, p_owner text)
+RETURNS void
+LANGUAGE sql
+AS $$
+  DELETE FROM public.spool_merge_lease
+  WHERE release_id = p_release_id AND lease_owner = p_owner;
+$$;
+
+-- summarize the rows already loaded
+SELECT * FROM public.rebuild_summaries();
+
+COMMIT;
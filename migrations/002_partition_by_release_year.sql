@@ -0,0 +1,691 @@
+-- partition record and allocation by release year (LIST, one partition per
+-- year, and the dbm publishes one release per year): deleting or reloading a
+-- release drops or swaps its year's partitions instead of deleting rows, and
+-- queries filtered on release_year only scan their year.
+--
+-- run after supabase_schema.sql (and 001_upgrade_schema.sql on an older
+-- database), on a fresh or a populated one (rows are copied into the
+-- partitions with their ids), then set DB_PARTITIONED=true.
+--
+-- identity columns are not supported on partitioned tables before postgres
+-- 17, the bigint ids are drawn from plain sequences instead
+
+BEGIN;
+
+-- ---------------------
+-- tables
+-- ---------------------
+
+CREATE SEQUENCE public.record_partitioned_id_seq AS bigint;
+CREATE SEQUENCE public.allocation_partitioned_id_seq AS bigint;
+
+CREATE TABLE public.record_partitioned (
+  id bigint NOT NULL DEFAULT nextval('public.record_partitioned_id_seq'),
+  release_year int NOT NULL,
+  nca_number text NOT NULL,
+  nca_type text,
+  department text,
+  released_date timestamptz DEFAULT NULL,
+  purpose text,
+  created_at timestamptz DEFAULT CURRENT_TIMESTAMP,
+  updated_at timestamptz DEFAULT CURRENT_TIMESTAMP,
+  release_id text NOT NULL REFERENCES public.release(id) ON DELETE CASCADE,
+  search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(department, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(purpose, '')), 'B')
+  ) STORED,
+  PRIMARY KEY (release_year, id),
+  UNIQUE (release_year, nca_number)
+) PARTITION BY LIST (release_year);
+
+CREATE TABLE public.allocation_partitioned (
+  id bigint NOT NULL DEFAULT nextval('public.allocation_partitioned_id_seq'),
+  release_year int NOT NULL,
+  record_id bigint NOT NULL,
+  operating_unit text NOT NULL,
+  agency text NOT NULL,
+  amount double precision NOT NULL,
+  created_at timestamptz DEFAULT CURRENT_TIMESTAMP,
+  search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(agency, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(operating_unit, '')), 'B')
+  ) STORED,
+  PRIMARY KEY (release_year, id),
+  FOREIGN KEY (release_year, record_id)
+    REFERENCES public.record_partitioned(release_year, id) ON DELETE CASCADE
+) PARTITION BY LIST (release_year);
+
+ALTER SEQUENCE public.record_partitioned_id_seq
+  OWNED BY public.record_partitioned.id;
+ALTER SEQUENCE public.allocation_partitioned_id_seq
+  OWNED BY public.allocation_partitioned.id;
+
+DO $$
+DECLARE
+  v_year int;
+BEGIN
+  FOR v_year IN SELECT DISTINCT year FROM public.release WHERE year IS NOT NULL LOOP
+    EXECUTE format(
+      'CREATE TABLE public.%I PARTITION OF public.record_partitioned FOR VALUES IN (%s)',
+      'record_y' || v_year, v_year
+    );
+    EXECUTE format(
+      'CREATE TABLE public.%I PARTITION OF public.allocation_partitioned FOR VALUES IN (%s)',
+      'allocation_y' || v_year, v_year
+    );
+  END LOOP;
+END;
+$$;
+
+INSERT INTO public.record_partitioned (
+  id, release_year, nca_number, nca_type, department, released_date, purpose,
+  created_at, updated_at, release_id
+)
+SELECT r.id, rel.year, r.nca_number, r.nca_type, r.department, r.released_date,
+  r.purpose, r.created_at, r.updated_at, r.release_id
+FROM public.record r
+JOIN public.release rel ON rel.id = r.release_id;
+
+INSERT INTO public.allocation_partitioned (
+  id, release_year, record_id, operating_unit, agency, amount, created_at
+)
+SELECT a.id, r.release_year, a.record_id, a.operating_unit, a.agency, a.amount,
+  a.created_at
+FROM public.allocation a
+JOIN public.record_partitioned r ON r.id = a.record_id;
+
+SELECT setval(
+  'public.record_partitioned_id_seq',
+  (SELECT coalesce(max(id), 0) + 1 FROM public.record_partitioned), false
+);
+SELECT setval(
+  'public.allocation_partitioned_id_seq',
+  (SELECT coalesce(max(id), 0) + 1 FROM public.allocation_partitioned), false
+);
+
+DROP TABLE public.allocation;
+DROP TABLE public.record;
+ALTER TABLE public.record_partitioned RENAME TO record;
+ALTER TABLE public.allocation_partitioned RENAME TO allocation;
+ALTER SEQUENCE public.record_partitioned_id_seq RENAME TO record_id_seq;
+ALTER SEQUENCE public.allocation_partitioned_id_seq RENAME TO allocation_id_seq;
+
+-- created on each partition; the (release_year, nca_number) key covers
+-- nca_number lookups within a year, idx_record_nca_number the ones across
+-- years (allocations written without their records)
+CREATE INDEX IF NOT EXISTS idx_record_nca_number ON public.record(nca_number);
+CREATE INDEX IF NOT EXISTS idx_record_released_date ON public.record(released_date);
+CREATE INDEX IF NOT EXISTS idx_record_release_id ON public.record(release_id);
+CREATE INDEX IF NOT EXISTS idx_allocation_record_id ON public.allocation(release_year, record_id);
+CREATE INDEX IF NOT EXISTS idx_record_search_vector ON public.record USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS idx_record_purpose_trgm ON public.record USING gin (purpose gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_record_department_trgm ON public.record USING gin (department gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_allocation_search_vector ON public.allocation USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS idx_allocation_agency_trgm ON public.allocation USING gin (agency gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_allocation_operating_unit_trgm ON public.allocation USING gin (operating_unit gin_trgm_ops);
+
+-- ---------------------
+-- partitions
+-- ---------------------
+
+-- the functions that create, drop or attach partitions are SECURITY DEFINER:
+-- partition ddl needs the tables' owner, and they are reached by the
+-- pipeline's role (a release upsert, drop_release or stage_nca_batch), which
+-- only has table privileges. they are owned by the tables' owner (see the end)
+
+-- a release's year gets its partitions when the release row is written
+CREATE OR REPLACE FUNCTION public.create_release_partitions()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF NEW.year IS NULL THEN
+    RETURN NEW;
+  END IF;
+  EXECUTE format(
+    'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.record FOR VALUES IN (%s)',
+    'record_y' || NEW.year, NEW.year
+  );
+  EXECUTE format(
+    'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.allocation FOR VALUES IN (%s)',
+    'allocation_y' || NEW.year, NEW.year
+  );
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_release_partitions ON public.release;
+CREATE TRIGGER trg_release_partitions
+AFTER INSERT OR UPDATE OF year ON public.release
+FOR EACH ROW EXECUTE FUNCTION public.create_release_partitions();
+
+-- detach and drop a year's partitions: the rows go without being deleted
+-- one by one (no dead tuples, no vacuum)
+CREATE OR REPLACE FUNCTION public.drop_year_partitions(p_year int)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF to_regclass(format('public.%I', 'allocation_y' || p_year)) IS NOT NULL THEN
+    EXECUTE format(
+      'ALTER TABLE public.allocation DETACH PARTITION public.%I', 'allocation_y' || p_year
+    );
+    EXECUTE format('DROP TABLE public.%I', 'allocation_y' || p_year);
+  END IF;
+  IF to_regclass(format('public.%I', 'record_y' || p_year)) IS NOT NULL THEN
+    EXECUTE format(
+      'ALTER TABLE public.record DETACH PARTITION public.%I', 'record_y' || p_year
+    );
+    EXECUTE format('DROP TABLE public.%I', 'record_y' || p_year);
+  END IF;
+END;
+$$;
+
+-- true when no other release shares the release's year (and partitions)
+CREATE OR REPLACE FUNCTION public.release_owns_year(p_release_id text)
+RETURNS boolean
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT NOT EXISTS (
+    SELECT 1
+    FROM public.release rel
+    JOIN public.release other ON other.year = rel.year AND other.id <> rel.id
+    WHERE rel.id = p_release_id
+  );
+$$;
+
+-- ---------------------
+-- summaries
+-- ---------------------
+
+-- same as supabase_schema.sql, joined on the partition key so lookups only
+-- touch their year's partitions
+
+CREATE OR REPLACE FUNCTION public.summarize_records(
+  p_record_ids bigint[],
+  p_sign int
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO public.summary_department_delta (
+    department, record_count, allocation_count, total_amount
+  )
+  SELECT r.department, p_sign * count(DISTINCT r.id), p_sign * count(a.id),
+    p_sign * coalesce(sum(a.amount::numeric), 0)
+  FROM public.record r
+  LEFT JOIN public.allocation a
+    ON a.release_year = r.release_year AND a.record_id = r.id
+  WHERE r.id = ANY (p_record_ids)
+  GROUP BY r.department;
+
+  INSERT INTO public.summary_agency_delta (
+    agency, operating_unit, allocation_count, total_amount
+  )
+  SELECT a.agency, a.operating_unit, p_sign * count(*),
+    p_sign * sum(a.amount::numeric)
+  FROM public.record r
+  JOIN public.allocation a
+    ON a.release_year = r.release_year AND a.record_id = r.id
+  WHERE r.id = ANY (p_record_ids)
+  GROUP BY a.agency, a.operating_unit;
+
+  INSERT INTO public.summary_month_delta (
+    month, record_count, allocation_count, total_amount
+  )
+  SELECT date_trunc('month', r.released_date AT TIME ZONE 'UTC')::date,
+    p_sign * count(DISTINCT r.id), p_sign * count(a.id),
+    p_sign * coalesce(sum(a.amount::numeric), 0)
+  FROM public.record r
+  LEFT JOIN public.allocation a
+    ON a.release_year = r.release_year AND a.record_id = r.id
+  WHERE r.id = ANY (p_record_ids)
+  GROUP BY 1;
+$$;
+
+CREATE OR REPLACE FUNCTION public.summarize_allocations(
+  p_allocation_ids bigint[],
+  p_sign int
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO public.summary_department_delta (
+    department, allocation_count, total_amount
+  )
+  SELECT r.department, p_sign * count(*), p_sign * sum(a.amount::numeric)
+  FROM public.allocation a
+  JOIN public.record r
+    ON r.release_year = a.release_year AND r.id = a.record_id
+  WHERE a.id = ANY (p_allocation_ids)
+  GROUP BY r.department;
+
+  INSERT INTO public.summary_agency_delta (
+    agency, operating_unit, allocation_count, total_amount
+  )
+  SELECT a.agency, a.operating_unit, p_sign * count(*),
+    p_sign * sum(a.amount::numeric)
+  FROM public.allocation a
+  WHERE a.id = ANY (p_allocation_ids)
+  GROUP BY a.agency, a.operating_unit;
+
+  INSERT INTO public.summary_month_delta (month, allocation_count, total_amount)
+  SELECT date_trunc('month', r.released_date AT TIME ZONE 'UTC')::date,
+    p_sign * count(*), p_sign * sum(a.amount::numeric)
+  FROM public.allocation a
+  JOIN public.record r
+    ON r.release_year = a.release_year AND r.id = a.record_id
+  WHERE a.id = ANY (p_allocation_ids)
+  GROUP BY 1;
+$$;
+
+-- ---------------------
+-- search
+-- ---------------------
+
+-- same as supabase_schema.sql, a year filter is applied to every index
+-- lookup so it only scans that year's partitions
+
+CREATE OR REPLACE FUNCTION public.search_records(
+  p_query text,
+  p_limit int DEFAULT 20,
+  p_offset int DEFAULT 0,
+  p_year int DEFAULT NULL
+)
+RETURNS TABLE (
+  id bigint,
+  nca_number text,
+  nca_type text,
+  department text,
+  released_date timestamptz,
+  purpose text,
+  release_id text,
+  rank real
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_tsquery tsquery := websearch_to_tsquery('english', p_query);
+  v_pattern text := '%' || replace(replace(replace(
+    p_query, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+  -- trigrams need three characters, shorter queries only match words
+  v_is_substring boolean := length(p_query) >= 3;
+BEGIN
+  RETURN QUERY
+  WITH hits AS (
+    SELECT r.release_year, r.id AS record_id,
+      ts_rank_cd(r.search_vector, v_tsquery) AS rank
+    FROM public.record r
+    WHERE r.search_vector @@ v_tsquery
+      AND (p_year IS NULL OR r.release_year = p_year)
+    UNION ALL
+    SELECT a.release_year, a.record_id, ts_rank_cd(a.search_vector, v_tsquery)
+    FROM public.allocation a
+    WHERE a.search_vector @@ v_tsquery
+      AND (p_year IS NULL OR a.release_year = p_year)
+    UNION ALL
+    SELECT r.release_year, r.id,
+      0.1 * word_similarity(p_query, r.department || ' ' || r.purpose)
+    FROM public.record r
+    WHERE v_is_substring
+      AND (p_year IS NULL OR r.release_year = p_year)
+      AND (r.purpose ILIKE v_pattern OR r.department ILIKE v_pattern)
+    UNION ALL
+    SELECT a.release_year, a.record_id,
+      0.1 * word_similarity(p_query, a.agency || ' ' || a.operating_unit)
+    FROM public.allocation a
+    WHERE v_is_substring
+      AND (p_year IS NULL OR a.release_year = p_year)
+      AND (a.agency ILIKE v_pattern OR a.operating_unit ILIKE v_pattern)
+  ),
+  -- the page is cut right after the ranks are summed, only its records
+  -- are read back
+  ranked AS (
+    SELECT h.release_year, h.record_id, sum(h.rank)::real AS rank
+    FROM hits h
+    GROUP BY h.release_year, h.record_id
+    ORDER BY sum(h.rank)::real DESC, h.record_id
+    LIMIT least(p_limit, 100) OFFSET p_offset
+  )
+  SELECT r.id, r.nca_number, r.nca_type, r.department, r.released_date,
+    r.purpose, r.release_id, k.rank
+  FROM ranked k
+  JOIN public.record r
+    ON r.release_year = k.release_year AND r.id = k.record_id
+  ORDER BY k.rank DESC, r.id;
+END;
+$$;
+
+-- ---------------------
+-- release deletes & loads
+-- ---------------------
+
+-- delete a release, dropping its year's partitions when it owns them
+CREATE OR REPLACE FUNCTION public.drop_release(p_release_id text)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_year int;
+BEGIN
+  SELECT year INTO v_year FROM public.release WHERE id = p_release_id;
+  PERFORM public.summarize_records(
+    ARRAY(
+      SELECT id FROM public.record
+      WHERE release_year = v_year AND release_id = p_release_id
+    ),
+    -1
+  );
+  IF v_year IS NOT NULL AND public.release_owns_year(p_release_id) THEN
+    PERFORM public.drop_year_partitions(v_year);
+  END IF;
+  -- cascades to any rows left (a shared year) and to the staged rows
+  DELETE FROM public.release WHERE id = p_release_id;
+END;
+$$;
+
+-- same contract as the unpartitioned load_nca_batch, the year comes from
+-- the records' release
+CREATE OR REPLACE FUNCTION public.load_nca_batch(
+  p_records jsonb,
+  p_allocations jsonb
+)
+RETURNS TABLE (record_count int, allocation_count int)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_record_count int;
+  v_allocation_count int;
+  v_record_ids bigint[];
+  v_allocation_ids bigint[];
+BEGIN
+  -- the batch's existing records (in their release's year) leave the
+  -- summaries with their old values
+  v_record_ids := ARRAY(
+    SELECT r.id
+    FROM jsonb_to_recordset(p_records) AS x (nca_number text, release_id text)
+    JOIN public.release rel ON rel.id = x.release_id
+    JOIN public.record r
+      ON r.release_year = rel.year AND r.nca_number = x.nca_number
+  );
+  PERFORM public.summarize_records(v_record_ids, -1);
+
+  INSERT INTO public.record (
+    release_year, nca_number, nca_type, department, released_date, purpose,
+    release_id
+  )
+  SELECT DISTINCT ON (r.nca_number)
+    rel.year, r.nca_number, r.nca_type, r.department, r.released_date,
+    r.purpose, r.release_id
+  FROM jsonb_to_recordset(p_records) AS r (
+    nca_number text,
+    nca_type text,
+    department text,
+    released_date timestamptz,
+    purpose text,
+    release_id text
+  )
+  JOIN public.release rel ON rel.id = r.release_id
+  ORDER BY r.nca_number
+  ON CONFLICT (release_year, nca_number) DO UPDATE
+  SET nca_type = EXCLUDED.nca_type,
+      department = EXCLUDED.department,
+      released_date = EXCLUDED.released_date,
+      purpose = EXCLUDED.purpose,
+      release_id = EXCLUDED.release_id,
+      updated_at = CURRENT_TIMESTAMP;
+  GET DIAGNOSTICS v_record_count = ROW_COUNT;
+
+  DELETE FROM public.allocation a
+  USING jsonb_to_recordset(p_records) AS x (nca_number text, release_id text)
+  JOIN public.release rel ON rel.id = x.release_id
+  JOIN public.record r
+    ON r.release_year = rel.year AND r.nca_number = x.nca_number
+  WHERE a.release_year = r.release_year AND a.record_id = r.id;
+
+  -- and come back with the new ones, then their allocations as inserted
+  v_record_ids := ARRAY(
+    SELECT r.id
+    FROM jsonb_to_recordset(p_records) AS x (nca_number text, release_id text)
+    JOIN public.release rel ON rel.id = x.release_id
+    JOIN public.record r
+      ON r.release_year = rel.year AND r.nca_number = x.nca_number
+  );
+  PERFORM public.summarize_records(v_record_ids, 1);
+
+  WITH inserted AS (
+    INSERT INTO public.allocation (
+      release_year, record_id, operating_unit, agency, amount
+    )
+    SELECT r.release_year, r.id, a.operating_unit, a.agency, a.amount
+    FROM jsonb_to_recordset(p_allocations) AS a (
+      nca_number text,
+      operating_unit text,
+      agency text,
+      amount double precision
+    )
+    JOIN (
+      SELECT DISTINCT x.nca_number, rel.year AS release_year
+      FROM jsonb_to_recordset(p_records) AS x (nca_number text, release_id text)
+      JOIN public.release rel ON rel.id = x.release_id
+    ) b ON b.nca_number = a.nca_number
+    JOIN public.record r
+      ON r.release_year = b.release_year AND r.nca_number = b.nca_number
+    RETURNING id
+  )
+  SELECT coalesce(array_agg(id), '{}') INTO v_allocation_ids FROM inserted;
+  PERFORM public.summarize_allocations(v_allocation_ids, 1);
+  v_allocation_count := cardinality(v_allocation_ids);
+
+  RETURN QUERY SELECT v_record_count, v_allocation_count;
+END;
+$$;
+
+-- allocations written without their records (SupabaseRepository's bulk
+-- insert): the year is the latest one the nca number was released in
+CREATE OR REPLACE FUNCTION public.insert_allocations(p_allocations jsonb)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_allocation_ids bigint[];
+BEGIN
+  WITH inserted AS (
+    INSERT INTO public.allocation (
+      release_year, record_id, operating_unit, agency, amount
+    )
+    SELECT r.release_year, r.id, a.operating_unit, a.agency, a.amount
+    FROM jsonb_to_recordset(p_allocations) AS a (
+      nca_number text,
+      operating_unit text,
+      agency text,
+      amount double precision
+    )
+    JOIN LATERAL (
+      SELECT release_year, id FROM public.record
+      WHERE nca_number = a.nca_number
+      ORDER BY release_year DESC
+      LIMIT 1
+    ) r ON true
+    RETURNING id
+  )
+  SELECT coalesce(array_agg(id), '{}') INTO v_allocation_ids FROM inserted;
+
+  PERFORM public.summarize_allocations(v_allocation_ids, 1);
+  RETURN cardinality(v_allocation_ids);
+END;
+$$;
+
+-- staged reload swap: the year's new partitions are built from the staged
+-- rows next to the live ones, then swapped in with a detach/attach, readers
+-- see either the old or the new release
+CREATE OR REPLACE FUNCTION public.swap_staged_release(p_release_id text)
+RETURNS TABLE (record_count int, allocation_count int)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_year int;
+  v_record text;
+  v_allocation text;
+  v_record_count int;
+  v_allocation_count int;
+  v_allocation_ids bigint[];
+BEGIN
+  SELECT year INTO v_year FROM public.release WHERE id = p_release_id;
+
+  IF NOT public.release_owns_year(p_release_id) THEN
+    -- a shared year: replace the release's rows in place, the release's
+    -- records and the ones about to move to it leave the summaries first
+    PERFORM public.summarize_records(
+      ARRAY(
+        SELECT r.id FROM public.record r
+        WHERE r.release_year = v_year
+          AND (
+            r.release_id = p_release_id
+            OR r.nca_number IN (
+              SELECT s.nca_number FROM public.record_staging s
+              WHERE s.release_id = p_release_id
+            )
+          )
+      ),
+      -1
+    );
+    DELETE FROM public.record WHERE release_id = p_release_id;
+    INSERT INTO public.record (
+      release_year, nca_number, nca_type, department, released_date, purpose,
+      release_id
+    )
+    SELECT v_year, s.nca_number, s.nca_type, s.department, s.released_date,
+      s.purpose, s.release_id
+    FROM public.record_staging s
+    WHERE s.release_id = p_release_id
+    ON CONFLICT (release_year, nca_number) DO UPDATE
+    SET nca_type = EXCLUDED.nca_type,
+        department = EXCLUDED.department,
+        released_date = EXCLUDED.released_date,
+        purpose = EXCLUDED.purpose,
+        release_id = EXCLUDED.release_id,
+        updated_at = CURRENT_TIMESTAMP;
+    GET DIAGNOSTICS v_record_count = ROW_COUNT;
+
+    -- moved records keep their id, so drop the allocations they brought along
+    DELETE FROM public.allocation a
+    USING public.record r
+    WHERE r.release_year = v_year
+      AND r.release_id = p_release_id
+      AND a.release_year = v_year
+      AND a.record_id = r.id;
+    PERFORM public.summarize_records(
+      ARRAY(
+        SELECT id FROM public.record
+        WHERE release_year = v_year AND release_id = p_release_id
+      ),
+      1
+    );
+
+    WITH inserted AS (
+      INSERT INTO public.allocation (
+        release_year, record_id, operating_unit, agency, amount
+      )
+      SELECT v_year, r.id, s.operating_unit, s.agency, s.amount
+      FROM public.allocation_staging s
+      JOIN public.record r
+        ON r.release_year = v_year AND r.nca_number = s.nca_number
+      WHERE s.release_id = p_release_id
+      RETURNING id
+    )
+    SELECT coalesce(array_agg(id), '{}') INTO v_allocation_ids FROM inserted;
+    PERFORM public.summarize_allocations(v_allocation_ids, 1);
+    v_allocation_count := cardinality(v_allocation_ids);
+
+    PERFORM public.clear_staged_release(p_release_id);
+    RETURN QUERY SELECT v_record_count, v_allocation_count;
+    RETURN;
+  END IF;
+
+  v_record := 'record_y' || v_year;
+  v_allocation := 'allocation_y' || v_year;
+
+  -- the check constraints let attach skip scanning the new partitions
+  EXECUTE format(
+    'CREATE TABLE public.%I (LIKE public.record INCLUDING DEFAULTS INCLUDING GENERATED, CHECK (release_year = %s))',
+    v_record || '_new', v_year
+  );
+  EXECUTE format(
+    'INSERT INTO public.%I (release_year, nca_number, nca_type, department, '
+    'released_date, purpose, release_id) '
+    'SELECT %s, nca_number, nca_type, department, released_date, purpose, release_id '
+    'FROM public.record_staging WHERE release_id = %L',
+    v_record || '_new', v_year, p_release_id
+  );
+  GET DIAGNOSTICS v_record_count = ROW_COUNT;
+
+  EXECUTE format(
+    'CREATE TABLE public.%I (LIKE public.allocation INCLUDING DEFAULTS INCLUDING GENERATED, CHECK (release_year = %s))',
+    v_allocation || '_new', v_year
+  );
+  EXECUTE format(
+    'INSERT INTO public.%I (release_year, record_id, operating_unit, agency, amount) '
+    'SELECT %s, r.id, s.operating_unit, s.agency, s.amount '
+    'FROM public.allocation_staging s '
+    'JOIN public.%I r ON r.nca_number = s.nca_number '
+    'WHERE s.release_id = %L',
+    v_allocation || '_new', v_year, v_record || '_new', p_release_id
+  );
+  GET DIAGNOSTICS v_allocation_count = ROW_COUNT;
+
+  -- swap: indexes are built once on attach instead of row by row, the
+  -- year's rows leave the summaries before the drop and the new ones come
+  -- back once attached
+  PERFORM public.summarize_records(
+    ARRAY(SELECT id FROM public.record WHERE release_year = v_year), -1
+  );
+  PERFORM public.drop_year_partitions(v_year);
+  EXECUTE format('ALTER TABLE public.%I RENAME TO %I', v_record || '_new', v_record);
+  EXECUTE format(
+    'ALTER TABLE public.record ATTACH PARTITION public.%I FOR VALUES IN (%s)',
+    v_record, v_year
+  );
+  EXECUTE format(
+    'ALTER TABLE public.%I RENAME TO %I', v_allocation || '_new', v_allocation
+  );
+  EXECUTE format(
+    'ALTER TABLE public.allocation ATTACH PARTITION public.%I FOR VALUES IN (%s)',
+    v_allocation, v_year
+  );
+  PERFORM public.summarize_records(
+    ARRAY(SELECT id FROM public.record WHERE release_year = v_year), 1
+  );
+
+  PERFORM public.clear_staged_release(p_release_id);
+  RETURN QUERY SELECT v_record_count, v_allocation_count;
+END;
+$$;
+
+-- ---------------------
+-- ownership
+-- ---------------------
+
+-- the partition functions run as the owner of record and allocation
+DO $$
+DECLARE
+  v_owner name := (
+    SELECT pg_get_userbyid(relowner) FROM pg_class WHERE oid = 'public.record'::regclass
+  );
+BEGIN
+  EXECUTE format('ALTER FUNCTION public.create_release_partitions() OWNER TO %I', v_owner);
+  EXECUTE format('ALTER FUNCTION public.drop_year_partitions(int) OWNER TO %I', v_owner);
+  EXECUTE format('ALTER FUNCTION public.swap_staged_release(text) OWNER TO %I', v_owner);
+END;
+$$;
+
+COMMIT;
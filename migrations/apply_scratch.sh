@@ -0,0 +1,91 @@
+#!/usr/bin/env bash
+# apply the init script and the migrations to a scratch postgres database,
+# then load, stage (and swap), summarize, lease and drop a release as the
+# api role the pipeline uses, inside a transaction that is rolled back.
+#
+#   migrations/apply_scratch.sh postgres://postgres@localhost:5432/scratch
+#   migrations/apply_scratch.sh postgres://... old_supabase_schema.sql
+#
+# the database must be empty, a superuser url is needed (roles, pg_trgm).
+# with an older init script, it is applied instead of supabase_schema.sql
+# and upgraded with 001_upgrade_schema.sql. the anon and service_role roles
+# are created with supabase's default privileges when they are missing.
+set -euo pipefail
+
+if [ $# -lt 1 ]; then
+  sed -n '2,11p' "$0"
+  exit 1
+fi
+
+DATABASE_URL=$1
+OLD_SCHEMA=${2:-}
+ROOT=$(cd "$(dirname "$0")/.." && pwd)
+
+psql_run() {
+  psql "$DATABASE_URL" --quiet --no-psqlrc -v ON_ERROR_STOP=1 "$@"
+}
+
+echo "Creating the api roles..."
+psql_run <<'SQL'
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+    CREATE ROLE anon NOLOGIN;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+    CREATE ROLE service_role NOLOGIN BYPASSRLS;
+  END IF;
+END;
+$$;
+GRANT USAGE ON SCHEMA public TO anon, service_role;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public
+  GRANT ALL ON TABLES TO anon, service_role;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public
+  GRANT ALL ON SEQUENCES TO anon, service_role;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public
+  GRANT ALL ON FUNCTIONS TO anon, service_role;
+SQL
+
+if [ -n "$OLD_SCHEMA" ]; then
+  echo "Applying $OLD_SCHEMA..."
+  psql_run -f "$OLD_SCHEMA"
+  echo "Applying 001_upgrade_schema.sql..."
+  psql_run -f "$ROOT/migrations/001_upgrade_schema.sql"
+else
+  echo "Applying supabase_schema.sql..."
+  psql_run -f "$ROOT/supabase_schema.sql"
+fi
+
+echo "Applying 002_partition_by_release_year.sql..."
+psql_run -f "$ROOT/migrations/002_partition_by_release_year.sql"
+
+echo "Loading, staging, summarizing, leasing and dropping a release as anon..."
+psql_run <<'SQL'
+BEGIN;
+SET LOCAL ROLE anon;
+INSERT INTO public.release (id, year, page_count, file_meta_created_at, file_meta_modified_at)
+VALUES ('id_1999', 1999, 1, '', '');
+SELECT * FROM public.load_nca_batch(
+  '[{"nca_number": "SCRATCH-1", "purpose": "scratch load", "release_id": "id_1999"}]',
+  '[{"nca_number": "SCRATCH-1", "agency": "scratch agency", "operating_unit": "scratch unit", "amount": 1}]'
+);
+SELECT * FROM public.stage_nca_batch(
+  'id_1999',
+  1,
+  '{1}',
+  '[{"nca_number": "SCRATCH-2", "purpose": "scratch reload"}]',
+  '[{"nca_number": "SCRATCH-2", "agency": "scratch agency", "operating_unit": "scratch unit", "amount": 2}]'
+);
+SELECT * FROM public.complete_staged_release('id_1999', 1);
+SELECT * FROM public.complete_staged_release('id_1999', 1);
+SELECT nca_number, purpose FROM public.search_records('scratch');
+SELECT * FROM public.fold_summaries();
+INSERT INTO public.work_lease (id, release_id, start_page_num, batch)
+VALUES ('id_1999:1-1', 'id_1999', 1, '{}');
+SELECT id, status, attempts FROM public.claim_work_lease('scratch-worker', 60, 2);
+SELECT public.renew_work_lease('id_1999:1-1', 'scratch-worker', 60) IS NOT NULL AS renewed;
+SELECT public.drop_release('id_1999');
+ROLLBACK;
+SQL
+
+echo "Done"
@@ -0,0 +1,524 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.release import Release
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.release_batcher import ReleaseBatcher
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.infrastructure.adapters.sqlite_queue import SQLiteQueue
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    AVG_PAGE_DURATION_S,
+    BATCH_SIZE,
+    BATCH_TARGET_DURATION_S,
+    BENCHMARK_PAGES,
+    BENCHMARK_REGRESSION_THRESHOLD,
+    BENCHMARK_REPEAT,
+    BENCHMARK_RESULTS_PATH,
+    DB_BULK_SIZE,
+    DLQ_NAME,
+    MAX_BATCH_SIZE,
+    QUEUE_MAX_RECEIVE_COUNT,
+    QUEUE_VISIBILITY_TIMEOUT_S,
+    RECORD_COLUMNS,
+    VALID_COLUMNS,
+)
+from src.logging_config import setup_logging
+from src.synthetic_nca_pdf import SyntheticNCAPDF
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+RELEASE_ID = "id_benchmark"
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    unit: str
+    count: int
+    seconds: float  # best of the repeats
+    ops_per_s: float
+    peak_memory_mb: float  # python allocations (tracemalloc, separate run)
+    matches_expected: bool | None = None  # cleaned output vs generated NCAData
+
+
+class BenchmarkRun(BaseModel):
+    created_at: str
+    python: str
+    platform: str
+    pages: int
+    repeat: int
+    results: Dict[str, BenchmarkResult]
+    max_rss_mb: float
+
+
+# ---------------------
+# local postgrest stand-in
+# ---------------------
+
+
+class _PostgrestHandler(BaseHTTPRequestHandler):
+    """accepts inserts/upserts like postgrest and counts the rows"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        rows = json.loads(body) if body else []
+        if self.path.endswith("/rpc/load_nca_batch"):
+            counts = {
+                "record_count": len(rows["p_records"]),
+                "allocation_count": len(rows["p_allocations"]),
+            }
+            self.server.row_count += sum(counts.values())
+            payload = json.dumps([counts]).encode()
+        elif self.path.endswith("/rpc/fold_summaries"):
+            counts = {"department_count": 0, "agency_count": 0, "month_count": 0}
+            payload = json.dumps([counts]).encode()
+        elif self.path.endswith("/rpc/insert_allocations"):
+            self.server.row_count += len(rows["p_allocations"])
+            payload = json.dumps(len(rows["p_allocations"])).encode()
+        else:
+            self.server.row_count += len(rows) if isinstance(rows, list) else 1
+            payload = b"[]"
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PostgrestStandIn:
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _PostgrestHandler)
+        self.server.row_count = 0  # pyright: ignore
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ---------------------
+# benchmarks
+# ---------------------
+
+
+class BenchmarkSuite:
+    """
+    every benchmark is a setup step (not measured) that returns the work
+    to time and the number of items it processes
+    """
+
+    def __init__(self, pages: int, repeat: int, stand_in_url: str):
+        self.pages = pages
+        self.repeat = repeat
+        self.stand_in_url = stand_in_url
+        self.parser = PDFParser()
+        self.data_cleaner = PdDataCleaner(
+            allocation_comumns=ALLOCATION_COLUMNS,
+            record_columns=RECORD_COLUMNS,
+            valid_columns=VALID_COLUMNS,
+        )
+        self._pdf: bytes | None = None
+        self._nca_data: NCAData | None = None
+        self._tables: List[Tuple[int, List[List[str | None]]]] | None = None
+
+    def get_benchmarks(self) -> Dict[str, Tuple[str, Callable]]:
+        return {
+            "parser_extract_table": ("pages/s", self._setup_parser_extract_table),
+            "parser_page_costs": ("pages/s", self._setup_parser_page_costs),
+            "parser_split_batches": ("pages/s", self._setup_parser_split_batches),
+            "storage_load_extract": ("pages/s", self._setup_storage_load_extract),
+            "cleaner_clean_raw_data": ("rows/s", self._setup_cleaner_clean_raw_data),
+            "cleaner_clean_page_stitch": ("rows/s", self._setup_cleaner_stitch),
+            "batcher_weighted": ("pages/s", self._setup_batcher_weighted),
+            "message_serialisation": ("messages/s", self._setup_serialisation),
+            "sqlite_queue_roundtrip": ("messages/s", self._setup_sqlite_queue),
+            "repository_upsert_records": ("records/s", self._setup_repo_records),
+            "repository_insert_allocations": (
+                "allocations/s",
+                self._setup_repo_allocations,
+            ),
+            "repository_load_batch": ("rows/s", self._setup_repo_load_batch),
+        }
+
+    def run(self, names: List[str] | None = None) -> BenchmarkRun:
+        results: Dict[str, BenchmarkResult] = {}
+        for name, (unit, setup) in self.get_benchmarks().items():
+            if names and name not in names:
+                continue
+            logger.info(f"Running {name}...")
+            results[name] = self._measure(name, unit, setup)
+            result = results[name]
+            logger.info(
+                f"{name}: {result.ops_per_s:,.1f} {unit} "
+                f"({result.count} in {result.seconds:.3f}s, "
+                f"peak {result.peak_memory_mb:.1f} MB)"
+            )
+            if result.matches_expected is False:
+                logger.error(f"{name}: output does not match the generated data")
+
+        return BenchmarkRun(
+            created_at=datetime.now(timezone.utc).isoformat(),
+            python=platform.python_version(),
+            platform=platform.platform(),
+            pages=self.pages,
+            repeat=self.repeat,
+            results=results,
+            # linux reports kilobytes
+            max_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        )
+
+    def _measure(self, name: str, unit: str, setup: Callable) -> BenchmarkResult:
+        best_seconds = float("inf")
+        count = 0
+        output = None
+        for _ in range(self.repeat):
+            work, count = setup()
+            start_time = time.perf_counter()
+            output = work()
+            best_seconds = min(best_seconds, time.perf_counter() - start_time)
+
+        # tracing slows everything down, so memory gets its own run
+        work, _ = setup()
+        tracemalloc.start()
+        work()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return BenchmarkResult(
+            name=name,
+            unit=unit,
+            count=count,
+            seconds=best_seconds,
+            ops_per_s=count / max(best_seconds, 1e-9),
+            peak_memory_mb=peak / (1024 * 1024),
+            matches_expected=(
+                self._matches_expected(output)
+                if isinstance(output, NCAData)
+                else None
+            ),
+        )
+
+    def _matches_expected(self, nca_data: NCAData) -> bool:
+        expected = self._get_nca_data()
+
+        def allocation_key(allocation):
+            return (allocation.nca_number, allocation.amount, allocation.agency)
+
+        return sorted(nca_data.records, key=lambda r: r.nca_number) == sorted(
+            expected.records, key=lambda r: r.nca_number
+        ) and sorted(nca_data.allocations, key=allocation_key) == sorted(
+            expected.allocations, key=allocation_key
+        )
+
+    # fixtures (built once, outside the timed work)
+
+    def _get_pdf(self) -> bytes:
+        if self._pdf is None:
+            pdf, self._nca_data = SyntheticNCAPDF(
+                pages=self.pages, release_id=RELEASE_ID
+            ).generate()
+            self._pdf = pdf.getvalue()
+        return self._pdf
+
+    def _get_nca_data(self) -> NCAData:
+        self._get_pdf()
+        return self._nca_data  # pyright: ignore
+
+    def _get_batches(self) -> List[ReleaseBatch]:
+        """the 1-based page ranges a worker is sent for the release"""
+        page_count = self.parser.get_page_count(self._get_pdf())
+        return ReleaseBatcher(batch_size=BATCH_SIZE).run(
+            self._get_release(page_count)
+        )
+
+    def _get_page_nums(self) -> List[int]:
+        return [
+            page_num
+            for batch in self._get_batches()
+            for page_num in range(batch.start_page_num, batch.end_page_num + 1)
+        ]
+
+    def _get_tables(self) -> List[Tuple[int, List[List[str | None]]]]:
+        if self._tables is None:
+            data = self._get_pdf()
+            self._tables = [
+                (page_num, self.parser.extract_table_by_page_num(data, page_num))
+                for page_num in self._get_page_nums()
+            ]
+        return self._tables
+
+    def _get_release(self, page_count: int) -> Release:
+        return Release(
+            id=RELEASE_ID,
+            title="benchmark",
+            url="",
+            filename="benchmark.pdf",
+            year=2026,
+            page_count=page_count,
+        )
+
+    # setups
+
+    def _setup_parser_extract_table(self):
+        data = self._get_pdf()
+        page_nums = self._get_page_nums()
+
+        def work():
+            for page_num in page_nums:
+                self.parser.extract_table_by_page_num(data, page_num)
+
+        return work, len(page_nums)
+
+    def _setup_parser_page_costs(self):
+        data = self._get_pdf()
+        return lambda: self.parser.get_page_costs(data), self.pages
+
+    def _setup_parser_split_batches(self):
+        # pre-splitting a release into per-batch pdfs, streamed to storage
+        data = self._get_pdf()
+        storage = LocalStorage(base_storage_path=tempfile.mkdtemp())
+        batches = self._get_batches()
+
+        def work():
+            for batch in batches:
+                start, end = batch.start_page_num, batch.end_page_num
+                with storage.open_file_writer(f"{RELEASE_ID}/{start}-{end}.pdf") as out:
+                    self.parser.write_pages(data, start, end, out)
+
+        return work, self.pages
+
+    def _setup_storage_load_extract(self):
+        # a worker batch: the stored release is mapped, not copied per page
+        storage = LocalStorage(base_storage_path=tempfile.mkdtemp())
+        storage.save_file("benchmark.pdf", self._get_pdf())
+        page_nums = self._get_page_nums()
+
+        def work():
+            data = storage.load_file("benchmark.pdf")
+            for page_num in page_nums:
+                self.parser.extract_table_by_page_num(
+                    data, page_num  # pyright: ignore
+                )
+
+        return work, len(page_nums)
+
+    def _setup_cleaner_clean_raw_data(self):
+        tables = self._get_tables()
+
+        def work():
+            for _, table in tables:
+                self.data_cleaner.clean_raw_data(table, RELEASE_ID)
+
+        return work, sum(len(table) for _, table in tables)
+
+    def _setup_cleaner_stitch(self):
+        tables = self._get_tables()
+        page_cleaner = PageTableCleaner(data_cleaner=self.data_cleaner)
+        stitcher = PageStitcher(data_cleaner=self.data_cleaner)
+
+        def work():
+            pages = [
+                page_cleaner.run(table, RELEASE_ID, page_num)
+                for page_num, table in tables
+            ]
+            return stitcher.run(pages, RELEASE_ID)
+
+        return work, sum(len(table) for _, table in tables)
+
+    def _setup_batcher_weighted(self):
+        # a large release so batching itself shows up
+        page_count = 10_000
+        page_costs = [float(1000 + (i * 7919) % 5000) for i in range(page_count)]
+        release = self._get_release(page_count)
+        batcher = ReleaseBatcher(
+            batch_size=BATCH_SIZE,
+            target_batch_duration_s=BATCH_TARGET_DURATION_S,
+            avg_page_duration_s=AVG_PAGE_DURATION_S,
+            max_batch_size=MAX_BATCH_SIZE,
+        )
+        return lambda: batcher.run(release, page_costs), page_count
+
+    def _setup_serialisation(self):
+        release = self._get_release(self.pages)
+        batches = [
+            ReleaseBatch(
+                batch_num=i, release=release, start_page_num=i, end_page_num=i
+            )
+            for i in range(1, 10_001)
+        ]
+
+        def work():
+            # what SQSQueue.send and the handlers do per message
+            for batch in batches:
+                body = json.dumps(batch.model_dump(mode="json"))
+                ReleaseBatch(**json.loads(body))
+
+        return work, len(batches)
+
+    def _setup_sqlite_queue(self):
+        release = self._get_release(self.pages)
+        batches = [
+            ReleaseBatch(
+                batch_num=i, release=release, start_page_num=i, end_page_num=i
+            )
+            for i in range(1, 2_001)
+        ]
+        db_dir = tempfile.mkdtemp()
+        queue = SQLiteQueue(
+            db_path=os.path.join(db_dir, "benchmark_queue.db"),
+            queue_name="benchmark",
+            visibility_timeout_s=QUEUE_VISIBILITY_TIMEOUT_S,
+            max_receive_count=QUEUE_MAX_RECEIVE_COUNT,
+            dlq_name=DLQ_NAME,
+        )
+
+        def work():
+            queue.send_batch(batches)
+            while messages := queue.receive(max_messages=10):
+                queue.delete_batch([m.receipt_handle for m in messages])
+
+        return work, len(batches)
+
+    def _setup_repo_records(self):
+        records = self._get_nca_data().records
+        repository = self._get_stand_in_repository()
+        return lambda: repository.bulk_upsert_records(records), len(records)
+
+    def _setup_repo_allocations(self):
+        allocations = self._get_nca_data().allocations
+        repository = self._get_stand_in_repository()
+        return lambda: repository.bulk_insert_allocations(allocations), len(
+            allocations
+        )
+
+    def _setup_repo_load_batch(self):
+        # records and allocations of each batch in one rpc
+        nca_data = self._get_nca_data()
+        repository = self._get_stand_in_repository()
+        batches = []
+        for i in range(0, len(nca_data.records), DB_BULK_SIZE):
+            records = nca_data.records[i : i + DB_BULK_SIZE]
+            nca_numbers = {record.nca_number for record in records}
+            allocations = [
+                a for a in nca_data.allocations if a.nca_number in nca_numbers
+            ]
+            batches.append((records, allocations))
+
+        def work():
+            for records, allocations in batches:
+                repository.load_batch(records, allocations)
+
+        return work, len(nca_data.records) + len(nca_data.allocations)
+
+    def _get_stand_in_repository(self):
+        from src.infrastructure.adapters.supabase_repository import (
+            SupabaseRepository,
+        )
+        from src.infrastructure.config import settings
+
+        # the repository reads the url from settings
+        settings.SUPABASE_URL = self.stand_in_url
+        return SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
+
+
+# ---------------------
+# baseline comparison
+# ---------------------
+
+
+def compare_to_baseline(
+    run: BenchmarkRun, baseline: BenchmarkRun, threshold: float
+) -> List[str]:
+    """names of the benchmarks that got slower (or bigger) than threshold"""
+    regressions = []
+    for name, result in run.results.items():
+        base = baseline.results.get(name)
+        if not base:
+            logger.info(f"{name}: no baseline")
+            continue
+
+        speed_ratio = result.ops_per_s / max(base.ops_per_s, 1e-9)
+        memory_ratio = result.peak_memory_mb / max(base.peak_memory_mb, 1e-9)
+        is_slower = speed_ratio < 1 - threshold
+        is_bigger = memory_ratio > 1 + threshold and (
+            result.peak_memory_mb - base.peak_memory_mb > 1
+        )
+        status = "REGRESSION" if is_slower or is_bigger else "ok"
+        logger.info(
+            f"{name}: {speed_ratio:.2f}x speed, {memory_ratio:.2f}x memory "
+            f"vs baseline [{status}]"
+        )
+        if is_slower or is_bigger:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Benchmark the parser, cleaner, batcher, queue and repository"
+    )
+    arg_parser.add_argument("--pages", type=int, default=BENCHMARK_PAGES)
+    arg_parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT)
+    arg_parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    arg_parser.add_argument("--out", default=BENCHMARK_RESULTS_PATH)
+    arg_parser.add_argument("--baseline", help="results json to compare against")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD
+    )
+    args = arg_parser.parse_args()
+
+    # keep per-call info logs out of the timed loops
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    with PostgrestStandIn() as stand_in:
+        suite = BenchmarkSuite(
+            pages=args.pages, repeat=args.repeat, stand_in_url=stand_in.url
+        )
+        run = suite.run(args.only)
+
+    with open(args.out, "w") as f:
+        json.dump(run.model_dump(mode="json"), f, indent=2)
+    logger.info(f"Saved results to {args.out} (max rss {run.max_rss_mb:.1f} MB)")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = BenchmarkRun(**json.load(f))
+        regressions = compare_to_baseline(run, baseline, args.threshold)
+        if regressions:
+            logger.error(
+                f"{len(regressions)} regressions above {args.threshold:.0%}: "
+                f"{', '.join(regressions)}"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
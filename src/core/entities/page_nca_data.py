@@ -0,0 +1,27 @@
+from typing import List
+from pydantic import BaseModel
+
+from src.core.entities.nca_data import NCAData
+
+
+class PageNCAData(BaseModel):
+    page_num: int
+    header: List[str | None]
+    # rows before the first nca number (continuation of the previous page)
+    leading_rows: List[List[str | None]]
+    # groups that start and end on this page
+    nca_data: NCAData
+    # rows of the last group on this page (may continue on the next page)
+    trailing_rows: List[List[str | None]]
+    has_group_start: bool
+
+    def as_continuation(self) -> "PageNCAData":
+        """keep only the rows that continue the previous page's open group"""
+        return PageNCAData(
+            page_num=self.page_num,
+            header=self.header,
+            leading_rows=self.leading_rows,
+            nca_data=NCAData(records=[], allocations=[]),
+            trailing_rows=[],
+            has_group_start=False,
+        )
@@ -0,0 +1,16 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class PageRows(BaseModel):
+    """a page's raw rows, split at the rows that start an nca group"""
+
+    page_num: int
+    header: List[str | None]
+    # rows before the first nca number (continuation of the previous page)
+    leading_rows: List[List[str | None]]
+    # groups that start and end on this page
+    closed_rows: List[List[str | None]]
+    # rows of the last group on this page (may continue on the next page)
+    trailing_rows: List[List[str | None]]
+    has_group_start: bool
@@ -0,0 +1,12 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class QueueMessage(BaseModel):
+    message_id: str
+    receipt_handle: str
+    body: str
+    receive_count: int
+    sent_at: float  # epoch seconds
+    attributes: Dict[str, str] = {}
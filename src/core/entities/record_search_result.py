@@ -0,0 +1,6 @@
+from src.core.entities.record import Record
+
+
+class RecordSearchResult(Record):
+    id: int
+    rank: float  # word matches rank above substring matches
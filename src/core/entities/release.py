@@ -11,3 +11,5 @@ class Release(BaseModel):
     page_count: int = 0
     file_meta_created_at: Optional[str] = None
     file_meta_modified_at: Optional[str] = None
+    # changed release: batches are staged and swapped in, not stored in the db
+    reload: bool = False
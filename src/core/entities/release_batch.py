@@ -8,3 +8,14 @@ class ReleaseBatch(BaseModel):
     release: Release
     start_page_num: int
     end_page_num: int
+    # spool mode: a queued retry of the release's spool merge, no pages read
+    spool_merge_attempt: int = 0
+    # the nth remainder re-enqueued before a worker deadline, 0 for a batch
+    split_num: int = 0
+
+    @property
+    def batch_id(self) -> str:
+        """batch_num, and the split of a re-enqueued remainder (3.1, 3.2)"""
+        if self.split_num:
+            return f"{self.batch_num}.{self.split_num}"
+        return str(self.batch_num)
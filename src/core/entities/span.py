@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+
+class Span(BaseModel):
+    trace_id: str
+    function_name: str
+    stage: str  # scrape, orchestrate, process
+    release_id: str | None = None
+    batch_num: int | None = None
+    split_num: int | None = None  # re-enqueued remainders of the batch
+    start_page_num: int | None = None
+    end_page_num: int | None = None
+    status: str = "ok"  # ok or error
+    # epoch seconds
+    trace_started_at: float
+    enqueued_at: float | None = None
+    started_at: float
+    ended_at: float
+    # seconds: in the queue, in the handler, since the trace began
+    queue_wait_s: float
+    processing_s: float
+    time_to_data_s: float
@@ -0,0 +1,34 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+# message attribute names (sqs allows at most 10 attributes per message)
+TRACE_ID_ATTRIBUTE = "trace_id"
+TRACE_STARTED_AT_ATTRIBUTE = "trace_started_at"
+ENQUEUED_AT_ATTRIBUTE = "enqueued_at"
+# set to "true" on a message to profile the invocation that receives it
+PROFILE_ATTRIBUTE = "profile"
+
+
+class TraceContext(BaseModel):
+    trace_id: str  # one per scraper run, shared by its releases and batches
+    started_at: float  # epoch seconds, when the trace began
+    enqueued_at: float | None = None  # epoch seconds, when the message was sent
+
+    def to_attributes(self, enqueued_at: float) -> Dict[str, str]:
+        return {
+            TRACE_ID_ATTRIBUTE: self.trace_id,
+            TRACE_STARTED_AT_ATTRIBUTE: repr(self.started_at),
+            ENQUEUED_AT_ATTRIBUTE: repr(enqueued_at),
+        }
+
+    @classmethod
+    def from_attributes(cls, attributes: Dict[str, str]) -> "TraceContext | None":
+        if TRACE_ID_ATTRIBUTE not in attributes:
+            return None
+        enqueued_at = attributes.get(ENQUEUED_AT_ATTRIBUTE)
+        return cls(
+            trace_id=attributes[TRACE_ID_ATTRIBUTE],
+            started_at=float(attributes[TRACE_STARTED_AT_ATTRIBUTE]),
+            enqueued_at=float(enqueued_at) if enqueued_at else None,
+        )
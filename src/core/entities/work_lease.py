@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from src.core.entities.release_batch import ReleaseBatch
+
+
+class WorkLease(BaseModel):
+    id: str
+    batch: ReleaseBatch
+    worker_id: str
+    expires_at: float  # epoch seconds
+    attempts: int = 1
@@ -0,0 +1,12 @@
+from typing import Any, BinaryIO, Dict, List, Protocol
+
+
+class ColumnarProvider(Protocol):
+    def write_table(
+        self, rows: List[Dict[str, Any]], columns: Dict[str, str], out: BinaryIO
+    ) -> None:
+        """
+        write rows as one columnar (parquet) file to a (storage) stream,
+        columns maps each column to its type: string, float64 or timestamp
+        """
+        ...
@@ -1,6 +1,7 @@
 from typing import List, Protocol
 
 from src.core.entities.nca_data import NCAData
+from src.core.entities.page_rows import PageRows
 
 
 class DataCleanerProvider(Protocol):
@@ -10,3 +11,14 @@ class DataCleanerProvider(Protocol):
                        ) -> NCAData:
         """clean list of raw data into list of record and list of allocation"""
         ...
+
+    def split_page(self,
+                   raw_rows: List[List[str | None]],
+                   page_num: int
+                   ) -> PageRows:
+        """
+        split a single page's raw rows into the leading continuation, the
+        groups closed on the page and the trailing open group, so the closed
+        groups can be cleaned and neighbouring pages stitched
+        """
+        ...
@@ -0,0 +1,19 @@
+from typing import Protocol
+
+
+class MetricsProvider(Protocol):
+    def record(
+        self,
+        stage: str,
+        duration_s: float = 0.0,
+        pages: int = 0,
+        rows: int = 0,
+        size_bytes: int = 0,
+        failures: int = 0,
+    ) -> None:
+        """add one measurement of a stage (download, inspect, extract, ...)"""
+        ...
+
+    def flush(self) -> None:
+        """emit the measurements recorded since the last flush"""
+        ...
@@ -1,24 +1,45 @@
-from typing import List, Protocol
+from typing import BinaryIO, Iterator, List, Protocol, Tuple
 from io import BytesIO
 
 from src.core.entities.metadata import MetaData
+from src.core.interfaces.storage import FileData
 
 
 class ParserProvider(Protocol):
-    def get_metadata_by_data(self, data: BytesIO) -> MetaData:
+    def get_version(self) -> str:
+        """identifies the extraction output, changes when the tables would"""
+        ...
+
+    def get_metadata_by_data(self, data: FileData) -> MetaData:
         """extract the metadata of a give file bytes"""
         ...
 
-    def get_page_count(self, data: BytesIO) -> int:
+    def get_page_count(self, data: FileData) -> int:
         """get the page count of a file"""
         ...
 
-    def split_pages(self, data: BytesIO) -> List[BytesIO]:
-        """split multi-page file into single-page pdfs"""
+    def get_page_costs(self, data: FileData) -> List[float]:
+        """cheaply estimate the relative extraction cost of each page"""
+        ...
+
+    def split_pages(
+        self,
+        data: FileData,
+        start_page_num: int = 1,
+        end_page_num: int | None = None,
+        slice_size: int = 1,
+    ) -> Iterator[Tuple[int, int, BytesIO]]:
+        """lazily split a page range into (start, end, pdf) slices"""
+        ...
+
+    def write_pages(
+        self, data: FileData, start_page_num: int, end_page_num: int, out: BinaryIO
+    ) -> None:
+        """write a page range as one pdf to a (storage) stream"""
         ...
 
     def extract_table_by_page_num(
-        self, data: BytesIO, page_num: int
+        self, data: FileData, page_num: int
     ) -> List[List[str | None]]:
         """
         extract file page's table/s between
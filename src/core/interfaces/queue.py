@@ -1,9 +1,9 @@
-from typing import Protocol
+from typing import Dict, Protocol
 
 from pydantic import BaseModel
 
 
 class QueueProvider(Protocol):
-    def send(self, data: BaseModel) -> None:
+    def send(self, data: BaseModel, attributes: Dict[str, str] | None = None) -> None:
         """sends a batch of extracted rows to the queue"""
         ...
@@ -1,5 +1,6 @@
-from typing import List, Protocol
+from typing import List, Protocol, Tuple
 from src.core.entities.record import Record
+from src.core.entities.record_search_result import RecordSearchResult
 from src.core.entities.allocation import Allocation
 from src.core.entities.release import Release
 
@@ -28,3 +29,73 @@ class RepositoryProvider(Protocol):
     def bulk_insert_allocations(self, allocations: List[Allocation]) -> None:
         """insert multiple new allocations"""
         ...
+
+    def load_batch(
+        self, records: List[Record], allocations: List[Allocation]
+    ) -> Tuple[int, int]:
+        """
+        upsert records and replace their allocations in one transaction,
+        return the loaded record and allocation counts
+        """
+        ...
+
+    def stage_batch(
+        self,
+        release: Release,
+        page_nums: List[int],
+        records: List[Record],
+        allocations: List[Allocation],
+    ) -> Tuple[int, int, bool]:
+        """
+        stage a batch of a reloaded release next to its live rows, return
+        the staged record and allocation counts and whether every page of
+        the release is staged
+        """
+        ...
+
+    def complete_staged_release(self, release: Release) -> bool:
+        """
+        swap a fully staged release in (its own call, safe to retry),
+        False when it is not fully staged or was already swapped
+        """
+        ...
+
+    def clear_staged_release(self, id: str) -> None:
+        """drop the staged rows of a release"""
+        ...
+
+    def claim_spool_merge(
+        self, release_id: str, owner: str, lease_duration_s: float
+    ) -> bool:
+        """
+        lease the merge of a release's spooled batches, False while another
+        owner's lease has not expired
+        """
+        ...
+
+    def end_spool_merge(self, release_id: str, owner: str) -> None:
+        """give up a spool merge lease still held by the owner"""
+        ...
+
+    def fold_summaries(self) -> Tuple[int, int, int]:
+        """
+        add the summary deltas appended by the loads to the summary tables,
+        return the department, agency and month summary rows updated
+        """
+        ...
+
+    def rebuild_summaries(self) -> Tuple[int, int, int]:
+        """
+        recompute the summary tables from the loaded rows, return the
+        department, agency and month summary row counts
+        """
+        ...
+
+    def search_records(
+        self, query: str, limit: int, offset: int = 0, year: int | None = None
+    ) -> List[RecordSearchResult]:
+        """
+        a page of records whose purpose, department or allocations' agency
+        or operating unit match the query, best ranked first
+        """
+        ...
@@ -0,0 +1,9 @@
+from typing import Protocol
+
+from src.core.entities.span import Span
+
+
+class SpanRecorder(Protocol):
+    def record(self, span: Span) -> None:
+        """persist one finished span"""
+        ...
@@ -1,5 +1,8 @@
-from typing import Protocol
-from io import BytesIO
+from typing import BinaryIO, ContextManager, List, Protocol, TypeAlias
+
+# file contents passed across the storage/parser boundary: a stream, or a
+# bytes-like buffer (bytes, memoryview over an mmap) that is read in place
+FileData: TypeAlias = BinaryIO | bytes | bytearray | memoryview
 
 
 class StorageProvider(Protocol):
@@ -8,10 +11,22 @@ class StorageProvider(Protocol):
         """return the full storage path of a file"""
         ...
 
-    def save_file(self, filename: str, data: BytesIO):
+    def save_file(self, filename: str, data: FileData):
         """saves data to the destination (s3, disk, etc)"""
         ...
 
-    def load_file(self, filename: str) -> BytesIO | None:
-        """load data into memory"""
+    def load_file(self, filename: str) -> memoryview | None:
+        """load data as a read-only buffer (memory-mapped where possible)"""
+        ...
+
+    def open_file_writer(self, filename: str) -> ContextManager[BinaryIO]:
+        """stream data to the destination, saved when the context exits"""
+        ...
+
+    def list_files(self, prefix: str) -> List[str]:
+        """filenames (relative to the storage base path) starting with prefix"""
+        ...
+
+    def delete_file(self, filename: str) -> None:
+        """delete a file, missing files are ignored"""
         ...
@@ -0,0 +1,33 @@
+from typing import List, Protocol
+
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.entities.work_lease import WorkLease
+
+
+class WorkLeaseProvider(Protocol):
+    def add_batches(self, batches: List[ReleaseBatch]) -> None:
+        """add (or reset) claimable page chunks to the shared work table"""
+        ...
+
+    def claim(self, worker_id: str, lease_duration_s: float) -> WorkLease | None:
+        """lease the next pending or expired chunk, None if nothing is left"""
+        ...
+
+    def renew(self, lease: WorkLease, lease_duration_s: float) -> bool:
+        """extend a lease that is still owned by the worker"""
+        ...
+
+    def complete(self, lease: WorkLease) -> bool:
+        """mark a leased chunk as done"""
+        ...
+
+    def release(self, lease: WorkLease) -> bool:
+        """
+        give up a leased chunk that failed: pending again for any worker,
+        or failed once its attempts are used up
+        """
+        ...
+
+    def count_remaining(self) -> int:
+        """count chunks that are not done or failed"""
+        ...
@@ -1,26 +1,41 @@
 from functools import lru_cache
 import logging
+import time
 
+from src.core.interfaces.metrics import MetricsProvider
 from src.core.interfaces.storage import StorageProvider
 
 logger = logging.getLogger(__name__)
 
 
 class FileBytesMemoLoader:
-    def __init__(self, storage: StorageProvider):
+    def __init__(
+        self, storage: StorageProvider, metrics: MetricsProvider | None = None
+    ):
         self.storage = storage
+        self.metrics = metrics
 
     @lru_cache(maxsize=1)
-    def run(self, filename: str) -> bytes | None:
+    def run(self, filename: str) -> memoryview | None:
+        start_time = time.monotonic()
         try:
             logger.info(f"Loading file stream to memory for {filename}...")
-            file_stream = self.storage.load_file(filename)
-            if not file_stream:
+            # shared by every page of the batch, read in place without copies
+            data = self.storage.load_file(filename)
+            if data is None:
                 logger.warning(f"No file stream found for {filename}")
                 return None
             logger.info(f"Loaded file stream to memory for {filename}")
-            return file_stream.read()
+            self._record_metrics(start_time, size_bytes=data.nbytes)
+            return data
 
         except Exception as e:
             logger.error(f"Error loading file stream memo for {filename}: {e}")
+            self._record_metrics(start_time, failures=1)
             return None
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "download", duration_s=time.monotonic() - start_time, **counts
+            )
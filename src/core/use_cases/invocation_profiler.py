@@ -0,0 +1,117 @@
+import cProfile
+from contextlib import contextmanager
+from io import BytesIO, StringIO
+import logging
+import marshal
+import pstats
+import random
+import time
+import tracemalloc
+from typing import Iterator
+
+from src.core.interfaces.storage import StorageProvider
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileSession:
+    def __init__(self, profiler: cProfile.Profile, owns_tracemalloc: bool):
+        self.profiler = profiler
+        self.owns_tracemalloc = owns_tracemalloc
+        self.start_time = time.monotonic()
+
+
+class InvocationProfiler:
+    """
+    cprofile + tracemalloc around a sampled (or forced) invocation, saved as
+    <storage_prefix>/<run_id>/<name>.prof (pstats, open with snakeviz or
+    pstats.Stats) and .txt (top functions and allocations)
+
+    cprofile only sees the calling thread, not the executor threads of the
+    worker pipeline mode
+    """
+
+    def __init__(
+        self,
+        storage: StorageProvider,
+        sample_rate: float,
+        storage_prefix: str,
+        top_functions: int,
+        top_allocations: int,
+    ):
+        self.storage = storage
+        self.sample_rate = sample_rate
+        self.storage_prefix = storage_prefix
+        self.top_functions = top_functions
+        self.top_allocations = top_allocations
+
+    def start(self, force: bool = False) -> ProfileSession | None:
+        if not force and random.random() >= self.sample_rate:
+            return None
+        try:
+            owns_tracemalloc = not tracemalloc.is_tracing()
+            if owns_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return ProfileSession(profiler, owns_tracemalloc)
+
+        except Exception as e:
+            logger.error(f"Failed to start profiling: {e}", exc_info=True)
+            return None
+
+    def stop(self, session: ProfileSession | None, run_id: str, name: str) -> None:
+        if session is None:
+            return
+        session.profiler.disable()
+        elapsed_s = time.monotonic() - session.start_time
+        key = f"{self.storage_prefix}/{run_id}/{name}"
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            if session.owns_tracemalloc:
+                tracemalloc.stop()
+
+            session.profiler.create_stats()
+            self.storage.save_file(
+                f"{key}.prof",
+                BytesIO(marshal.dumps(session.profiler.stats)),  # pyright: ignore
+            )
+            report = self._get_report(session, snapshot, peak_bytes, elapsed_s)
+            self.storage.save_file(f"{key}.txt", BytesIO(report.encode("utf-8")))
+            logger.info(
+                f"Saved profile {self.storage.get_filename_full_path(key)}.prof "
+                f"({elapsed_s:.1f}s, peak {peak_bytes / 2**20:.1f} MB)"
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to save profile {key}: {e}", exc_info=True)
+
+    @contextmanager
+    def profile(self, run_id: str, name: str, force: bool = False) -> Iterator[None]:
+        session = self.start(force)
+        try:
+            yield
+        finally:
+            self.stop(session, run_id, name)
+
+    def _get_report(
+        self,
+        session: ProfileSession,
+        snapshot: tracemalloc.Snapshot,
+        peak_bytes: int,
+        elapsed_s: float,
+    ) -> str:
+        stream = StringIO()
+        stream.write(
+            f"elapsed {elapsed_s:.3f}s, "
+            f"peak traced memory {peak_bytes / 2**20:.1f} MB\n\n"
+        )
+        stats = pstats.Stats(session.profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_functions)
+
+        stream.write(f"top {self.top_allocations} allocations still held:\n")
+        for stat in snapshot.statistics("lineno")[: self.top_allocations]:
+            stream.write(f"{stat}\n")
+        return stream.getvalue()
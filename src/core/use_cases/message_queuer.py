@@ -1,25 +1,40 @@
 import logging
+import time
 
 from pydantic import BaseModel
 
+from src.core.entities.trace_context import TraceContext
+from src.core.interfaces.metrics import MetricsProvider
 from src.core.interfaces.queue import QueueProvider
 
 logger = logging.getLogger(__name__)
 
 
 class MessageQueuer:
-    def __init__(self, queue: QueueProvider):
+    def __init__(self, queue: QueueProvider, metrics: MetricsProvider | None = None):
         self.queue = queue
+        self.metrics = metrics
 
-    def run(self, message: BaseModel) -> bool:
+    def run(self, message: BaseModel, trace: TraceContext | None = None) -> bool:
+        """trace is propagated in the message attributes with the send time"""
+        start_time = time.monotonic()
         try:
             logger.debug(f"Queueing message: {message}")
-            self.queue.send(message)
+            attributes = trace.to_attributes(enqueued_at=time.time()) if trace else None
+            self.queue.send(message, attributes)
             logger.debug(f"Successfully queued message: {message}")
+            self._record_metrics(start_time)
             return True
 
         except Exception as e:
             logger.error(
                 f"Failed to queue message: {message}\n" f">> {e}", exc_info=True
             )
+            self._record_metrics(start_time, failures=1)
             return False
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "queue", duration_s=time.monotonic() - start_time, **counts
+            )
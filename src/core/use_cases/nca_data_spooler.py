@@ -0,0 +1,115 @@
+import gzip
+import json
+import logging
+import time
+from typing import List
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.release import Release
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.interfaces.storage import StorageProvider
+
+logger = logging.getLogger(__name__)
+
+
+def get_spool_prefix(storage_prefix: str, release_id: str) -> str:
+    return f"{storage_prefix}/{release_id}/"
+
+
+def get_spool_manifest_filename(storage_prefix: str, release_id: str) -> str:
+    return f"{get_spool_prefix(storage_prefix, release_id)}release.json"
+
+
+def get_spool_filename(
+    storage_prefix: str, release_id: str, page_nums: List[int]
+) -> str:
+    """one file per page range: a retried batch replaces its own file"""
+    return (
+        f"{get_spool_prefix(storage_prefix, release_id)}"
+        f"{min(page_nums):05d}-{max(page_nums):05d}.ndjson.gz"
+    )
+
+
+class NCADataSpooler:
+    """
+    spool mode loader: writes a batch's cleaned data to storage as gzipped
+    ndjson (a {"page_nums": ...} header line, then one {"record": ...} or
+    {"allocation": ...} line per row) for the SpoolLoader to merge into the
+    db, instead of loading it; same run() as the NCADBLoader. the release
+    the batches were cut from (its page count and reload flag) is kept
+    next to them as the spool's manifest
+    """
+
+    def __init__(
+        self,
+        storage: StorageProvider,
+        storage_prefix: str,
+        metrics: MetricsProvider | None = None,
+    ):
+        self.storage = storage
+        self.storage_prefix = storage_prefix
+        self.metrics = metrics
+
+    def run(
+        self,
+        release: Release,
+        nca_data: NCAData,
+        batch_num: int,
+        page_nums: List[int] | None = None,
+    ) -> bool:
+        """
+        page_nums are the release pages the data was extracted from, spooled
+        even without data so the release's pages add up to page_count
+        """
+        start_time = time.monotonic()
+        try:
+            if not page_nums:
+                logger.warning(
+                    f"No pages to spool for {release.filename} batch-{batch_num}"
+                )
+                return False
+
+            # written first: complete spools always have their manifest
+            self.storage.save_file(
+                get_spool_manifest_filename(self.storage_prefix, release.id),
+                release.model_dump_json().encode(),
+            )
+            filename = get_spool_filename(self.storage_prefix, release.id, page_nums)
+            with self.storage.open_file_writer(filename) as f, gzip.GzipFile(
+                fileobj=f, mode="wb"
+            ) as gz:
+                gz.write(self._dump_line({"page_nums": page_nums}))
+                for record in nca_data.records:
+                    gz.write(self._dump_line({"record": record.model_dump()}))
+                for allocation in nca_data.allocations:
+                    gz.write(self._dump_line({"allocation": allocation.model_dump()}))
+
+            self._record_metrics(
+                start_time,
+                pages=len(page_nums),
+                rows=len(nca_data.records) + len(nca_data.allocations),
+            )
+            logger.debug(
+                f"Spooled {len(nca_data.records)} records and "
+                f"{len(nca_data.allocations)} allocations for {release.filename} "
+                f"batch-{batch_num} to {filename}"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Failed to spool data for {release.filename} "
+                f"batch-{batch_num}: {e}",
+                exc_info=True,
+            )
+            self._record_metrics(start_time, failures=1)
+            return False
+
+    def _dump_line(self, row: dict) -> bytes:
+        return (json.dumps(row, separators=(",", ":")) + "\n").encode()
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "spool", duration_s=time.monotonic() - start_time, **counts
+            )
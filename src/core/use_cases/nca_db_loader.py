@@ -1,7 +1,10 @@
 import logging
+import time
+from typing import List
 from src.core.entities.nca_data import NCAData
 from src.core.entities.release import Release
 from src.core.interfaces.data_cleaner import DataCleanerProvider
+from src.core.interfaces.metrics import MetricsProvider
 from src.core.interfaces.repository import RepositoryProvider
 
 logger = logging.getLogger(__name__)
@@ -9,33 +12,59 @@ logger = logging.getLogger(__name__)
 
 class NCADBLoader:
     def __init__(
-        self, repository: RepositoryProvider, data_cleaner: DataCleanerProvider
+        self,
+        repository: RepositoryProvider,
+        data_cleaner: DataCleanerProvider,
+        metrics: MetricsProvider | None = None,
+        swap_max_attempts: int = 3,
     ):
         self.data_cleaner = data_cleaner
         self.repository = repository
+        self.metrics = metrics
+        self.swap_max_attempts = swap_max_attempts
 
-    def run(self, release: Release, nca_data: NCAData, batch_num: int):
+    def run(
+        self,
+        release: Release,
+        nca_data: NCAData,
+        batch_num: int,
+        page_nums: List[int] | None = None,
+    ):
+        """
+        page_nums are the release pages the data was extracted from, a
+        reloaded release stages them (even without data) until all are in
+        """
+        start_time = time.monotonic()
         try:
+            if release.reload and page_nums is not None:
+                self._stage(release, nca_data, batch_num, page_nums, start_time)
+                return
+
             if len(nca_data.records) == 0:
                 logger.warning(
                     f"No records to load for {release.filename} " f"(page-{batch_num})"
                 )
                 return
-            self.repository.bulk_upsert_records(nca_data.records)
 
             if len(nca_data.allocations) == 0:
                 logger.warning(
                     f"No allocations to load for {release.filename} "
                     f"(page-{batch_num})"
                 )
-                return
-            self.repository.bulk_insert_allocations(nca_data.allocations)
+
+            # records and allocations in one round trip, all or nothing
+            record_count, allocation_count = self.repository.load_batch(
+                nca_data.records, nca_data.allocations
+            )
+            self._record_metrics(start_time, rows=record_count + allocation_count)
 
             logger.debug(
-                f"Loaded {len(nca_data.records)} records and "
-                f"{len(nca_data.allocations)} allocations for "
-                f"{release.filename} batch-{batch_num}"
+                f"Loaded {record_count} records and {allocation_count} "
+                f"allocations for {release.filename} batch-{batch_num}"
             )
+            # every loaded batch folds its deltas, whatever order the
+            # batches finish in and whether or not the caller passed pages
+            self._fold_summaries(release)
 
         except Exception as e:
             logger.error(
@@ -43,3 +72,66 @@ class NCADBLoader:
                 f"batch-{batch_num}: {e}",
                 exc_info=True,
             )
+            self._record_metrics(start_time, failures=1)
+
+    def _stage(
+        self,
+        release: Release,
+        nca_data: NCAData,
+        batch_num: int,
+        page_nums: List[int],
+        start_time: float,
+    ) -> None:
+        record_count, allocation_count, is_complete = self.repository.stage_batch(
+            release, page_nums, nca_data.records, nca_data.allocations
+        )
+        self._record_metrics(start_time, rows=record_count + allocation_count)
+        logger.debug(
+            f"Staged {record_count} records and {allocation_count} allocations "
+            f"for {release.filename} batch-{batch_num}"
+        )
+        if is_complete and self._swap(release):
+            self._fold_summaries(release)
+
+    def _swap(self, release: Release) -> bool:
+        """
+        swap the fully staged release in, after (not within) the staging
+        call; a failed swap rolls back whole and is tried again, and a
+        batch of the release staged again later swaps it too
+        """
+        for attempt in range(1, self.swap_max_attempts + 1):
+            try:
+                is_swapped = self.repository.complete_staged_release(release)
+                if is_swapped:
+                    logger.info(f"Swapped the staged reload of {release.filename} in")
+                return is_swapped
+            except Exception as e:
+                logger.warning(
+                    f"Failed to swap the staged reload of {release.filename} in "
+                    f"(attempt {attempt}/{self.swap_max_attempts}): {e}"
+                )
+        raise RuntimeError(f"Staged reload of {release.filename} was not swapped in")
+
+    def _fold_summaries(self, release: Release) -> None:
+        """
+        the loads only append summary deltas, a loaded batch adds them to
+        the summaries (one fold at a time, under the fold's advisory lock);
+        a failed fold is left to the next one
+        """
+        try:
+            department_count, agency_count, month_count = (
+                self.repository.fold_summaries()
+            )
+            logger.debug(
+                f"Folded the summaries after {release.filename}: "
+                f"{department_count} departments, {agency_count} "
+                f"agencies/operating units, {month_count} months"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to fold the summaries: {e}")
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "load", duration_s=time.monotonic() - start_time, **counts
+            )
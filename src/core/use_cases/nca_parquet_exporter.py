@@ -0,0 +1,149 @@
+import logging
+import re
+import time
+from typing import List
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.release import Release
+from src.core.interfaces.columnar import ColumnarProvider
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.interfaces.storage import StorageProvider
+
+logger = logging.getLogger(__name__)
+
+# release_id is the partition key, not stored in the record files
+RECORD_EXPORT_COLUMNS = {
+    "nca_number": "string",
+    "nca_type": "string",
+    "released_date": "timestamp",
+    "department": "string",
+    "purpose": "string",
+}
+ALLOCATION_EXPORT_COLUMNS = {
+    "nca_number": "string",
+    "agency": "string",
+    "operating_unit": "string",
+    "amount": "float64",
+}
+EXPORT_TABLES = ["records", "allocations"]
+
+_EXPORT_FILENAME = re.compile(r"(\d+)-(\d+)\.parquet$")
+
+
+def get_export_prefix(storage_prefix: str, table: str, release: Release) -> str:
+    """hive partitions: <prefix>/<table>/year=<year>/release_id=<id>/"""
+    return f"{storage_prefix}/{table}/year={release.year}/release_id={release.id}/"
+
+
+class NCAParquetExporter:
+    """
+    columnar sink next to the db: writes a batch's cleaned records and
+    allocations as one parquet file per table and page range, partitioned
+    by release year and release, for analytical reads off the db
+    (src/query_exports.py); same run() as the NCADBLoader
+    """
+
+    def __init__(
+        self,
+        storage: StorageProvider,
+        columnar: ColumnarProvider,
+        storage_prefix: str,
+        metrics: MetricsProvider | None = None,
+    ):
+        self.storage = storage
+        self.columnar = columnar
+        self.storage_prefix = storage_prefix
+        self.metrics = metrics
+
+    def run(
+        self,
+        release: Release,
+        nca_data: NCAData,
+        batch_num: int,
+        page_nums: List[int] | None = None,
+    ) -> bool:
+        """
+        files are named by the batch's own page range (not the continuation
+        pages it read), a retried batch replaces every file its range
+        overlaps: a batch split at the deadline may be split elsewhere on
+        the retry, whose remainder exports the rest of an overlapped range
+        """
+        start_time = time.monotonic()
+        try:
+            if not page_nums or not nca_data.records:
+                logger.debug(
+                    f"No records to export for {release.filename} batch-{batch_num}"
+                )
+                return False
+
+            start_page_num, end_page_num = min(page_nums), max(page_nums)
+            size_bytes = 0
+            for table, rows, columns in [
+                (
+                    "records",
+                    [record.model_dump() for record in nca_data.records],
+                    RECORD_EXPORT_COLUMNS,
+                ),
+                (
+                    "allocations",
+                    [allocation.model_dump() for allocation in nca_data.allocations],
+                    ALLOCATION_EXPORT_COLUMNS,
+                ),
+            ]:
+                prefix = get_export_prefix(self.storage_prefix, table, release)
+                filename = f"{prefix}{start_page_num:05d}-{end_page_num:05d}.parquet"
+                with self.storage.open_file_writer(filename) as f:
+                    self.columnar.write_table(rows, columns, f)
+                    size_bytes += f.tell()
+                self._delete_overlapped(
+                    prefix, filename, start_page_num, end_page_num
+                )
+
+            self._record_metrics(
+                start_time,
+                pages=len(page_nums),
+                rows=len(nca_data.records) + len(nca_data.allocations),
+                size_bytes=size_bytes,
+            )
+            logger.debug(
+                f"Exported {len(nca_data.records)} records and "
+                f"{len(nca_data.allocations)} allocations for {release.filename} "
+                f"batch-{batch_num}"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Failed to export data for {release.filename} "
+                f"batch-{batch_num}: {e}",
+                exc_info=True,
+            )
+            self._record_metrics(start_time, failures=1)
+            return False
+
+    def clear(self, release: Release) -> None:
+        """drop a release's exported files, a changed release is re-exported"""
+        for table in EXPORT_TABLES:
+            prefix = get_export_prefix(self.storage_prefix, table, release)
+            for filename in self.storage.list_files(prefix):
+                self.storage.delete_file(filename)
+        logger.info(f"Cleared the exported files of {release.filename}")
+
+    def _delete_overlapped(
+        self, prefix: str, filename: str, start_page_num: int, end_page_num: int
+    ) -> None:
+        for other in self.storage.list_files(prefix):
+            match = _EXPORT_FILENAME.search(other)
+            if (
+                other != filename
+                and match
+                and int(match[1]) <= end_page_num
+                and start_page_num <= int(match[2])
+            ):
+                self.storage.delete_file(other)
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "export", duration_s=time.monotonic() - start_time, **counts
+            )
@@ -0,0 +1,57 @@
+import logging
+from typing import List
+
+from src.core.entities.page_nca_data import PageNCAData
+from src.core.entities.release import Release
+from src.core.interfaces.storage import FileData
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class PageContinuationReader:
+    """
+    pages are read through the extractor (and its raw table cache) and
+    cleaned by the page cleaner, which record their own metrics
+    """
+
+    def __init__(
+        self,
+        extractor: RawTableExtractor,
+        page_cleaner: PageTableCleaner,
+        max_lookahead_pages: int,
+    ):
+        self.extractor = extractor
+        self.page_cleaner = page_cleaner
+        self.max_lookahead_pages = max_lookahead_pages
+
+    def run(
+        self, data: FileData, release: Release, after_page_num: int
+    ) -> List[PageNCAData]:
+        """
+        read the leading continuation rows of the pages after a range
+        until a page starts a new group, so the range's trailing open
+        group can be closed without owning the following pages
+        """
+        pages: List[PageNCAData] = []
+        last_page_num = min(
+            release.page_count, after_page_num + self.max_lookahead_pages
+        )
+
+        for page_num in range(after_page_num + 1, last_page_num + 1):
+            table = self.extractor.run(data, page_num)
+            if not table:
+                # rows after a page without a table can't continue the group
+                break
+
+            page = self.page_cleaner.run(table, release.id, page_num)
+            pages.append(page.as_continuation())
+            if page.has_group_start:
+                break
+
+        logger.debug(
+            f"Read continuation rows from {len(pages)} pages after "
+            f"{release.filename} page-{after_page_num}"
+        )
+        return pages
@@ -0,0 +1,56 @@
+import logging
+import time
+from typing import List
+
+from src.core.entities.release import Release
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.interfaces.parser import ParserProvider
+from src.core.interfaces.storage import StorageProvider
+
+logger = logging.getLogger(__name__)
+
+
+class PageCostEstimator:
+    def __init__(
+        self,
+        storage: StorageProvider,
+        parser: ParserProvider,
+        metrics: MetricsProvider | None = None,
+    ):
+        self.storage = storage
+        self.parser = parser
+        self.metrics = metrics
+
+    def run(self, release: Release) -> List[float] | None:
+        start_time = time.monotonic()
+        try:
+            logger.info(f"Estimating page costs for {release.filename}...")
+            data = self.storage.load_file(release.filename)
+            if not data:
+                logger.warning(f"No file found for {release.filename}")
+                return None
+
+            page_costs = self.parser.get_page_costs(data)
+            self._record_metrics(
+                start_time,
+                pages=len(page_costs),
+                size_bytes=data.nbytes,
+            )
+            logger.info(
+                f"Estimated {len(page_costs)} page costs for {release.filename}"
+            )
+            return page_costs
+
+        except Exception as e:
+            logger.error(
+                f"Failed to estimate page costs for {release.filename}: {e}",
+                exc_info=True,
+            )
+            self._record_metrics(start_time, failures=1)
+            return None
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "inspect", duration_s=time.monotonic() - start_time, **counts
+            )
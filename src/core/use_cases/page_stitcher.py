@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.page_nca_data import PageNCAData
+from src.core.entities.record import Record
+from src.core.interfaces.data_cleaner import DataCleanerProvider
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.use_cases.raw_table_cleaner import RawTableCleaner
+
+logger = logging.getLogger(__name__)
+
+
+class PageStitcher:
+    def __init__(
+        self,
+        data_cleaner: DataCleanerProvider,
+        metrics: MetricsProvider | None = None,
+    ):
+        self.data_cleaner = data_cleaner
+        self.raw_table_cleaner = RawTableCleaner(data_cleaner=data_cleaner)
+        self.metrics = metrics
+
+    def run(self, pages: List[PageNCAData], release_id: str) -> NCAData:
+        """
+        walk the pages in order:
+            1. append a page's leading rows to the open group
+            2. on a page with a group start, close (clean) the open group
+               and open the page's trailing group
+            3. close the last open group at the end
+        leading rows seen before any group start belong to a group
+        that started before these pages and are skipped. a group repeated
+        at the top of the next page is kept once (see _merge_groups)
+        """
+        start_time = time.monotonic()
+        pages = sorted(pages, key=lambda page: page.page_num)
+        groups: List[NCAData] = []
+        header = None
+        open_rows = None
+        stitched_count = 0
+
+        for page in pages:
+            if open_rows is not None:
+                open_rows.extend(page.leading_rows)
+            elif page.leading_rows:
+                logger.debug(
+                    f"Skipped {len(page.leading_rows)} leading rows on "
+                    f"page-{page.page_num}: group started on an earlier page"
+                )
+
+            if not page.has_group_start:
+                continue
+
+            if open_rows:
+                groups.append(self._close_group(header, open_rows, release_id))
+                stitched_count += 1
+
+            groups.append(page.nca_data)
+            header = page.header
+            open_rows = list(page.trailing_rows)
+
+        if open_rows:
+            groups.append(self._close_group(header, open_rows, release_id))
+            stitched_count += 1
+
+        nca_data = self._merge_groups(groups)
+
+        if self.metrics:
+            # closing the open groups is cleaning, its rows were counted per page
+            self.metrics.record("clean", duration_s=time.monotonic() - start_time)
+
+        logger.debug(
+            f"Stitched {len(pages)} pages ({stitched_count} open groups): "
+            f"{len(nca_data.records)} records, "
+            f"{len(nca_data.allocations)} allocations"
+        )
+        return nca_data
+
+    def _merge_groups(self, groups: List[NCAData]) -> NCAData:
+        """
+        a group repeated at the top of the next page yields the same nca
+        number, and the same allocation rows, twice: the last record of an
+        nca number is kept, and an allocation row is kept as many times as
+        it appears in any one group (not summed across groups), so rows
+        repeated within a group and rows added by the repeat are kept
+        """
+        records: Dict[str, Record] = {}
+        allocations: List[Allocation] = []
+        kept_counts: Dict[str, int] = defaultdict(int)
+
+        for group in groups:
+            for record in group.records:
+                records[record.nca_number] = record
+
+            group_counts: Dict[str, int] = defaultdict(int)
+            for allocation in group.allocations:
+                # the row, nca number included
+                row = allocation.model_dump_json()
+                group_counts[row] += 1
+                if group_counts[row] > kept_counts[row]:
+                    kept_counts[row] += 1
+                    allocations.append(allocation)
+
+        return NCAData(records=list(records.values()), allocations=allocations)
+
+    def _close_group(self, header, rows, release_id: str) -> NCAData:
+        return self.raw_table_cleaner.run([header] + rows, release_id)
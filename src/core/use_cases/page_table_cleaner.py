@@ -0,0 +1,62 @@
+import logging
+import time
+from typing import List
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.page_nca_data import PageNCAData
+from src.core.interfaces.data_cleaner import DataCleanerProvider
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.use_cases.raw_table_cleaner import RawTableCleaner
+
+logger = logging.getLogger(__name__)
+
+
+class PageTableCleaner:
+    """
+    splits a page at its nca groups, the groups closed on the page are
+    cleaned by the RawTableCleaner, the open ones are kept raw to stitch
+    """
+
+    def __init__(
+        self,
+        data_cleaner: DataCleanerProvider,
+        metrics: MetricsProvider | None = None,
+    ):
+        self.data_cleaner = data_cleaner
+        self.raw_table_cleaner = RawTableCleaner(data_cleaner=data_cleaner)
+        self.metrics = metrics
+
+    def run(
+        self, raw_table: List[List[str | None]], release_id: str, page_num: int
+    ) -> PageNCAData:
+        start_time = time.monotonic()
+        page_rows = self.data_cleaner.split_page(raw_table, page_num)
+        nca_data = (
+            self.raw_table_cleaner.run(
+                [page_rows.header] + page_rows.closed_rows, release_id
+            )
+            if page_rows.closed_rows
+            else NCAData(records=[], allocations=[])
+        )
+        page_data = PageNCAData(
+            page_num=page_num,
+            header=page_rows.header,
+            leading_rows=page_rows.leading_rows,
+            nca_data=nca_data,
+            trailing_rows=page_rows.trailing_rows,
+            has_group_start=page_rows.has_group_start,
+        )
+        if self.metrics:
+            self.metrics.record(
+                "clean",
+                duration_s=time.monotonic() - start_time,
+                pages=1,
+                rows=len(raw_table),
+            )
+        logger.debug(
+            f"Cleaned page-{page_num}: "
+            f"{len(page_data.leading_rows)} leading rows, "
+            f"{len(page_data.nca_data.records)} closed records, "
+            f"{len(page_data.trailing_rows)} trailing rows"
+        )
+        return page_data
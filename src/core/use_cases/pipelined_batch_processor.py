@@ -0,0 +1,237 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+from typing import Callable, List
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.page_nca_data import PageNCAData
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.use_cases.nca_data_spooler import NCADataSpooler
+from src.core.use_cases.nca_db_loader import NCADBLoader
+from src.core.use_cases.nca_parquet_exporter import NCAParquetExporter
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+
+logger = logging.getLogger(__name__)
+
+# end-of-stream marker between stages (the page stream ends with the first
+# page that was not processed instead), a failing stage is not followed
+# by one: the exception propagates out of gather and asyncio.run cancels
+# the stages still waiting on their queues
+_DONE = object()
+
+
+class PipelinedBatchProcessor:
+    """
+    extract/clean -> stitch -> load stages connected by bounded queues:
+    while chunk N is being written to the db, chunk N+1 is being parsed
+    """
+
+    def __init__(
+        self,
+        extractor: RawTableExtractor,
+        page_cleaner: PageTableCleaner,
+        continuation_reader: PageContinuationReader,
+        stitcher: PageStitcher,
+        db_loader: NCADBLoader | NCADataSpooler,
+        chunk_pages: int,
+        queue_size: int,
+        exporter: NCAParquetExporter | None = None,
+    ):
+        self.extractor = extractor
+        self.page_cleaner = page_cleaner
+        self.continuation_reader = continuation_reader
+        self.stitcher = stitcher
+        self.db_loader = db_loader
+        self.chunk_pages = chunk_pages
+        self.queue_size = queue_size
+        self.exporter = exporter
+
+    def run(
+        self,
+        batch: ReleaseBatch,
+        file_bytes: memoryview,
+        has_time: Callable[[List[float]], bool] | None = None,
+    ) -> int:
+        """
+        process the batch and return the first page that was not processed
+        (end_page_num + 1 when every page was), has_time receives the page
+        durations (ms) so far and stops the extract stage when it is False
+        """
+        return asyncio.run(self._run_async(batch, file_bytes, has_time))
+
+    async def _run_async(
+        self,
+        batch: ReleaseBatch,
+        file_bytes: memoryview,
+        has_time: Callable[[List[float]], bool] | None,
+    ) -> int:
+        page_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        load_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        # one thread each: parsing is cpu bound (gil), loading is network bound
+        parse_executor = ThreadPoolExecutor(max_workers=1)
+        load_executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            results = await asyncio.gather(
+                self._extract_stage(
+                    batch, file_bytes, has_time, page_queue, parse_executor
+                ),
+                self._stitch_stage(
+                    batch, file_bytes, page_queue, load_queue, parse_executor
+                ),
+                self._load_stage(batch, load_queue, load_executor),
+            )
+        finally:
+            parse_executor.shutdown(wait=True)
+            load_executor.shutdown(wait=True)
+        next_page_num = results[0]
+        return next_page_num
+
+    async def _extract_stage(
+        self,
+        batch: ReleaseBatch,
+        file_bytes: memoryview,
+        has_time: Callable[[List[float]], bool] | None,
+        page_queue: asyncio.Queue,
+        executor: ThreadPoolExecutor,
+    ) -> int:
+        loop = asyncio.get_running_loop()
+        page_durations_ms: List[float] = []
+        next_page_num = batch.start_page_num
+
+        while next_page_num <= batch.end_page_num:
+            if has_time and not has_time(page_durations_ms):
+                logger.warning(
+                    f"Deadline approaching for {batch.release.filename} "
+                    f"batch-{batch.batch_id}: stopping before "
+                    f"page-{next_page_num}"
+                )
+                break
+
+            page_num = next_page_num
+            page_start_time = time.monotonic()
+            page = await loop.run_in_executor(
+                executor, self._extract_page, batch, file_bytes, page_num
+            )
+            page_durations_ms.append((time.monotonic() - page_start_time) * 1000)
+            next_page_num += 1
+
+            if page:
+                # blocks while the downstream stages are behind
+                await page_queue.put(page)
+
+        await page_queue.put(next_page_num)
+        return next_page_num
+
+    async def _stitch_stage(
+        self,
+        batch: ReleaseBatch,
+        file_bytes: memoryview,
+        page_queue: asyncio.Queue,
+        load_queue: asyncio.Queue,
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """
+        a window holds the pages since the last group start, once the next
+        group start arrives the window's groups are all closed and can be
+        stitched and sent to the loader with the pages it covers
+        """
+        loop = asyncio.get_running_loop()
+        window: List[PageNCAData] = []
+        window_start_page_num = batch.start_page_num
+        last_page_num = batch.start_page_num - 1
+
+        while True:
+            page = await page_queue.get()
+            if isinstance(page, int):
+                next_page_num = page
+                break
+            last_page_num = page.page_num
+
+            if page.has_group_start and len(window) >= self.chunk_pages:
+                nca_data = await loop.run_in_executor(
+                    executor,
+                    self.stitcher.run,
+                    window + [page.as_continuation()],
+                    batch.release.id,
+                )
+                page_nums = list(range(window_start_page_num, page.page_num))
+                await load_queue.put((nca_data, page_nums))
+                window = [page]
+                window_start_page_num = page.page_num
+            else:
+                window.append(page)
+
+        page_nums = list(range(window_start_page_num, next_page_num))
+        if window:
+            continuation = await loop.run_in_executor(
+                executor,
+                self.continuation_reader.run,
+                file_bytes,
+                batch.release,
+                last_page_num,
+            )
+            nca_data = await loop.run_in_executor(
+                executor, self.stitcher.run, window + continuation, batch.release.id
+            )
+            await load_queue.put((nca_data, page_nums))
+        elif page_nums and (
+            batch.release.reload or isinstance(self.db_loader, NCADataSpooler)
+        ):
+            # the pages still count towards the staged reload (or the spool)
+            await load_queue.put((NCAData(records=[], allocations=[]), page_nums))
+        await load_queue.put(_DONE)
+
+    async def _load_stage(
+        self,
+        batch: ReleaseBatch,
+        load_queue: asyncio.Queue,
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        chunk_num = 0
+        while True:
+            item = await load_queue.get()
+            if item is _DONE:
+                break
+            nca_data, page_nums = item
+
+            chunk_num += 1
+            logger.debug(
+                f"Loading {batch.release.filename} batch-{batch.batch_id} "
+                f"chunk-{chunk_num}: {len(nca_data.records)} records, "
+                f"{len(nca_data.allocations)} allocations"
+            )
+            await loop.run_in_executor(
+                executor,
+                self.db_loader.run,
+                batch.release,
+                nca_data,
+                batch.batch_num,
+                page_nums,
+            )
+            if self.exporter:
+                await loop.run_in_executor(
+                    executor,
+                    self.exporter.run,
+                    batch.release,
+                    nca_data,
+                    batch.batch_num,
+                    page_nums,
+                )
+
+    def _extract_page(
+        self, batch: ReleaseBatch, file_bytes: memoryview, page_num: int
+    ) -> PageNCAData | None:
+        table = self.extractor.run(file_bytes, page_num)
+        if not table:
+            logger.warning(
+                f"No tables extracted for {batch.release.filename} "
+                f"batch-{batch.batch_id} page-{page_num}"
+            )
+            return None
+        return self.page_cleaner.run(table, batch.release.id, page_num)
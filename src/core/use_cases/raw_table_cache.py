@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from typing import List, Tuple
+
+from src.core.interfaces.parser import ParserProvider
+from src.core.interfaces.storage import FileData, StorageProvider
+
+logger = logging.getLogger(__name__)
+
+
+class RawTableCache:
+    """
+    raw extracted page tables (gzipped json) in storage, keyed by the release
+    file's content hash, the parser version and the page: the raw rows don't
+    depend on the cleaner, so a cleaner change re-cleans from here instead
+    of re-parsing the pdf
+    """
+
+    def __init__(
+        self,
+        storage: StorageProvider,
+        parser: ParserProvider,
+        storage_prefix: str,
+    ):
+        self.storage = storage
+        self.parser = parser
+        self.storage_prefix = storage_prefix
+        self._hash_lock = threading.Lock()
+        self._hashed: Tuple[FileData, str] | None = None
+
+    def get_content_hash(self, data: FileData) -> str | None:
+        """
+        sha256 of a file buffer, memoized for the last buffer (every page of
+        a batch shares one); streams are not hashed (None, not cached)
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            return None
+        with self._hash_lock:
+            if self._hashed is None or self._hashed[0] is not data:
+                self._hashed = (data, hashlib.sha256(data).hexdigest())
+            return self._hashed[1]
+
+    def get_filename(self, content_hash: str, page_num: int) -> str:
+        return (
+            f"{self.storage_prefix}/{content_hash}/"
+            f"{self.parser.get_version()}/{page_num:05d}.json.gz"
+        )
+
+    def load(
+        self, content_hash: str, page_num: int
+    ) -> List[List[str | None]] | None:
+        """the cached raw table of a page (empty if it had none), None on a miss"""
+        filename = self.get_filename(content_hash, page_num)
+        try:
+            data = self.storage.load_file(filename)
+            if data is None:
+                return None
+            return json.loads(gzip.decompress(data))
+        except Exception as e:
+            logger.warning(f"Failed to read cached raw table {filename}: {e}")
+            return None
+
+    def save(
+        self, content_hash: str, page_num: int, table: List[List[str | None]]
+    ) -> bool:
+        filename = self.get_filename(content_hash, page_num)
+        try:
+            data = json.dumps(table, separators=(",", ":")).encode()
+            self.storage.save_file(filename, gzip.compress(data))
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to cache raw table {filename}: {e}")
+            return False
@@ -1,23 +1,48 @@
-from io import BytesIO
 import logging
+import time
 from typing import List
 
+from src.core.interfaces.metrics import MetricsProvider
 from src.core.interfaces.parser import ParserProvider
-from src.core.interfaces.storage import StorageProvider
+from src.core.interfaces.storage import FileData, StorageProvider
+from src.core.use_cases.raw_table_cache import RawTableCache
 
 logger = logging.getLogger(__name__)
 
 
 class RawTableExtractor:
-    def __init__(self, storage: StorageProvider, parser: ParserProvider):
+    def __init__(
+        self,
+        storage: StorageProvider,
+        parser: ParserProvider,
+        metrics: MetricsProvider | None = None,
+        cache: RawTableCache | None = None,
+    ):
         self.storage = storage
         self.parser = parser
+        self.metrics = metrics
+        self.cache = cache
 
-    def run(self, data: BytesIO, page_num: int) -> List[List[str | None]] | None:
+    def run(self, data: FileData, page_num: int) -> List[List[str | None]] | None:
+        """a cached raw table skips the parser, a parsed one is cached"""
+        start_time = time.monotonic()
         try:
             logger.debug(f"Extracting raw table: page-{page_num}...")
 
-            table = self.parser.extract_table_by_page_num(data, page_num)
+            content_hash = self.cache.get_content_hash(data) if self.cache else None
+            table = None
+            if self.cache and content_hash:
+                table = self.cache.load(content_hash, page_num)
+
+            if table is not None:
+                self._record_metrics(
+                    start_time, stage="extract_cached", pages=1, rows=len(table)
+                )
+            else:
+                table = self.parser.extract_table_by_page_num(data, page_num)
+                if self.cache and content_hash:
+                    self.cache.save(content_hash, page_num, table)
+                self._record_metrics(start_time, pages=1, rows=len(table))
 
             if len(table) == 0:
                 logger.warning(f"No tables extracted from page-{page_num}")
@@ -31,4 +56,13 @@ class RawTableExtractor:
                 f"Failed to extract tables from page-{page_num}: {e}",
                 exc_info=True,
             )
+            self._record_metrics(start_time, pages=1, failures=1)
             return None
+
+    def _record_metrics(
+        self, start_time: float, stage: str = "extract", **counts
+    ) -> None:
+        if self.metrics:
+            self.metrics.record(
+                stage, duration_s=time.monotonic() - start_time, **counts
+            )
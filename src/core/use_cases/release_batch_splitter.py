@@ -0,0 +1,39 @@
+import logging
+
+from src.core.entities.release_batch import ReleaseBatch
+
+logger = logging.getLogger(__name__)
+
+
+class ReleaseBatchSplitter:
+    def __init__(self):
+        pass
+
+    def run(self, batch: ReleaseBatch, next_page_num: int) -> ReleaseBatch | None:
+        """
+        return the unfinished [next_page_num, end_page_num] range of a batch
+        or None if every page of the batch has been processed. a batch is
+        only split after at least one of its pages was processed, so its
+        remainders shrink and can't be re-enqueued forever
+        """
+        if next_page_num > batch.end_page_num:
+            return None
+        if next_page_num <= batch.start_page_num:
+            raise ValueError(
+                f"No pages of {batch.release.filename} batch-{batch.batch_id} "
+                f"were processed, not splitting it"
+            )
+
+        remaining_batch = batch.model_copy(
+            update={
+                "start_page_num": next_page_num,
+                "split_num": batch.split_num + 1,
+            }
+        )
+        logger.info(
+            f"Split {batch.release.filename} batch-{batch.batch_id}: "
+            f"pages {remaining_batch.start_page_num}-"
+            f"{remaining_batch.end_page_num} remaining as "
+            f"batch-{remaining_batch.batch_id}"
+        )
+        return remaining_batch
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 import logging
 
 from src.core.entities.release import Release
@@ -8,23 +8,45 @@ logger = logging.getLogger(__name__)
 
 
 class ReleaseBatcher:
-    def __init__(self, batch_size):
+    def __init__(
+        self,
+        batch_size: int,
+        target_batch_duration_s: float | None = None,
+        avg_page_duration_s: float | None = None,
+        max_batch_size: int | None = None,
+    ):
         self.batch_size = batch_size
+        self.target_batch_duration_s = target_batch_duration_s
+        self.avg_page_duration_s = avg_page_duration_s
+        self.max_batch_size = max_batch_size
 
-    def run(self, release: Release) -> List[ReleaseBatch]:
+    def run(
+        self, release: Release, page_costs: List[float] | None = None
+    ) -> List[ReleaseBatch]:
+        """
+        page_costs[i] is the relative extraction cost of the (i+1)th page,
+        when given (and adaptive batching is configured) pages are grouped
+        into variable-length batches of roughly target_batch_duration_s each,
+        otherwise into fixed batch_size page ranges
+        """
         logger.info(
             f"Batching release: {release.filename}: {release.page_count} total pages"
         )
 
-        batches = []
-        total_batches = 0
-        for start in range(1, release.page_count + 1, self.batch_size):
-            total_batches += 1
-            end = min(start + self.batch_size - 1, release.page_count)
+        if self._can_weight(release, page_costs):
+            page_ranges = self._get_weighted_page_ranges(
+                page_costs  # pyright: ignore
+            )
+            strategy = f"~{self.target_batch_duration_s}s target batch duration"
+        else:
+            page_ranges = self._get_fixed_page_ranges(release.page_count)
+            strategy = f"{self.batch_size} batch size"
 
+        batches = []
+        for batch_num, (start, end) in enumerate(page_ranges, start=1):
             try:
                 batch = ReleaseBatch(
-                    batch_num=(start - 1) // self.batch_size + 1,
+                    batch_num=batch_num,
                     release=release,
                     start_page_num=start,
                     end_page_num=end,
@@ -39,8 +61,65 @@ class ReleaseBatcher:
                 )
 
         logger.info(
-            f"Created {len(batches)}/{total_batches} batches for "
+            f"Created {len(batches)}/{len(page_ranges)} batches for "
             f"release {release.filename}: "
-            f"{self.batch_size} batch size"
+            f"{strategy}"
         )
         return batches
+
+    def _can_weight(self, release: Release, page_costs: List[float] | None) -> bool:
+        if not self.target_batch_duration_s or not self.avg_page_duration_s:
+            return False
+        if not page_costs:
+            return False
+        if len(page_costs) != release.page_count:
+            logger.warning(
+                f"Page cost count ({len(page_costs)}) does not match page count "
+                f"({release.page_count}) for {release.filename}. "
+                f"Falling back to fixed batches."
+            )
+            return False
+        return True
+
+    def _get_fixed_page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        page_ranges = []
+        for start in range(1, page_count + 1, self.batch_size):
+            end = min(start + self.batch_size - 1, page_count)
+            page_ranges.append((start, end))
+        return page_ranges
+
+    def _get_weighted_page_ranges(
+        self, page_costs: List[float]
+    ) -> List[Tuple[int, int]]:
+        """
+        1. scale each page's cost relative to the mean page cost
+        2. convert it to an estimated duration using avg_page_duration_s
+        3. close the batch once the next page would exceed the target
+           duration or the batch already has max_batch_size pages
+        """
+        target_s = float(self.target_batch_duration_s)  # pyright: ignore
+        avg_page_s = float(self.avg_page_duration_s)  # pyright: ignore
+        mean_cost = sum(page_costs) / len(page_costs)
+
+        page_ranges = []
+        start = 1
+        batch_duration_s = 0.0
+        for page_num, cost in enumerate(page_costs, start=1):
+            weight = cost / mean_cost if mean_cost > 0 else 1.0
+            page_duration_s = avg_page_s * weight
+
+            batch_page_count = page_num - start
+            is_over_target = batch_duration_s + page_duration_s > target_s
+            is_full = (
+                self.max_batch_size is not None
+                and batch_page_count >= self.max_batch_size
+            )
+            if batch_page_count > 0 and (is_over_target or is_full):
+                page_ranges.append((start, page_num - 1))
+                start = page_num
+                batch_duration_s = 0.0
+
+            batch_duration_s += page_duration_s
+
+        page_ranges.append((start, len(page_costs)))
+        return page_ranges
@@ -0,0 +1,170 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.page_nca_data import PageNCAData
+from src.core.entities.record import Record
+from src.core.entities.release import Release
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.interfaces.parser import ParserProvider
+from src.core.interfaces.repository import RepositoryProvider
+from src.core.interfaces.storage import FileData
+from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class ReleaseRecleaner:
+    """
+    rebuilds a release's records and allocations with the current cleaner:
+    the raw tables come from the extractor's cache (pages missing from it
+    are parsed and cached), the whole release is stitched in one pass and
+    swapped in through the staging tables, so rows the cleaner no longer
+    produces are dropped with the old release; the pages are counted from
+    the stored file, not taken from the db row
+    """
+
+    def __init__(
+        self,
+        file_bytes_loader: FileBytesMemoLoader,
+        parser: ParserProvider,
+        extractor: RawTableExtractor,
+        page_cleaner: PageTableCleaner,
+        stitcher: PageStitcher,
+        repository: RepositoryProvider,
+        load_rows: int,
+        max_workers: int,
+        metrics: MetricsProvider | None = None,
+    ):
+        self.file_bytes_loader = file_bytes_loader
+        self.parser = parser
+        self.extractor = extractor
+        self.page_cleaner = page_cleaner
+        self.stitcher = stitcher
+        self.repository = repository
+        self.load_rows = load_rows
+        self.max_workers = max_workers
+        self.metrics = metrics
+
+    def run(self, release: Release) -> bool:
+        start_time = time.monotonic()
+        try:
+            # the file is hashed for the cache keys, not parsed
+            file_bytes = self.file_bytes_loader.run(release.filename)
+            if file_bytes is None:
+                logger.error(f"No file found for {release.filename}")
+                return False
+
+            # the swap waits for page_count pages, so it must be the file's
+            page_count = self.parser.get_page_count(file_bytes)
+            if page_count <= 0:
+                logger.error(f"No pages in {release.filename}, not re-cleaning")
+                return False
+            if page_count != release.page_count:
+                logger.warning(
+                    f"{release.filename} has {page_count} pages, "
+                    f"not {release.page_count} as recorded"
+                )
+                release = release.model_copy(update={"page_count": page_count})
+
+            page_nums = list(range(1, release.page_count + 1))
+            logger.info(f"Re-cleaning {len(page_nums)} pages of {release.filename}...")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = [
+                    page
+                    for page in executor.map(
+                        lambda page_num: self._clean_page(
+                            release, file_bytes, page_num
+                        ),
+                        page_nums,
+                    )
+                    if page
+                ]
+            nca_data = self.stitcher.run(pages, release.id)
+
+            record_count, allocation_count, is_swapped = self._stage(
+                release, nca_data, page_nums
+            )
+            self._record_metrics(start_time, rows=record_count + allocation_count)
+            if not is_swapped:
+                logger.error(f"Re-cleaned {release.filename} was not swapped in")
+                return False
+
+            logger.info(
+                f"Re-cleaned {release.filename}: {record_count} records and "
+                f"{allocation_count} allocations from {len(pages)} pages"
+            )
+            # the swap only appends summary deltas, fold them in (a failed
+            # fold is left to the next one)
+            try:
+                self.repository.fold_summaries()
+            except Exception as e:
+                logger.warning(f"Failed to fold the summaries: {e}")
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Failed to re-clean {release.filename}: {e}", exc_info=True
+            )
+            self._record_metrics(start_time, failures=1)
+            return False
+
+    def _clean_page(
+        self, release: Release, file_bytes: FileData, page_num: int
+    ) -> PageNCAData | None:
+        table = self.extractor.run(file_bytes, page_num)
+        if not table:
+            return None
+        return self.page_cleaner.run(table, release.id, page_num)
+
+    def _stage(
+        self, release: Release, nca_data: NCAData, page_nums: List[int]
+    ) -> Tuple[int, int, bool]:
+        # staged from scratch, the last call carries every page, then swaps
+        self.repository.clear_staged_release(release.id)
+        record_count = 0
+        allocation_count = 0
+        chunks = list(self._chunk(nca_data))
+        for i, (records, allocations) in enumerate(chunks):
+            is_last = i == len(chunks) - 1
+            loaded_records, loaded_allocations, _ = self.repository.stage_batch(
+                release, page_nums if is_last else [], records, allocations
+            )
+            record_count += loaded_records
+            allocation_count += loaded_allocations
+        is_swapped = self.repository.complete_staged_release(release)
+        return record_count, allocation_count, is_swapped
+
+    def _chunk(
+        self, nca_data: NCAData
+    ) -> Iterator[Tuple[List[Record], List[Allocation]]]:
+        """records with all of their allocations, up to load_rows rows each"""
+        allocations_by_nca: Dict[str, List[Allocation]] = {}
+        for allocation in nca_data.allocations:
+            allocations_by_nca.setdefault(allocation.nca_number, []).append(
+                allocation
+            )
+
+        records: List[Record] = []
+        allocations: List[Allocation] = []
+        for record in nca_data.records:
+            records.append(record)
+            allocations.extend(allocations_by_nca.pop(record.nca_number, []))
+            if len(records) + len(allocations) >= self.load_rows:
+                yield records, allocations
+                records, allocations = [], []
+        # the pages are staged even without records
+        if records or not nca_data.records:
+            yield records, allocations
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "reclean", duration_s=time.monotonic() - start_time, **counts
+            )
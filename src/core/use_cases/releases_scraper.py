@@ -1,11 +1,13 @@
 from copy import Error
 from io import BytesIO
 import logging
+import time
 from typing import List, Tuple
 
 from src.core.interfaces.scraper import ScraperProvider
 from src.core.interfaces.storage import StorageProvider
 from src.core.entities.release import Release
+from src.core.interfaces.metrics import MetricsProvider
 from src.core.interfaces.parser import ParserProvider
 from src.core.interfaces.repository import RepositoryProvider
 
@@ -19,11 +21,15 @@ class ReleasesScraper:
         storage: StorageProvider,
         parser: ParserProvider,
         repository: RepositoryProvider,
+        metrics: MetricsProvider | None = None,
+        staged_reload: bool = False,
     ):
         self.scraper = scraper
         self.storage = storage
         self.parser = parser
         self.repository = repository
+        self.metrics = metrics
+        self.staged_reload = staged_reload
 
     def run(self, oldest_release_year: int = 2024) -> List[Release]:
         logger.info(f"Scraping for releases since {oldest_release_year}...")
@@ -84,7 +90,14 @@ class ReleasesScraper:
             db_release = self.repository.get_release(release.id)
             storage_release = self.storage.load_file(release.filename)
 
+            start_time = time.monotonic()
             data = self.scraper.download_release(release)
+            if self.metrics:
+                self.metrics.record(
+                    "download",
+                    duration_s=time.monotonic() - start_time,
+                    size_bytes=data.getbuffer().nbytes,
+                )
 
             file_release_metadata = self.parser.get_metadata_by_data(data)
             data.seek(0)
@@ -115,7 +128,14 @@ class ReleasesScraper:
                 or db_release.file_meta_modified_at != file_release_metadata.modified_at
             )
 
-            if has_changed:
+            if has_changed and self.staged_reload:
+                # the old rows stay live until the new ones are swapped in
+                self.repository.clear_staged_release(release.id)
+                release.reload = True
+                logger.info(f"Change detected for {release.filename}. Reloading...")
+                filtered_releases.append(release)
+                filtered_data.append(data)
+            elif has_changed:
                 self.repository.delete_release(release.id)
                 logger.info(f"Change detected for {release.filename}. Updating...")
                 filtered_releases.append(release)
@@ -129,8 +149,10 @@ class ReleasesScraper:
         if data.getbuffer().nbytes == 0:
             raise Error("Downloaded file is empty.")
 
+        # counted before the upsert, readers of the db row need the count
+        page_count = self.parser.get_page_count(data)
+        release.page_count = page_count
         self.storage.save_file(release.filename, data)
         self.repository.upsert_release(release)
         logger.info(f"Synced storage & db: {release.filename}")
-        page_count = self.parser.get_page_count(data)
         return page_count
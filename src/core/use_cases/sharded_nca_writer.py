@@ -0,0 +1,99 @@
+import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.record import Record
+from src.core.entities.release import Release
+from src.core.use_cases.nca_db_loader import NCADBLoader
+
+logger = logging.getLogger(__name__)
+
+
+def get_shard(nca_number: str, shard_count: int) -> int:
+    """stable across processes and runs, unlike hash()"""
+    return zlib.crc32(nca_number.encode()) % shard_count
+
+
+def split_by_shard(nca_data: NCAData, shard_count: int) -> Dict[int, NCAData]:
+    """records with their allocations by shard, empty shards left out"""
+    records: Dict[int, List[Record]] = {}
+    allocations: Dict[int, List[Allocation]] = {}
+    for record in nca_data.records:
+        shard = get_shard(record.nca_number, shard_count)
+        records.setdefault(shard, []).append(record)
+    for allocation in nca_data.allocations:
+        shard = get_shard(allocation.nca_number, shard_count)
+        allocations.setdefault(shard, []).append(allocation)
+    return {
+        shard: NCAData(records=shard_records, allocations=allocations.get(shard, []))
+        for shard, shard_records in records.items()
+    }
+
+
+class ShardedNCAWriter:
+    """
+    routes cleaned rows to a fixed set of writers by a hash of the nca
+    number: a shard's records and allocations are only ever written by its
+    own writer thread, so concurrent batches don't upsert into the same
+    keys (and index pages) at once; same run() as the NCADBLoader, each
+    shard of a batch is its own transaction
+    """
+
+    def __init__(
+        self,
+        loader_factory: Callable[[], NCADBLoader],
+        shard_count: int,
+    ):
+        self.shard_count = shard_count
+        # one loader (and db client) per writer thread
+        self._loaders = [loader_factory() for _ in range(shard_count)]
+        self._writers = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"shard-{shard}")
+            for shard in range(shard_count)
+        ]
+
+    def run(
+        self,
+        release: Release,
+        nca_data: NCAData,
+        batch_num: int,
+        page_nums: List[int] | None = None,
+    ) -> None:
+        """returns once every shard of the batch is written"""
+        is_staged = release.reload and page_nums is not None
+        futures = [
+            self._writers[shard].submit(
+                self._loaders[shard].run,
+                release,
+                shard_data,
+                batch_num,
+                [] if is_staged else page_nums,
+            )
+            for shard, shard_data in split_by_shard(
+                nca_data, self.shard_count
+            ).items()
+        ]
+        for future in futures:
+            future.result()
+        logger.debug(
+            f"Wrote {release.filename} batch-{batch_num} "
+            f"to {len(futures)}/{self.shard_count} shards"
+        )
+
+        if is_staged:
+            # pages are staged after every shard's rows: the last page
+            # swaps the release in, which can't happen with a shard missing
+            self._writers[0].submit(
+                self._loaders[0].run,
+                release,
+                NCAData(records=[], allocations=[]),
+                batch_num,
+                page_nums,
+            ).result()
+
+    def close(self) -> None:
+        for writer in self._writers:
+            writer.shutdown(wait=True)
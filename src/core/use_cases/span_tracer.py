@@ -0,0 +1,82 @@
+from contextlib import contextmanager
+import logging
+import time
+from typing import Dict, Iterator
+import uuid
+
+from src.core.entities.span import Span
+from src.core.entities.trace_context import TraceContext
+from src.core.interfaces.span_recorder import SpanRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class SpanTracer:
+    def __init__(self, recorder: SpanRecorder, function_name: str):
+        self.recorder = recorder
+        self.function_name = function_name
+
+    def start_trace(self) -> TraceContext:
+        return TraceContext(trace_id=uuid.uuid4().hex, started_at=time.time())
+
+    def resume_trace(self, attributes: Dict[str, str]) -> TraceContext:
+        """continue the trace of a received message or start a new one"""
+        try:
+            trace = TraceContext.from_attributes(attributes)
+            if trace:
+                return trace
+        except Exception as e:
+            logger.warning(f"Ignoring invalid trace attributes {attributes}: {e}")
+        return self.start_trace()
+
+    @contextmanager
+    def span(
+        self,
+        trace: TraceContext,
+        stage: str,
+        release_id: str | None = None,
+        batch_num: int | None = None,
+        split_num: int | None = None,
+        start_page_num: int | None = None,
+        end_page_num: int | None = None,
+    ) -> Iterator[None]:
+        """record the wrapped block as a span, also when it raises"""
+        started_at = time.time()
+        status = "ok"
+        try:
+            yield
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            ended_at = time.time()
+            self._record(
+                Span(
+                    trace_id=trace.trace_id,
+                    function_name=self.function_name,
+                    stage=stage,
+                    release_id=release_id,
+                    batch_num=batch_num,
+                    split_num=split_num,
+                    start_page_num=start_page_num,
+                    end_page_num=end_page_num,
+                    status=status,
+                    trace_started_at=trace.started_at,
+                    enqueued_at=trace.enqueued_at,
+                    started_at=started_at,
+                    ended_at=ended_at,
+                    queue_wait_s=(
+                        max(0.0, started_at - trace.enqueued_at)
+                        if trace.enqueued_at
+                        else 0.0
+                    ),
+                    processing_s=ended_at - started_at,
+                    time_to_data_s=ended_at - trace.started_at,
+                )
+            )
+
+    def _record(self, span: Span) -> None:
+        try:
+            self.recorder.record(span)
+        except Exception as e:
+            logger.error(f"Failed to record span {span}: {e}", exc_info=True)
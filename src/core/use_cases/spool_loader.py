@@ -0,0 +1,247 @@
+import gzip
+import json
+import logging
+import re
+import time
+import uuid
+from typing import Dict, List, Set, Tuple
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.record import Record
+from src.core.entities.release import Release
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.interfaces.repository import RepositoryProvider
+from src.core.interfaces.storage import StorageProvider
+from src.core.use_cases.nca_data_spooler import (
+    get_spool_manifest_filename,
+    get_spool_prefix,
+)
+
+logger = logging.getLogger(__name__)
+
+_SPOOL_FILENAME = re.compile(r"(\d+)-(\d+)\.ndjson\.gz$")
+
+
+class SpoolLoader:
+    """
+    merges a release's spooled batches into the db once every page is
+    spooled: a few large load_batch transactions (or stage_batch calls for
+    a reloaded release, the last one carrying every page so it swaps the
+    release in) instead of one small write per batch; the page count and
+    reload flag come from the spool's manifest, the release the batches
+    were cut from, not from the db row
+    """
+
+    def __init__(
+        self,
+        storage: StorageProvider,
+        repository: RepositoryProvider,
+        storage_prefix: str,
+        load_rows: int,
+        lease_duration_s: float,
+        metrics: MetricsProvider | None = None,
+    ):
+        self.storage = storage
+        self.repository = repository
+        self.storage_prefix = storage_prefix
+        self.load_rows = load_rows
+        self.lease_duration_s = lease_duration_s
+        self.metrics = metrics
+
+    def is_complete(self, release_id: str) -> bool:
+        """every page of the release is spooled (and not merged yet)"""
+        return self._can_merge(self._get_spool(release_id), force=False)
+
+    def run(self, release_id: str, force: bool = False) -> bool:
+        """
+        load the release's spooled batches and delete them, returns False
+        while pages are missing (unless forced), while another loader holds
+        the merge lease or when the load fails
+        """
+        start_time = time.monotonic()
+        try:
+            if not self._can_merge(self._get_spool(release_id), force):
+                return False
+
+            owner = str(uuid.uuid4())
+            if not self.repository.claim_spool_merge(
+                release_id, owner, self.lease_duration_s
+            ):
+                logger.info(f"Spooled batches of {release_id} are being merged")
+                return False
+            try:
+                # listed again under the lease: a merge that just ended has
+                # deleted what it loaded
+                spool = self._get_spool(release_id)
+                if spool is None or not self._can_merge(spool, force):
+                    return False
+                release, filenames, page_nums = spool
+
+                groups = self._read_groups(filenames)
+                if groups is None:
+                    return False
+
+                record_count, allocation_count = self._load(
+                    release, groups, sorted(page_nums)
+                )
+                # loaded spools go, a changed release is spooled from scratch
+                for filename in filenames:
+                    self.storage.delete_file(filename)
+                self.storage.delete_file(
+                    get_spool_manifest_filename(self.storage_prefix, release.id)
+                )
+            finally:
+                self.repository.end_spool_merge(release_id, owner)
+
+            self._record_metrics(start_time, rows=record_count + allocation_count)
+            logger.info(
+                f"Loaded {record_count} records and {allocation_count} "
+                f"allocations from {len(filenames)} spooled batches of "
+                f"{release.filename}"
+            )
+            # the loads only append summary deltas, the merged release adds
+            # them to the summaries (a failed fold is left to the next one)
+            try:
+                self.repository.fold_summaries()
+            except Exception as e:
+                logger.warning(f"Failed to fold the summaries: {e}")
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Failed to load spooled batches of {release_id}: {e}",
+                exc_info=True,
+            )
+            self._record_metrics(start_time, failures=1)
+            return False
+
+    def _get_spool(
+        self, release_id: str
+    ) -> Tuple[Release, List[str], Set[int]] | None:
+        """the manifest's release, its spool files and their pages"""
+        data = self.storage.load_file(
+            get_spool_manifest_filename(self.storage_prefix, release_id)
+        )
+        if data is None:
+            logger.debug(f"No spool manifest for {release_id}")
+            return None
+        release = Release.model_validate_json(bytes(data))
+        if release.page_count <= 0:
+            logger.error(f"No page count in the spool manifest of {release_id}")
+            return None
+
+        filenames = [
+            filename
+            for filename in self.storage.list_files(
+                get_spool_prefix(self.storage_prefix, release_id)
+            )
+            if _SPOOL_FILENAME.search(filename)
+        ]
+        return release, filenames, self._get_page_nums(filenames)
+
+    def _can_merge(
+        self, spool: Tuple[Release, List[str], Set[int]] | None, force: bool
+    ) -> bool:
+        """every page is spooled, or (forced) any is"""
+        if spool is None:
+            return False
+        release, filenames, page_nums = spool
+        logger.debug(
+            f"Spooled {len(page_nums)}/{release.page_count} pages "
+            f"of {release.filename}"
+        )
+        return bool(filenames) and (force or len(page_nums) >= release.page_count)
+
+    def _get_page_nums(self, filenames: List[str]) -> Set[int]:
+        page_nums = set()
+        for filename in filenames:
+            match = _SPOOL_FILENAME.search(filename)
+            if match:
+                page_nums.update(range(int(match[1]), int(match[2]) + 1))
+        return page_nums
+
+    def _read_groups(
+        self, filenames: List[str]
+    ) -> Dict[str, Tuple[dict, List[dict]]] | None:
+        """
+        records (and their allocations) by nca number, a later spool of the
+        same nca number (a retried batch) replaces the earlier one; None
+        when a spool can't be read (another loader may have just taken it)
+        """
+        groups: Dict[str, Tuple[dict, List[dict]]] = {}
+        for filename in filenames:
+            data = self.storage.load_file(filename)
+            if data is None:
+                logger.warning(f"Spooled batch {filename} is gone, not loading")
+                return None
+
+            records: List[dict] = []
+            allocations: Dict[str, List[dict]] = {}
+            for line in gzip.decompress(data).splitlines():
+                row = json.loads(line)
+                if "record" in row:
+                    records.append(row["record"])
+                elif "allocation" in row:
+                    allocation = row["allocation"]
+                    allocations.setdefault(allocation["nca_number"], []).append(
+                        allocation
+                    )
+
+            for record in records:
+                nca_number = record["nca_number"]
+                groups.pop(nca_number, None)  # keep the latest spool's order
+                groups[nca_number] = (record, allocations.pop(nca_number, []))
+            # allocations spooled apart from their record (not expected)
+            for nca_number, rows in allocations.items():
+                if nca_number in groups:
+                    groups[nca_number][1].extend(rows)
+        return groups
+
+    def _load(
+        self,
+        release: Release,
+        groups: Dict[str, Tuple[dict, List[dict]]],
+        page_nums: List[int],
+    ) -> Tuple[int, int]:
+        record_count = 0
+        allocation_count = 0
+        chunks = list(self._chunk(groups))
+        for i, (records, allocations) in enumerate(chunks):
+            if release.reload:
+                # only the last call stages the pages, then the release swaps
+                is_last = i == len(chunks) - 1
+                loaded_records, loaded_allocations, _ = self.repository.stage_batch(
+                    release, page_nums if is_last else [], records, allocations
+                )
+            elif records:
+                loaded_records, loaded_allocations = self.repository.load_batch(
+                    records, allocations
+                )
+            else:
+                continue
+            record_count += loaded_records
+            allocation_count += loaded_allocations
+        # a failed swap fails the merge, the spool is kept and merged again
+        if release.reload and not self.repository.complete_staged_release(release):
+            logger.warning(f"Staged reload of {release.filename} was not swapped in")
+        return record_count, allocation_count
+
+    def _chunk(self, groups: Dict[str, Tuple[dict, List[dict]]]):
+        """records with all of their allocations, up to load_rows rows each"""
+        records: List[Record] = []
+        allocations: List[Allocation] = []
+        for record, record_allocations in groups.values():
+            records.append(Record(**record))
+            allocations.extend(Allocation(**a) for a in record_allocations)
+            if len(records) + len(allocations) >= self.load_rows:
+                yield records, allocations
+                records, allocations = [], []
+        # a reload stages its pages even without records
+        if records or not groups:
+            yield records, allocations
+
+    def _record_metrics(self, start_time: float, **counts) -> None:
+        if self.metrics:
+            self.metrics.record(
+                "load", duration_s=time.monotonic() - start_time, **counts
+            )
@@ -0,0 +1,32 @@
+import logging
+
+from src.core.interfaces.repository import RepositoryProvider
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryRebuilder:
+    def __init__(self, repository: RepositoryProvider):
+        self.repository = repository
+
+    def run(self, fold: bool = False) -> bool:
+        """
+        recompute the summaries, or with fold only add the summary deltas
+        the loads appended since the last fold
+        """
+        try:
+            department_count, agency_count, month_count = (
+                self.repository.fold_summaries()
+                if fold
+                else self.repository.rebuild_summaries()
+            )
+            logger.info(
+                f"{'Folded' if fold else 'Rebuilt'} summaries: "
+                f"{department_count} departments, "
+                f"{agency_count} agencies/operating units, {month_count} months"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to rebuild summaries: {e}", exc_info=True)
+            return False
@@ -0,0 +1,30 @@
+import logging
+
+from src.core.entities.work_lease import WorkLease
+from src.core.interfaces.work_lease import WorkLeaseProvider
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLeaseClaimer:
+    def __init__(self, work_lease: WorkLeaseProvider, lease_duration_s: float):
+        self.work_lease = work_lease
+        self.lease_duration_s = lease_duration_s
+
+    def run(self, worker_id: str) -> WorkLease | None:
+        try:
+            lease = self.work_lease.claim(worker_id, self.lease_duration_s)
+            if not lease:
+                logger.debug(f"No chunks left to claim for {worker_id}")
+                return None
+
+            logger.debug(
+                f"{worker_id} claimed {lease.batch.release.filename} "
+                f"pages {lease.batch.start_page_num}-{lease.batch.end_page_num} "
+                f"(attempt {lease.attempts})"
+            )
+            return lease
+
+        except Exception as e:
+            logger.error(f"Failed to claim chunk for {worker_id}: {e}", exc_info=True)
+            return None
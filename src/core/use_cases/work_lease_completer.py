@@ -0,0 +1,25 @@
+import logging
+
+from src.core.entities.work_lease import WorkLease
+from src.core.interfaces.work_lease import WorkLeaseProvider
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLeaseCompleter:
+    def __init__(self, work_lease: WorkLeaseProvider):
+        self.work_lease = work_lease
+
+    def run(self, lease: WorkLease) -> bool:
+        try:
+            is_completed = self.work_lease.complete(lease)
+            if not is_completed:
+                logger.warning(
+                    f"{lease.worker_id} could not complete lease {lease.id}: "
+                    f"no longer owned by this worker"
+                )
+            return is_completed
+
+        except Exception as e:
+            logger.error(f"Failed to complete lease {lease.id}: {e}", exc_info=True)
+            return False
@@ -0,0 +1,30 @@
+import logging
+
+from src.core.entities.work_lease import WorkLease
+from src.core.interfaces.work_lease import WorkLeaseProvider
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLeaseReleaser:
+    def __init__(self, work_lease: WorkLeaseProvider):
+        self.work_lease = work_lease
+
+    def run(self, lease: WorkLease) -> bool:
+        try:
+            is_released = self.work_lease.release(lease)
+            if is_released:
+                logger.warning(
+                    f"{lease.worker_id} released failed lease {lease.id} "
+                    f"(attempt {lease.attempts})"
+                )
+            else:
+                logger.warning(
+                    f"{lease.worker_id} could not release lease {lease.id}: "
+                    f"no longer owned by this worker"
+                )
+            return is_released
+
+        except Exception as e:
+            logger.error(f"Failed to release lease {lease.id}: {e}", exc_info=True)
+            return False
@@ -0,0 +1,26 @@
+import logging
+
+from src.core.entities.work_lease import WorkLease
+from src.core.interfaces.work_lease import WorkLeaseProvider
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLeaseRenewer:
+    def __init__(self, work_lease: WorkLeaseProvider, lease_duration_s: float):
+        self.work_lease = work_lease
+        self.lease_duration_s = lease_duration_s
+
+    def run(self, lease: WorkLease) -> bool:
+        try:
+            is_renewed = self.work_lease.renew(lease, self.lease_duration_s)
+            if not is_renewed:
+                logger.warning(
+                    f"{lease.worker_id} lost lease {lease.id}: "
+                    f"it expired and was claimed by another worker"
+                )
+            return is_renewed
+
+        except Exception as e:
+            logger.error(f"Failed to renew lease {lease.id}: {e}", exc_info=True)
+            return False
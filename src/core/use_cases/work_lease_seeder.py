@@ -0,0 +1,22 @@
+import logging
+from typing import List
+
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.interfaces.work_lease import WorkLeaseProvider
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLeaseSeeder:
+    def __init__(self, work_lease: WorkLeaseProvider):
+        self.work_lease = work_lease
+
+    def run(self, batches: List[ReleaseBatch]) -> bool:
+        try:
+            self.work_lease.add_batches(batches)
+            logger.info(f"Seeded {len(batches)} claimable chunks")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to seed {len(batches)} chunks: {e}", exc_info=True)
+            return False
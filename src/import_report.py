@@ -0,0 +1,155 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from src.infrastructure.constants import (
+    COLD_START_IMPORT_BUDGETS_MS,
+    IMPORT_REPORT_REPEAT,
+    IMPORT_REPORT_TOP,
+)
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# runs in a fresh interpreter (-X importtime writes to stderr): builds the
+# module's lazy adapters after the import and prints their build times
+_PROBE = """
+import json, sys, time
+import {module} as module
+from src.infrastructure.lazy_adapter import LazyAdapter
+build_ms = {{}}
+for name, value in vars(module).items():
+    if isinstance(value, LazyAdapter):
+        start_time = time.perf_counter()
+        try:
+            value.get()
+        except Exception as e:
+            build_ms[name] = repr(e)
+            continue
+        build_ms[name] = (time.perf_counter() - start_time) * 1000
+print(json.dumps(build_ms))
+"""
+
+
+class ImportReport(BaseModel):
+    module: str
+    import_ms: float  # cumulative import of the module, best of the repeats
+    budget_ms: float | None = None
+    # top-level packages by cumulative time: loaded by the import itself,
+    # and deferred to the first use of the adapters
+    top_packages_ms: Dict[str, float]
+    deferred_packages_ms: Dict[str, float]
+    adapter_build_ms: Dict[str, float | str]  # first use of lazy adapters
+
+    @property
+    def is_over_budget(self) -> bool:
+        return self.budget_ms is not None and self.import_ms > self.budget_ms
+
+
+def measure(module: str, top: int) -> ImportReport:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}: {result.stderr[-2000:]}")
+
+    import_ms = 0.0
+    # nested imports are printed (deeper indented) before their importer
+    nested_ms: Dict[str, float] = {}
+    packages_ms: Dict[str, float] = {}
+    deferred_packages_ms: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        # import time: <self us> | <cumulative us> | <indented module name>
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, raw_name = line.split("|")
+        if not cumulative_us.strip().isdigit():
+            continue  # header line
+        name = raw_name.strip()
+        is_top_level = len(raw_name) - len(raw_name.lstrip()) == 1
+        cumulative_ms = int(cumulative_us) / 1000
+
+        if name == module:
+            import_ms = cumulative_ms
+            packages_ms = nested_ms
+            continue
+
+        # the first (outermost) import of a package carries its whole cost
+        package = name.split(".")[0]
+        if package not in ("src", "handlers"):
+            # anything after the module's own line comes from the adapters
+            target = deferred_packages_ms if import_ms else nested_ms
+            target[package] = max(target.get(package, 0.0), cumulative_ms)
+        if is_top_level and not import_ms:
+            # interpreter startup and the probe's own imports
+            nested_ms = {}
+
+    return ImportReport(
+        module=module,
+        import_ms=import_ms,
+        budget_ms=COLD_START_IMPORT_BUDGETS_MS.get(module),
+        top_packages_ms=_top(packages_ms, top),
+        deferred_packages_ms=_top(deferred_packages_ms, top),
+        adapter_build_ms=json.loads(result.stdout.strip().splitlines()[-1]),
+    )
+
+
+def _top(packages_ms: Dict[str, float], top: int) -> Dict[str, float]:
+    ranked = sorted(packages_ms.items(), key=lambda item: item[1], reverse=True)
+    return dict(ranked[:top])
+
+
+def _format(packages_ms: Dict[str, float]) -> str:
+    return ", ".join(f"{p} {ms:.1f} ms" for p, ms in packages_ms.items()) or "-"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Import time of each handler against its cold-start budget"
+    )
+    arg_parser.add_argument(
+        "modules", nargs="*", default=list(COLD_START_IMPORT_BUDGETS_MS)
+    )
+    arg_parser.add_argument("--repeat", type=int, default=IMPORT_REPORT_REPEAT)
+    arg_parser.add_argument("--top", type=int, default=IMPORT_REPORT_TOP)
+    arg_parser.add_argument("--out", help="write the reports to this json file")
+    args = arg_parser.parse_args()
+
+    reports: List[ImportReport] = []
+    for module in args.modules:
+        # the first runs also warm the bytecode and os file caches
+        runs = [measure(module, args.top) for _ in range(args.repeat)]
+        report = min(runs, key=lambda r: r.import_ms)
+        reports.append(report)
+
+        budget = f" (budget {report.budget_ms:.0f} ms)" if report.budget_ms else ""
+        logger.info(f"{module}: {report.import_ms:.1f} ms{budget}")
+        logger.info(f"  heaviest imports: {_format(report.top_packages_ms)}")
+        logger.info(f"  deferred to first use: {_format(report.deferred_packages_ms)}")
+        for name, build_ms in report.adapter_build_ms.items():
+            value = f"{build_ms:.1f} ms" if isinstance(build_ms, float) else build_ms
+            logger.info(f"  first use of {name}: {value}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump([r.model_dump(mode="json") for r in reports], f, indent=2)
+        logger.info(f"Saved import report to {args.out}")
+
+    over_budget = [r.module for r in reports if r.is_over_budget]
+    if over_budget:
+        logger.error(f"Over the cold-start import budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
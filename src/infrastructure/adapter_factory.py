@@ -0,0 +1,154 @@
+from src.core.interfaces.columnar import ColumnarProvider
+from src.core.interfaces.data_cleaner import DataCleanerProvider
+from src.core.interfaces.metrics import MetricsProvider
+from src.core.interfaces.parser import ParserProvider
+from src.core.interfaces.queue import QueueProvider
+from src.core.interfaces.repository import RepositoryProvider
+from src.core.interfaces.scraper import ScraperProvider
+from src.core.interfaces.serverless_function import ServerlessFunctionProvider
+from src.core.interfaces.span_recorder import SpanRecorder
+from src.core.interfaces.storage import StorageProvider
+from src.core.interfaces.work_lease import WorkLeaseProvider
+from src.infrastructure.config import settings
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    BASE_STORAGE_PATH,
+    DB_BULK_SIZE,
+    DLQ_NAME,
+    LEASE_MAX_ATTEMPTS,
+    LOCAL_METRICS_DIR,
+    LOCAL_TRACES_DIR,
+    METRICS_NAMESPACE,
+    QUEUE_MAX_RECEIVE_COUNT,
+    QUEUE_VISIBILITY_TIMEOUT_S,
+    RECORD_COLUMNS,
+    VALID_COLUMNS,
+)
+
+# handlers use aws adapters unless LOCAL_QUEUE_DB_PATH is set
+#
+# adapter modules are imported inside the factories: importing this module
+# (or a handler) doesn't load boto3, pandas, pdfplumber or supabase, pair
+# with lazy() to also defer building the adapter to its first use
+
+
+def get_queue_name(queue_url: str) -> str:
+    """https://sqs.<region>.amazonaws.com/<account>/<name> -> <name>"""
+    return queue_url.rstrip("/").split("/")[-1]
+
+
+def create_queue(queue_url: str) -> QueueProvider:
+    if settings.LOCAL_QUEUE_DB_PATH:
+        from src.infrastructure.adapters.sqlite_queue import SQLiteQueue
+
+        return SQLiteQueue(
+            db_path=settings.LOCAL_QUEUE_DB_PATH,
+            queue_name=get_queue_name(queue_url),
+            visibility_timeout_s=QUEUE_VISIBILITY_TIMEOUT_S,
+            max_receive_count=QUEUE_MAX_RECEIVE_COUNT,
+            dlq_name=DLQ_NAME,
+        )
+    from src.infrastructure.adapters.sqs_queue import SQSQueue
+
+    return SQSQueue(queue_url=queue_url)
+
+
+def create_storage() -> StorageProvider:
+    if settings.LOCAL_QUEUE_DB_PATH:
+        from src.infrastructure.adapters.local_storage import LocalStorage
+
+        return LocalStorage(base_storage_path=BASE_STORAGE_PATH)
+    from src.infrastructure.adapters.s3_storage import S3Storage
+
+    return S3Storage(base_storage_path=BASE_STORAGE_PATH)
+
+
+def create_serverless_function() -> ServerlessFunctionProvider:
+    if settings.LOCAL_QUEUE_DB_PATH:
+        from src.infrastructure.adapters.mock_serverless_function import (
+            MockServerlessFunction,
+        )
+
+        return MockServerlessFunction()
+    from src.infrastructure.adapters.lambda_serverless_function import (
+        LambdaServerlessFunction,
+    )
+
+    return LambdaServerlessFunction()
+
+
+def create_parser() -> ParserProvider:
+    from src.infrastructure.adapters.pdf_parser import PDFParser
+
+    return PDFParser()
+
+
+def create_data_cleaner() -> DataCleanerProvider:
+    from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+
+    return PdDataCleaner(
+        allocation_comumns=ALLOCATION_COLUMNS,
+        record_columns=RECORD_COLUMNS,
+        valid_columns=VALID_COLUMNS,
+    )
+
+
+def create_columnar() -> ColumnarProvider:
+    from src.infrastructure.adapters.parquet_columnar import ParquetColumnar
+
+    return ParquetColumnar()
+
+
+def create_repository() -> RepositoryProvider:
+    from src.infrastructure.adapters.supabase_repository import SupabaseRepository
+
+    return SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
+
+
+def create_work_lease(db_path: str) -> WorkLeaseProvider:
+    """db_path is the sqlite file, unused with WORK_LEASE_BACKEND=supabase"""
+    if settings.WORK_LEASE_BACKEND == "supabase":
+        from src.infrastructure.adapters.supabase_work_lease import SupabaseWorkLease
+
+        return SupabaseWorkLease(
+            db_bulk_size=DB_BULK_SIZE, max_attempts=LEASE_MAX_ATTEMPTS
+        )
+    from src.infrastructure.adapters.sqlite_work_lease import SQLiteWorkLease
+
+    return SQLiteWorkLease(db_path=db_path, max_attempts=LEASE_MAX_ATTEMPTS)
+
+
+def create_scraper(name: str = "bs4") -> ScraperProvider:
+    if name == "scrapy":
+        from src.infrastructure.adapters.scrapy_scraper import ScrapyScraper
+
+        return ScrapyScraper()
+    from src.infrastructure.adapters.bs4_scraper import Bs4Scraper
+
+    return Bs4Scraper()
+
+
+def create_metrics(function_name: str) -> MetricsProvider:
+    """emf in lambda (AWS_LAMBDA_FUNCTION_NAME is set by the runtime)"""
+    if settings.AWS_LAMBDA_FUNCTION_NAME:
+        from src.infrastructure.adapters.emf_metrics import EMFMetrics
+
+        return EMFMetrics(namespace=METRICS_NAMESPACE, function_name=function_name)
+    from src.infrastructure.adapters.local_metrics import LocalMetrics
+
+    return LocalMetrics(
+        metrics_dir=LOCAL_METRICS_DIR,
+        function_name=function_name,
+        format=settings.METRICS_FORMAT,
+    )
+
+
+def create_span_recorder(function_name: str) -> SpanRecorder:
+    """cloudwatch log lines in lambda, ndjson files under ./traces locally"""
+    if settings.AWS_LAMBDA_FUNCTION_NAME:
+        from src.infrastructure.adapters.log_span_recorder import LogSpanRecorder
+
+        return LogSpanRecorder()
+    from src.infrastructure.adapters.local_span_recorder import LocalSpanRecorder
+
+    return LocalSpanRecorder(traces_dir=LOCAL_TRACES_DIR, function_name=function_name)
@@ -0,0 +1,55 @@
+import json
+import time
+
+from src.core.interfaces.metrics import MetricsProvider
+from src.infrastructure.adapters.stage_metrics import StageMetrics
+
+_METRIC_UNITS = {
+    "Calls": "Count",
+    "Duration": "Milliseconds",
+    "Pages": "Count",
+    "Rows": "Count",
+    "Bytes": "Bytes",
+    "Failures": "Count",
+}
+
+
+class EMFMetrics(StageMetrics, MetricsProvider):
+    """
+    cloudwatch embedded metric format: one json log line per stage,
+    cloudwatch logs turns them into metrics (FunctionName, Stage dimensions)
+    """
+
+    def __init__(self, namespace: str, function_name: str):
+        super().__init__()
+        self.namespace = namespace
+        self.function_name = function_name
+
+    def flush(self) -> None:
+        timestamp_ms = int(time.time() * 1000)
+        for stage, counters in self._drain().items():
+            line = {
+                "_aws": {
+                    "Timestamp": timestamp_ms,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": self.namespace,
+                            "Dimensions": [["FunctionName", "Stage"]],
+                            "Metrics": [
+                                {"Name": name, "Unit": unit}
+                                for name, unit in _METRIC_UNITS.items()
+                            ],
+                        }
+                    ],
+                },
+                "FunctionName": self.function_name,
+                "Stage": stage,
+                "Calls": counters["calls"],
+                "Duration": round(counters["duration_s"] * 1000, 3),
+                "Pages": counters["pages"],
+                "Rows": counters["rows"],
+                "Bytes": counters["size_bytes"],
+                "Failures": counters["failures"],
+            }
+            # must be the whole log line (no logging prefix) to be parsed
+            print(json.dumps(line), flush=True)
@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+from typing import Dict
+
+from src.core.interfaces.metrics import MetricsProvider
+from src.infrastructure.adapters.stage_metrics import FIELDS, StageMetrics
+
+logger = logging.getLogger(__name__)
+
+_PROMETHEUS_METRICS = {
+    "calls": ("dbm_nca_stage_calls_total", "stage invocations"),
+    "duration_s": ("dbm_nca_stage_duration_seconds_total", "time spent in stage"),
+    "pages": ("dbm_nca_stage_pages_total", "pages handled by stage"),
+    "rows": ("dbm_nca_stage_rows_total", "rows handled by stage"),
+    "size_bytes": ("dbm_nca_stage_bytes_total", "bytes handled by stage"),
+    "failures": ("dbm_nca_stage_failures_total", "failed stage calls"),
+}
+
+
+class LocalMetrics(StageMetrics, MetricsProvider):
+    """
+    keeps running totals for the process and rewrites a prometheus textfile
+    (node_exporter textfile collector) or a json summary on every flush,
+    one file per process so concurrent consumers don't overwrite each other
+    """
+
+    def __init__(self, metrics_dir: str, function_name: str, format: str):
+        super().__init__()
+        self.function_name = function_name
+        self.format = format
+        extension = "json" if format == "json" else "prom"
+        self.path = os.path.join(
+            metrics_dir, f"{function_name}-{os.getpid()}.{extension}"
+        )
+        self._totals: Dict[str, Dict[str, float]] = {}
+        os.makedirs(metrics_dir, exist_ok=True)
+
+    def flush(self) -> None:
+        for stage, counters in self._drain().items():
+            totals = self._totals.setdefault(stage, dict.fromkeys(FIELDS, 0))
+            for field in FIELDS:
+                totals[field] += counters[field]
+            logger.info(
+                f"Stage {stage}: {counters['calls']} calls, "
+                f"{counters['duration_s']:.2f}s, {counters['pages']} pages, "
+                f"{counters['rows']} rows, {counters['size_bytes']} bytes, "
+                f"{counters['failures']} failures"
+            )
+
+        content = (
+            json.dumps({self.function_name: self._totals}, indent=2)
+            if self.format == "json"
+            else self._to_prometheus()
+        )
+        # the collector must never read a half-written file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, self.path)
+
+    def _to_prometheus(self) -> str:
+        lines = []
+        for field, (name, help_text) in _PROMETHEUS_METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for stage, totals in sorted(self._totals.items()):
+                lines.append(
+                    f'{name}{{function="{self.function_name}",stage="{stage}"}} '
+                    f"{totals[field]}"
+                )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,20 @@
+import json
+import os
+import threading
+
+from src.core.entities.span import Span
+from src.core.interfaces.span_recorder import SpanRecorder
+
+
+class LocalSpanRecorder(SpanRecorder):
+    """appends spans as ndjson, one file per process like LocalMetrics"""
+
+    def __init__(self, traces_dir: str, function_name: str):
+        self.path = os.path.join(traces_dir, f"{function_name}-{os.getpid()}.ndjson")
+        self._lock = threading.Lock()
+        os.makedirs(traces_dir, exist_ok=True)
+
+    def record(self, span: Span) -> None:
+        line = json.dumps({"span": span.model_dump(mode="json")})
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
@@ -1,7 +1,11 @@
+from contextlib import contextmanager
+import mmap
 import os
-from io import BytesIO
+import tempfile
+from typing import BinaryIO, Iterator, List
 
-from src.core.interfaces.storage import StorageProvider
+from src.core.interfaces.storage import FileData, StorageProvider
+from src.infrastructure.buffer_stream import as_buffer
 
 
 class LocalStorage(StorageProvider):
@@ -16,23 +20,66 @@ class LocalStorage(StorageProvider):
             return f"{self.base_storage_path}{filename}"
         return f"{self.base_storage_path}/{filename}"
 
-    def save_file(self, filename: str, data: BytesIO) -> None:
+    def save_file(self, filename: str, data: FileData) -> None:
         self._create_base_dirs()
-        data_copy = BytesIO(data.getvalue())
-        data_copy.seek(0)
-        full_path = self.get_filename_full_path(filename)
-        with open(full_path, 'wb') as f:
-            f.write(data_copy.read())
+        # written from a view of the data, and replaced (not truncated) so
+        # buffers mapped from the previous file stay valid
+        with as_buffer(data) as view, self.open_file_writer(filename) as f:
+            f.write(view)
 
-    def load_file(self, filename: str) -> BytesIO | None:
+    def load_file(self, filename: str) -> memoryview | None:
+        """
+        read-only view of the memory-mapped file, pages are read in from
+        the os page cache on access instead of copied up front
+        """
         full_path = self.get_filename_full_path(filename)
         try:
             with open(full_path, 'rb') as f:
-                return BytesIO(f.read())
+                if os.fstat(f.fileno()).st_size == 0:
+                    return memoryview(b'')  # empty files can't be mapped
+                # the mapping outlives the closed file, until the view is freed
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
 
         except Exception:
             return None
 
+    @contextmanager
+    def open_file_writer(self, filename: str) -> Iterator[BinaryIO]:
+        full_path = self.get_filename_full_path(filename)
+        dir_path = os.path.dirname(full_path) or '.'
+        os.makedirs(dir_path, exist_ok=True)
+        # readers never see a partial file, and concurrent writers of the
+        # same file each write their own temp file (the last replace wins)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=dir_path, prefix=f".{os.path.basename(full_path)}.", suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                yield f
+            os.replace(tmp_path, full_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def list_files(self, prefix: str) -> List[str]:
+        base_path = self.get_filename_full_path('') or '.'
+        # walk the prefix's directory, not the whole storage
+        prefix_dir = os.path.dirname(self.get_filename_full_path(prefix)) or '.'
+        filenames = []
+        for root, _, files in os.walk(prefix_dir):
+            for name in files:
+                filename = os.path.relpath(os.path.join(root, name), base_path)
+                # partial writes are not files yet
+                if filename.startswith(prefix) and not filename.endswith('.tmp'):
+                    filenames.append(filename)
+        return sorted(filenames)
+
+    def delete_file(self, filename: str) -> None:
+        try:
+            os.remove(self.get_filename_full_path(filename))
+        except FileNotFoundError:
+            pass
+
     def _create_base_dirs(self):
         if not self.base_storage_path:
             return
@@ -0,0 +1,15 @@
+import json
+
+from src.core.entities.span import Span
+from src.core.interfaces.span_recorder import SpanRecorder
+
+
+class LogSpanRecorder(SpanRecorder):
+    """
+    one json log line per span, queryable with cloudwatch logs insights:
+    fields span.release_id, span.time_to_data_s | filter ispresent(span.trace_id)
+    """
+
+    def record(self, span: Span) -> None:
+        # must be the whole log line (no logging prefix) to be parsed
+        print(json.dumps({"span": span.model_dump(mode="json")}), flush=True)
@@ -1,4 +1,5 @@
 import logging
+from typing import Dict
 
 from pydantic import BaseModel
 
@@ -11,5 +12,5 @@ class MockQueue(QueueProvider):
     def __init__(self):
         pass
 
-    def send(self, data: BaseModel) -> None:
-        print({"message": data})
+    def send(self, data: BaseModel, attributes: Dict[str, str] | None = None) -> None:
+        print({"message": data, "attributes": attributes or {}})
@@ -0,0 +1,16 @@
+import logging
+
+from src.core.interfaces.serverless_function import ServerlessFunctionProvider
+
+logger = logging.getLogger(__name__)
+
+
+class MockServerlessFunction(ServerlessFunctionProvider):
+    def __init__(self):
+        pass
+
+    def enable_triggers(self, function_name: str) -> None:
+        logger.info(f"(local) Enabled triggers for {function_name}")
+
+    def disable_triggers(self, function_name: str) -> None:
+        logger.info(f"(local) Disabled triggers for {function_name}")
@@ -0,0 +1,35 @@
+from typing import Any, BinaryIO, Dict, List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.core.interfaces.columnar import ColumnarProvider
+
+# cleaned released dates (PdDataCleaner), unparseable ones become nulls
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+class ParquetColumnar(ColumnarProvider):
+    def __init__(self, compression: str = "zstd"):
+        self.compression = compression
+
+    def write_table(
+        self, rows: List[Dict[str, Any]], columns: Dict[str, str], out: BinaryIO
+    ) -> None:
+        arrays = [
+            self._to_array([row.get(name) for row in rows], type_name)
+            for name, type_name in columns.items()
+        ]
+        table = pa.Table.from_arrays(arrays, names=list(columns))
+        pq.write_table(table, out, compression=self.compression)
+
+    def _to_array(self, values: List[Any], type_name: str) -> pa.Array:
+        if type_name == "timestamp":
+            return pc.strptime(
+                pa.array(values, pa.string()),
+                format=TIMESTAMP_FORMAT,
+                unit="s",
+                error_is_null=True,
+            )
+        return pa.array(values, pa.type_for_alias(type_name))
@@ -4,6 +4,7 @@ import numpy as np
 
 from src.core.entities.allocation import Allocation
 from src.core.entities.nca_data import NCAData
+from src.core.entities.page_rows import PageRows
 from src.core.entities.record import Record
 from src.core.interfaces.data_cleaner import DataCleanerProvider
 
@@ -59,6 +60,54 @@ class PdDataCleaner(DataCleanerProvider):
         data = NCAData(records=records, allocations=allocations)
         return data
 
+    def split_page(
+        self,
+        raw_rows: List[List[str | None]],
+        page_num: int,
+    ) -> PageRows:
+        """
+        split the page at the rows that start an nca group:
+            [leading rows] [group] ... [group] [trailing group]
+        only the groups in between are known to be complete
+        """
+        header = raw_rows[0]
+        normalized_header = self._normalize_row(header)
+        nca_idx = normalized_header.index("nca_number")
+
+        body_rows = [
+            row for row in raw_rows[1:]
+            if self._normalize_row(row) != normalized_header
+        ]
+        group_starts = [
+            i for i, row in enumerate(body_rows)
+            if row[nca_idx] and str(row[nca_idx]).strip() != ""
+        ]
+
+        if not group_starts:
+            return PageRows(
+                page_num=page_num,
+                header=header,
+                leading_rows=body_rows,
+                closed_rows=[],
+                trailing_rows=[],
+                has_group_start=False,
+            )
+
+        first_start, last_start = group_starts[0], group_starts[-1]
+        return PageRows(
+            page_num=page_num,
+            header=header,
+            leading_rows=body_rows[:first_start],
+            closed_rows=body_rows[first_start:last_start],
+            trailing_rows=body_rows[last_start:],
+            has_group_start=True,
+        )
+
+    def _normalize_row(self, row: List[str | None]) -> List[str]:
+        return [
+            "_".join(item.lower().split()) if item else "" for item in row
+        ]
+
     def _convert_raw_to_df(self, raw_rows: List[List[str | None]]):
         table_header = [
             item.lower().replace(" ", "_") if item else "" for item in raw_rows[0]
@@ -1,11 +1,13 @@
 from io import BytesIO
-from typing import List
+from typing import BinaryIO, Iterator, List, Tuple
 from PyPDF2 import PdfReader, PdfWriter
 import pdfplumber
 from pdfplumber.page import Page
 from src.core.entities.metadata import MetaData
 from src.core.interfaces.parser import ParserProvider
-from src.infrastructure.constants import TABLE_COLUMNS
+from src.core.interfaces.storage import FileData
+from src.infrastructure.buffer_stream import as_stream
+from src.infrastructure.constants import PDF_PARSER_VERSION, TABLE_COLUMNS
 
 
 class PDFParser(ParserProvider):
@@ -20,8 +22,11 @@ class PDFParser(ParserProvider):
         }
         pass
 
-    def get_metadata_by_data(self, data: BytesIO) -> MetaData:
-        reader = PdfReader(data)
+    def get_version(self) -> str:
+        return f"pdfplumber-{pdfplumber.__version__}-v{PDF_PARSER_VERSION}"
+
+    def get_metadata_by_data(self, data: FileData) -> MetaData:
+        reader = PdfReader(as_stream(data))
         meta = reader.metadata
         metadata = MetaData(
             **{
@@ -31,46 +36,85 @@ class PDFParser(ParserProvider):
         )
         return metadata
 
-    def get_page_count(self, data: BytesIO) -> int:
-        reader = PdfReader(data)
+    def get_page_count(self, data: FileData) -> int:
+        reader = PdfReader(as_stream(data))
         return len(reader.pages)
 
-    def split_pages(self, data: BytesIO) -> List[BytesIO]:
-        data_list: List[BytesIO] = []
-        reader = PdfReader(data)
+    def get_page_costs(self, data: FileData) -> List[float]:
+        """
+        use the decoded content stream size as the cost of a page,
+        it grows with the number of drawn words/rows without running
+        the (expensive) pdfplumber layout analysis
+        """
+        page_costs: List[float] = []
+        reader = PdfReader(as_stream(data))
         for page in reader.pages:
-            writer = PdfWriter()
-            writer.add_page(page)
+            contents = page.get_contents()
+            page_costs.append(float(len(contents.get_data())) if contents else 0.0)
+        return page_costs
 
+    def split_pages(
+        self,
+        data: FileData,
+        start_page_num: int = 1,
+        end_page_num: int | None = None,
+        slice_size: int = 1,
+    ) -> Iterator[Tuple[int, int, BytesIO]]:
+        """
+        lazily yield (start, end, pdf) slices of up to slice_size pages
+        over the 1-based inclusive page range, only the slice being
+        consumed is held in memory
+        """
+        reader = PdfReader(as_stream(data))
+        end_page_num = min(end_page_num or len(reader.pages), len(reader.pages))
+        for slice_start in range(start_page_num, end_page_num + 1, slice_size):
+            slice_end = min(slice_start + slice_size - 1, end_page_num)
             page_buff = BytesIO()
-            writer.write(page_buff)
-
-            data_list.append(page_buff)
+            self._write_pages(reader, slice_start, slice_end, page_buff)
+            page_buff.seek(0)
+            yield slice_start, slice_end, page_buff
 
-        return data_list
+    def write_pages(
+        self, data: FileData, start_page_num: int, end_page_num: int, out: BinaryIO
+    ) -> None:
+        reader = PdfReader(as_stream(data))
+        self._write_pages(reader, start_page_num, end_page_num, out)
 
     def extract_table_by_page_num(
-        self, data: BytesIO, page_num: int
+        self, data: FileData, page_num: int
     ) -> List[List[str | None]]:
         raw_rows: List[List[str | None]] = []
 
-        with pdfplumber.open(data) as pdf:
-            for i, page in enumerate(pdf.pages):
-                if i == 0:
-                    self._update_table_settings_vert_lines(page)
+        with pdfplumber.open(as_stream(data)) as pdf:
+            # page_num is 1-based, the column lines come from the first page
+            if not 1 <= page_num <= len(pdf.pages):
+                return raw_rows
+            self._update_table_settings_vert_lines(pdf.pages[0])
 
-                if i != page_num:
-                    continue
-
-                rows = page.extract_table(self.table_settings)
-                if rows:
-                    raw_rows.extend(rows)
-                # <test ----------->
-                # self.display_page(page)
-                # </test ----------->
+            page = pdf.pages[page_num - 1]
+            rows = page.extract_table(self.table_settings)
+            if rows:
+                raw_rows.extend(rows)
+            # <test ----------->
+            # self.display_page(page)
+            # </test ----------->
 
         return raw_rows
 
+    def _write_pages(
+        self,
+        reader: PdfReader,
+        start_page_num: int,
+        end_page_num: int,
+        out: BinaryIO,
+    ) -> None:
+        # one writer per slice: objects its pages share (fonts, xobjects)
+        # are copied once per slice instead of once per page
+        writer = PdfWriter()
+        for page_index in range(start_page_num - 1, end_page_num):
+            writer.add_page(reader.pages[page_index])
+        writer.write(out)
+
     def display_page(self, page: Page):
         print(self.table_settings["explicit_vertical_lines"])
         im = page.to_image()
@@ -1,10 +1,14 @@
+from contextlib import contextmanager
 import logging
 import boto3
-from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator, List
 from botocore.exceptions import ClientError
 
-from src.core.interfaces.storage import StorageProvider
+from src.core.interfaces.storage import FileData, StorageProvider
+from src.infrastructure.buffer_stream import BufferStream, as_buffer
 from src.infrastructure.config import settings
+from src.infrastructure.constants import S3_WRITER_SPOOL_BYTES
 
 logger = logging.getLogger(__name__)
 
@@ -22,17 +26,39 @@ class S3Storage(StorageProvider):
             return f"{self.base_storage_path}{filename}"
         return f"{self.base_storage_path}/{filename}"
 
-    def save_file(self, filename: str, data: BytesIO) -> None:
-        data_copy = BytesIO(data.getvalue())
-        data_copy.seek(0)
+    def save_file(self, filename: str, data: FileData) -> None:
         full_path = self.get_filename_full_path(filename)
-        self.s3.upload_fileobj(data_copy, self.bucket_name, full_path)
+        with as_buffer(data) as view:
+            self.s3.upload_fileobj(BufferStream(view), self.bucket_name, full_path)
 
-    def load_file(self, filename: str) -> BytesIO | None:
+    @contextmanager
+    def open_file_writer(self, filename: str) -> Iterator[BinaryIO]:
+        """spooled in memory (on disk past S3_WRITER_SPOOL_BYTES), then uploaded"""
+        full_path = self.get_filename_full_path(filename)
+        with SpooledTemporaryFile(max_size=S3_WRITER_SPOOL_BYTES) as f:
+            yield f  # pyright: ignore
+            f.seek(0)
+            self.s3.upload_fileobj(f, self.bucket_name, full_path)
+
+    def load_file(self, filename: str) -> memoryview | None:
         full_path = self.get_filename_full_path(filename)
         try:
             response = self.s3.get_object(Bucket=self.bucket_name, Key=full_path)
-            return BytesIO(response["Body"].read())
+            return memoryview(response["Body"].read())
 
         except ClientError:
             return None
+
+    def list_files(self, prefix: str) -> List[str]:
+        full_prefix = self.get_filename_full_path(prefix)
+        base_path = self.get_filename_full_path("")
+        filenames = []
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=full_prefix):
+            for obj in page.get("Contents", []):
+                filenames.append(obj["Key"][len(base_path):])
+        return sorted(filenames)
+
+    def delete_file(self, filename: str) -> None:
+        full_path = self.get_filename_full_path(filename)
+        self.s3.delete_object(Bucket=self.bucket_name, Key=full_path)
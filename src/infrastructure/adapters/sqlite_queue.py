@@ -0,0 +1,188 @@
+from contextlib import contextmanager
+import json
+import sqlite3
+import time
+from typing import Dict, List
+import uuid
+
+from pydantic import BaseModel
+
+from src.core.entities.queue_message import QueueMessage
+from src.core.interfaces.queue import QueueProvider
+
+
+class SQLiteQueue(QueueProvider):
+    """
+    durable local stand-in for an SQS standard queue:
+    - received messages are hidden for the visibility timeout
+    - messages that are not deleted become visible again (redelivery)
+    - messages received max_receive_count times are moved to the dlq
+      instead of being delivered again (like the sqs redrive policy)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        queue_name: str,
+        visibility_timeout_s: float,
+        max_receive_count: int,
+        dlq_name: str | None = None,
+    ):
+        self.db_path = db_path
+        self.queue_name = queue_name
+        self.visibility_timeout_s = visibility_timeout_s
+        self.max_receive_count = max_receive_count
+        self.dlq_name = dlq_name
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_table()
+
+    def send(self, data: BaseModel, attributes: Dict[str, str] | None = None) -> None:
+        self.send_batch([data], attributes)
+
+    def send_batch(
+        self, data_list: List[BaseModel], attributes: Dict[str, str] | None = None
+    ) -> None:
+        now = time.time()
+        rows = [
+            (
+                str(uuid.uuid4()),
+                self.queue_name,
+                json.dumps(data.model_dump(mode="json")),
+                json.dumps(attributes or {}),
+                now,
+                now,
+            )
+            for data in data_list
+        ]
+        with self._transaction():
+            self.conn.executemany(
+                """
+                INSERT INTO queue_message
+                  (id, queue_name, body, attributes, visible_at, sent_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def receive(
+        self, max_messages: int = 1, visibility_timeout_s: float | None = None
+    ) -> List[QueueMessage]:
+        now = time.time()
+        timeout_s = (
+            self.visibility_timeout_s
+            if visibility_timeout_s is None
+            else visibility_timeout_s
+        )
+        messages: List[QueueMessage] = []
+
+        with self._transaction():
+            if self.dlq_name:
+                self.conn.execute(
+                    """
+                    UPDATE queue_message
+                    SET queue_name = ?, receipt_handle = NULL
+                    WHERE queue_name = ? AND visible_at <= ?
+                      AND receive_count >= ?
+                    """,
+                    (self.dlq_name, self.queue_name, now, self.max_receive_count),
+                )
+
+            rows = self.conn.execute(
+                """
+                SELECT id, body, attributes, receive_count, sent_at
+                FROM queue_message
+                WHERE queue_name = ? AND visible_at <= ?
+                ORDER BY sent_at
+                LIMIT ?
+                """,
+                (self.queue_name, now, max_messages),
+            ).fetchall()
+
+            for message_id, body, attributes, receive_count, sent_at in rows:
+                receipt_handle = str(uuid.uuid4())
+                self.conn.execute(
+                    """
+                    UPDATE queue_message
+                    SET visible_at = ?,
+                        receive_count = receive_count + 1,
+                        receipt_handle = ?
+                    WHERE id = ?
+                    """,
+                    (now + timeout_s, receipt_handle, message_id),
+                )
+                messages.append(
+                    QueueMessage(
+                        message_id=message_id,
+                        receipt_handle=receipt_handle,
+                        body=body,
+                        receive_count=receive_count + 1,
+                        sent_at=sent_at,
+                        attributes=json.loads(attributes),
+                    )
+                )
+
+        return messages
+
+    def delete(self, receipt_handle: str) -> bool:
+        """only the latest receipt handle can delete (stale receivers can't)"""
+        return self.delete_batch([receipt_handle]) == 1
+
+    def delete_batch(self, receipt_handles: List[str]) -> int:
+        with self._transaction():
+            cursor = self.conn.executemany(
+                """
+                DELETE FROM queue_message
+                WHERE queue_name = ? AND receipt_handle = ?
+                """,
+                [(self.queue_name, handle) for handle in receipt_handles],
+            )
+        return cursor.rowcount
+
+    def count(self, queue_name: str | None = None) -> int:
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM queue_message WHERE queue_name = ?",
+            (queue_name or self.queue_name,),
+        ).fetchone()
+        return row[0]
+
+    @contextmanager
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _create_table(self):
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS queue_message (
+              id TEXT PRIMARY KEY,
+              queue_name TEXT NOT NULL,
+              body TEXT NOT NULL,
+              attributes TEXT NOT NULL DEFAULT '{}',
+              visible_at REAL NOT NULL,
+              receive_count INTEGER NOT NULL DEFAULT 0,
+              receipt_handle TEXT,
+              sent_at REAL NOT NULL
+            )
+            """
+        )
+        # queue dbs created before message attributes were supported
+        columns = [
+            row[1] for row in self.conn.execute("PRAGMA table_info(queue_message)")
+        ]
+        if "attributes" not in columns:
+            self.conn.execute(
+                "ALTER TABLE queue_message "
+                "ADD COLUMN attributes TEXT NOT NULL DEFAULT '{}'"
+            )
+        self.conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_queue_message_receive
+            ON queue_message(queue_name, visible_at, sent_at)
+            """
+        )
@@ -0,0 +1,182 @@
+from contextlib import contextmanager
+import json
+import sqlite3
+import time
+from typing import List
+
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.entities.work_lease import WorkLease
+from src.core.interfaces.work_lease import WorkLeaseProvider
+
+
+class SQLiteWorkLease(WorkLeaseProvider):
+    """
+    local stand-in for the postgres work_lease table,
+    BEGIN IMMEDIATE takes the write lock so only one process
+    can move a chunk from pending/expired to leased at a time
+    """
+
+    def __init__(self, db_path: str, max_attempts: int):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_table()
+
+    def add_batches(self, batches: List[ReleaseBatch]) -> None:
+        now = time.time()
+        rows = [
+            (
+                self._get_lease_id(batch),
+                batch.release.id,
+                batch.start_page_num,
+                json.dumps(batch.model_dump(mode="json")),
+                now,
+            )
+            for batch in batches
+        ]
+        with self._transaction():
+            self.conn.executemany(
+                """
+                INSERT INTO work_lease
+                  (id, release_id, start_page_num, batch, status, created_at)
+                VALUES (?, ?, ?, ?, 'pending', ?)
+                ON CONFLICT(id) DO UPDATE SET
+                  batch = excluded.batch,
+                  status = 'pending',
+                  lease_owner = NULL,
+                  lease_expires_at = NULL,
+                  attempts = 0
+                """,
+                rows,
+            )
+
+    def claim(self, worker_id: str, lease_duration_s: float) -> WorkLease | None:
+        now = time.time()
+        with self._transaction():
+            # expired leases that already used up their attempts are dead-lettered
+            self.conn.execute(
+                """
+                UPDATE work_lease SET status = 'failed'
+                WHERE status = 'leased'
+                  AND lease_expires_at < ?
+                  AND attempts >= ?
+                """,
+                (now, self.max_attempts),
+            )
+            row = self.conn.execute(
+                """
+                SELECT id, batch, attempts FROM work_lease
+                WHERE status = 'pending'
+                   OR (status = 'leased' AND lease_expires_at < ?)
+                ORDER BY release_id, start_page_num
+                LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if not row:
+                return None
+
+            lease_id, batch_json, attempts = row
+            expires_at = now + lease_duration_s
+            self.conn.execute(
+                """
+                UPDATE work_lease
+                SET status = 'leased',
+                    lease_owner = ?,
+                    lease_expires_at = ?,
+                    attempts = attempts + 1
+                WHERE id = ?
+                """,
+                (worker_id, expires_at, lease_id),
+            )
+
+        return WorkLease(
+            id=lease_id,
+            batch=ReleaseBatch(**json.loads(batch_json)),
+            worker_id=worker_id,
+            expires_at=expires_at,
+            attempts=attempts + 1,
+        )
+
+    def renew(self, lease: WorkLease, lease_duration_s: float) -> bool:
+        expires_at = time.time() + lease_duration_s
+        with self._transaction():
+            cursor = self.conn.execute(
+                """
+                UPDATE work_lease SET lease_expires_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'leased'
+                """,
+                (expires_at, lease.id, lease.worker_id),
+            )
+        if cursor.rowcount != 1:
+            return False
+        lease.expires_at = expires_at
+        return True
+
+    def complete(self, lease: WorkLease) -> bool:
+        with self._transaction():
+            cursor = self.conn.execute(
+                """
+                UPDATE work_lease SET status = 'done', lease_expires_at = NULL
+                WHERE id = ? AND lease_owner = ? AND status = 'leased'
+                """,
+                (lease.id, lease.worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, lease: WorkLease) -> bool:
+        with self._transaction():
+            cursor = self.conn.execute(
+                """
+                UPDATE work_lease
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE id = ? AND lease_owner = ? AND status = 'leased'
+                """,
+                (self.max_attempts, lease.id, lease.worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def count_remaining(self) -> int:
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM work_lease WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0]
+
+    def _get_lease_id(self, batch: ReleaseBatch) -> str:
+        return f"{batch.release.id}:{batch.start_page_num}-{batch.end_page_num}"
+
+    @contextmanager
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _create_table(self):
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS work_lease (
+              id TEXT PRIMARY KEY,
+              release_id TEXT NOT NULL,
+              start_page_num INTEGER NOT NULL,
+              batch TEXT NOT NULL,
+              status TEXT NOT NULL DEFAULT 'pending',
+              lease_owner TEXT,
+              lease_expires_at REAL,
+              attempts INTEGER NOT NULL DEFAULT 0,
+              created_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_work_lease_claim
+            ON work_lease(status, release_id, start_page_num)
+            """
+        )
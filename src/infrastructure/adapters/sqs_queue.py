@@ -1,6 +1,7 @@
 import json
 import boto3
 import logging
+from typing import Dict
 
 from pydantic import BaseModel
 
@@ -14,11 +15,18 @@ class SQSQueue(QueueProvider):
         self.sqs = boto3.client("sqs")
         self.queue_url = queue_url
 
-    def send(self, data: BaseModel) -> None:
+    def send(self, data: BaseModel, attributes: Dict[str, str] | None = None) -> None:
         try:
             message_body = json.dumps(data.model_dump(mode="json"))
 
-            self.sqs.send_message(QueueUrl=self.queue_url, MessageBody=message_body)
+            self.sqs.send_message(
+                QueueUrl=self.queue_url,
+                MessageBody=message_body,
+                MessageAttributes={
+                    name: {"DataType": "String", "StringValue": value}
+                    for name, value in (attributes or {}).items()
+                },
+            )
 
             logger.debug(f"Sent data to queue: {data}")
 
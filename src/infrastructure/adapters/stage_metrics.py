@@ -0,0 +1,35 @@
+import threading
+from typing import Dict
+
+FIELDS = ["calls", "duration_s", "pages", "rows", "size_bytes", "failures"]
+
+
+class StageMetrics:
+    """thread-safe per-stage counters shared by the metrics adapters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def record(
+        self,
+        stage: str,
+        duration_s: float = 0.0,
+        pages: int = 0,
+        rows: int = 0,
+        size_bytes: int = 0,
+        failures: int = 0,
+    ) -> None:
+        with self._lock:
+            counters = self._stages.setdefault(stage, dict.fromkeys(FIELDS, 0))
+            counters["calls"] += 1
+            counters["duration_s"] += duration_s
+            counters["pages"] += pages
+            counters["rows"] += rows
+            counters["size_bytes"] += size_bytes
+            counters["failures"] += failures
+
+    def _drain(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            stages, self._stages = self._stages, {}
+        return stages
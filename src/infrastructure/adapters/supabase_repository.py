@@ -1,8 +1,9 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from supabase import create_client
 
 from src.core.entities.allocation import Allocation
 from src.core.entities.record import Record
+from src.core.entities.record_search_result import RecordSearchResult
 from src.core.entities.release import Release
 from src.core.interfaces.repository import RepositoryProvider
 from src.infrastructure.config import settings
@@ -15,6 +16,9 @@ class SupabaseRepository(RepositoryProvider):
             settings.SUPABASE_ANON_KEY
         )
         self.db_bulk_size = db_bulk_size
+        # record/allocation partitioned by release year (see migrations/)
+        self.partitioned = settings.DB_PARTITIONED
+        self._release_years: Dict[str, int] = {}
 
     def get_release(self, id: str) -> Release | None:
         response = self.client.table("release").select(
@@ -35,22 +39,130 @@ class SupabaseRepository(RepositoryProvider):
             return None
 
     def upsert_release(self, release: Release) -> None:
-        data = release.model_dump()
+        data = release.model_dump(exclude={"reload"})
         self._bulk_upsert("release", [data], "id")
 
     def delete_release(self, id: str) -> None:
-        self.client.table("release").delete(
-        ).eq("id", id).execute()
+        # the release's rows leave the summaries before the delete cascades
+        # (partitioned: its year's partitions are dropped instead)
+        self.client.rpc("drop_release", {"p_release_id": id}).execute()
 
     def bulk_upsert_records(self, records: List[Record]) -> None:
         self._bulk_check_data(records)
         data = [record.model_dump() for record in records]
+        if self.partitioned:
+            for row in data:
+                row["release_year"] = self._get_release_year(row["release_id"])
+            self._bulk_upsert("record", data, "release_year,nca_number")
+            return
         self._bulk_upsert("record", data, "nca_number")
 
     def bulk_insert_allocations(self, allocations: List[Allocation]) -> None:
         self._bulk_check_data(allocations)
         data = [allocation.model_dump() for allocation in allocations]
-        self._bulk_insert("allocation", data)
+        # allocations reference their record by its integer id (and, when
+        # partitioned, its release year), resolved from the nca_number in the db
+        self._bulk_rpc("insert_allocations", "p_allocations", data)
+
+    def load_batch(
+        self, records: List[Record], allocations: List[Allocation]
+    ) -> Tuple[int, int]:
+        self._bulk_check_data(records)
+        # one rpc (and transaction) per batch, not chunked by db_bulk_size
+        response = self.client.rpc(
+            "load_nca_batch",
+            {
+                "p_records": [record.model_dump() for record in records],
+                "p_allocations": [
+                    allocation.model_dump() for allocation in allocations
+                ],
+            },
+        ).execute()
+        row = response.data[0]  # pyright: ignore
+        return row["record_count"], row["allocation_count"]
+
+    def stage_batch(
+        self,
+        release: Release,
+        page_nums: List[int],
+        records: List[Record],
+        allocations: List[Allocation],
+    ) -> Tuple[int, int, bool]:
+        # pages without records are staged too, they count towards the swap
+        response = self.client.rpc(
+            "stage_nca_batch",
+            {
+                "p_release_id": release.id,
+                "p_page_count": release.page_count,
+                "p_page_nums": page_nums,
+                "p_records": [record.model_dump() for record in records],
+                "p_allocations": [
+                    allocation.model_dump() for allocation in allocations
+                ],
+            },
+        ).execute()
+        row = response.data[0]  # pyright: ignore
+        return row["record_count"], row["allocation_count"], row["is_complete"]
+
+    def complete_staged_release(self, release: Release) -> bool:
+        response = self.client.rpc(
+            "complete_staged_release",
+            {"p_release_id": release.id, "p_page_count": release.page_count},
+        ).execute()
+        return response.data[0]["is_swapped"]  # pyright: ignore
+
+    def clear_staged_release(self, id: str) -> None:
+        self.client.rpc("clear_staged_release", {"p_release_id": id}).execute()
+
+    def claim_spool_merge(
+        self, release_id: str, owner: str, lease_duration_s: float
+    ) -> bool:
+        response = self.client.rpc(
+            "claim_spool_merge",
+            {
+                "p_release_id": release_id,
+                "p_owner": owner,
+                "p_lease_seconds": int(lease_duration_s),
+            },
+        ).execute()
+        return bool(response.data)
+
+    def end_spool_merge(self, release_id: str, owner: str) -> None:
+        self.client.rpc(
+            "end_spool_merge", {"p_release_id": release_id, "p_owner": owner}
+        ).execute()
+
+    def fold_summaries(self) -> Tuple[int, int, int]:
+        response = self.client.rpc("fold_summaries", {}).execute()
+        row = response.data[0]  # pyright: ignore
+        return row["department_count"], row["agency_count"], row["month_count"]
+
+    def rebuild_summaries(self) -> Tuple[int, int, int]:
+        response = self.client.rpc("rebuild_summaries", {}).execute()
+        row = response.data[0]  # pyright: ignore
+        return row["department_count"], row["agency_count"], row["month_count"]
+
+    def search_records(
+        self, query: str, limit: int, offset: int = 0, year: int | None = None
+    ) -> List[RecordSearchResult]:
+        response = self.client.rpc(
+            "search_records",
+            {
+                "p_query": query,
+                "p_limit": limit,
+                "p_offset": offset,
+                "p_year": year,
+            },
+        ).execute()
+        return [RecordSearchResult(**row) for row in response.data]  # pyright: ignore
+
+    def _get_release_year(self, release_id: str) -> int:
+        if release_id not in self._release_years:
+            release = self.get_release(release_id)
+            if not release:
+                raise ValueError(f"No release found for {release_id}.")
+            self._release_years[release_id] = release.year
+        return self._release_years[release_id]
 
     def _bulk_check_data(self, data):
         if len(data) == 0:
@@ -64,8 +176,8 @@ class SupabaseRepository(RepositoryProvider):
             self.client.table(table_name).upsert(
                 bulk, on_conflict=on_conflict).execute()
 
-    def _bulk_insert(self, table_name: str, data: List[Dict]):
+    def _bulk_rpc(self, function_name: str, param: str, data: List[Dict]):
         total = len(data)
         for i in range(0, total, self.db_bulk_size):
             bulk = data[i: i + self.db_bulk_size]
-            self.client.table(table_name).insert(bulk).execute()
+            self.client.rpc(function_name, {param: bulk}).execute()
@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import List
+from supabase import create_client
+
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.entities.work_lease import WorkLease
+from src.core.interfaces.work_lease import WorkLeaseProvider
+from src.infrastructure.config import settings
+
+
+class SupabaseWorkLease(WorkLeaseProvider):
+    """
+    claiming/renewing goes through the claim_work_lease and
+    renew_work_lease functions (supabase_schema.sql) so the
+    SELECT ... FOR UPDATE SKIP LOCKED and now() run server-side
+    """
+
+    def __init__(self, db_bulk_size: int, max_attempts: int):
+        self.client = create_client(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_ANON_KEY
+        )
+        self.db_bulk_size = db_bulk_size
+        self.max_attempts = max_attempts
+
+    def add_batches(self, batches: List[ReleaseBatch]) -> None:
+        data = [
+            {
+                "id": self._get_lease_id(batch),
+                "release_id": batch.release.id,
+                "start_page_num": batch.start_page_num,
+                "batch": batch.model_dump(mode="json"),
+                "status": "pending",
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "attempts": 0,
+            }
+            for batch in batches
+        ]
+        for i in range(0, len(data), self.db_bulk_size):
+            bulk = data[i: i + self.db_bulk_size]
+            self.client.table("work_lease").upsert(
+                bulk, on_conflict="id").execute()
+
+    def claim(self, worker_id: str, lease_duration_s: float) -> WorkLease | None:
+        response = self.client.rpc(
+            "claim_work_lease",
+            {
+                "p_worker_id": worker_id,
+                "p_lease_seconds": int(lease_duration_s),
+                "p_max_attempts": self.max_attempts,
+            },
+        ).execute()
+        if not response.data:
+            return None
+
+        row = response.data[0]  # pyright: ignore
+        return WorkLease(
+            id=row["id"],
+            batch=ReleaseBatch(**row["batch"]),
+            worker_id=worker_id,
+            expires_at=self._to_epoch(row["lease_expires_at"]),
+            attempts=row["attempts"],
+        )
+
+    def renew(self, lease: WorkLease, lease_duration_s: float) -> bool:
+        response = self.client.rpc(
+            "renew_work_lease",
+            {
+                "p_id": lease.id,
+                "p_worker_id": lease.worker_id,
+                "p_lease_seconds": int(lease_duration_s),
+            },
+        ).execute()
+        if not response.data:
+            return False
+        lease.expires_at = self._to_epoch(response.data)  # pyright: ignore
+        return True
+
+    def complete(self, lease: WorkLease) -> bool:
+        response = self.client.table("work_lease").update(
+            {"status": "done", "lease_expires_at": None}
+        ).eq("id", lease.id).eq("lease_owner", lease.worker_id).eq(
+            "status", "leased").execute()
+        return len(response.data) == 1
+
+    def release(self, lease: WorkLease) -> bool:
+        # pending while attempts are left, failed once they are used up
+        response = self._update_owned(lease, "pending").lt(
+            "attempts", self.max_attempts).execute()
+        if response.data:
+            return True
+        response = self._update_owned(lease, "failed").gte(
+            "attempts", self.max_attempts).execute()
+        return len(response.data) == 1
+
+    def count_remaining(self) -> int:
+        response = self.client.table("work_lease").select(
+            "id", count="exact"  # pyright: ignore
+        ).in_("status", ["pending", "leased"]).limit(1).execute()
+        return response.count or 0
+
+    def _update_owned(self, lease: WorkLease, status: str):
+        return self.client.table("work_lease").update(
+            {"status": status, "lease_owner": None, "lease_expires_at": None}
+        ).eq("id", lease.id).eq("lease_owner", lease.worker_id).eq(
+            "status", "leased")
+
+    def _get_lease_id(self, batch: ReleaseBatch) -> str:
+        return f"{batch.release.id}:{batch.start_page_num}-{batch.end_page_num}"
+
+    def _to_epoch(self, timestamp: str) -> float:
+        return datetime.fromisoformat(timestamp).timestamp()
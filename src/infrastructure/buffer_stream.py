@@ -0,0 +1,68 @@
+import io
+from typing import BinaryIO
+
+from src.core.interfaces.storage import FileData
+
+# zero-copy views and streams over file data: a loaded (mmap-backed) file is
+# shared by every page read instead of being copied into a BytesIO per page
+
+
+class BufferStream(io.RawIOBase):
+    """read-only seekable stream with its own position over a shared buffer"""
+
+    def __init__(self, buffer: memoryview):
+        self._buffer = buffer.cast("B") if buffer.format != "B" else buffer
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def read(self, size: int | None = -1) -> bytes:
+        end = len(self._buffer) if size is None or size < 0 else self._pos + size
+        chunk = bytes(self._buffer[self._pos : end])
+        self._pos += len(chunk)
+        return chunk
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, b) -> int:
+        chunk = self._buffer[self._pos : self._pos + len(b)]
+        n = len(chunk)
+        memoryview(b).cast("B")[:n] = chunk
+        self._pos += n
+        return n
+
+
+def as_stream(data: FileData) -> BinaryIO:
+    """a fresh stream over the data, without copying bytes-like data"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return BufferStream(memoryview(data))  # pyright: ignore
+    data.seek(0)
+    return data
+
+
+def as_buffer(data: FileData) -> memoryview:
+    """a view of the data, copied only for streams that are not in memory"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return memoryview(data)
+    if isinstance(data, io.BytesIO):
+        return data.getbuffer()
+    data.seek(0)
+    return memoryview(data.read())
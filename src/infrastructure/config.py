@@ -16,6 +16,42 @@ class Settings(BaseSettings):
 
     AWS_LAMBDA_FUNCTION_NAME: Optional[str] = None
 
+    # overlap extraction, cleaning and db loading inside a worker invocation
+    WORKER_PIPELINE_MODE: bool = False
+
+    # reload changed releases through staging tables, swapped in atomically
+    # once every page is staged (instead of deleting the release first)
+    STAGED_RELOAD: bool = False
+
+    # workers spool cleaned batches to storage, merged into the db per
+    # release in a few large transactions once every page is spooled
+    SPOOL_MODE: bool = False
+
+    # cache the raw extracted page tables in storage, a cleaner change is then
+    # re-cleaned from the cache (src/reclean.py) instead of re-parsing pdfs
+    RAW_CACHE_ENABLED: bool = False
+
+    # also write cleaned batches as parquet (partitioned by year and release)
+    # to storage for analytical reads off the db (src/query_exports.py)
+    PARQUET_EXPORT: bool = False
+
+    # record/allocation partitioned by release year (after the migration in
+    # migrations/002_partition_by_release_year.sql)
+    DB_PARTITIONED: bool = False
+
+    # lease workers' chunk table: "sqlite" (a local file, workers on one
+    # machine) or "supabase" (public.work_lease, workers on any machine)
+    WORK_LEASE_BACKEND: str = "sqlite"
+
+    # run the handlers off aws: sqlite-backed queues and local file storage
+    LOCAL_QUEUE_DB_PATH: Optional[str] = None
+
+    # local stage metrics file: "prometheus" (textfile) or "json"
+    METRICS_FORMAT: str = "prometheus"
+
+    # fraction of invocations profiled with cprofile + tracemalloc (0 = off)
+    PROFILE_SAMPLE_RATE: float = 0.0
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
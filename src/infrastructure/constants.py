@@ -8,6 +8,68 @@ BASE_STORAGE_PATH = ""
 
 BATCH_SIZE = 10
 
+# adaptive batching (cost-weighted page ranges)
+BATCH_TARGET_DURATION_S = 120
+AVG_PAGE_DURATION_S = 8
+MAX_BATCH_SIZE = 30
+
+# worker
+# stop taking new pages once the remaining lambda time drops below this margin
+# (plus the average page duration) so finished pages can still be loaded
+WORKER_DEADLINE_MARGIN_MS = 60_000
+
+# cross-page stitching
+# pages read past a batch to close its trailing open nca group
+STITCH_LOOKAHEAD_PAGES = 3
+
+# pipelined worker (extract/clean -> stitch -> load)
+PIPELINE_CHUNK_PAGES = 2
+PIPELINE_QUEUE_SIZE = 2
+
+# work leases (dynamic work claiming)
+LEASE_CHUNK_SIZE = 2
+LEASE_DURATION_S = 120
+LEASE_MAX_ATTEMPTS = 2
+# idle workers wait for other workers' leases to complete or expire
+LEASE_POLL_INTERVAL_S = 5
+LOCAL_WORK_LEASE_DB_PATH = "work_leases.db"
+
+# local queues (sqlite stand-in for sqs)
+LOCAL_QUEUE_DB_PATH = "local_queues.db"
+LOCAL_QUEUE_POLL_INTERVAL_S = 0.5
+LOCAL_QUEUE_IDLE_TIMEOUT_S = 10
+
+# stage metrics
+METRICS_NAMESPACE = "DbmNcaPh"
+LOCAL_METRICS_DIR = "metrics"
+
+# trace spans
+LOCAL_TRACES_DIR = "traces"
+TRACE_REPORT_TOP = 10
+
+# profiling (storage key: profiles/<run id>/<function>-<request id>.prof)
+PROFILE_STORAGE_PREFIX = "profiles"
+PROFILE_TOP_FUNCTIONS = 40
+PROFILE_TOP_ALLOCATIONS = 25
+
+# cold start: cumulative import time of each entry point (python -X importtime),
+# adapters are imported and built on first use so they are not counted
+COLD_START_IMPORT_BUDGETS_MS = {
+    "handlers.scraper": 300,
+    "handlers.orchestrator": 300,
+    "handlers.worker": 300,
+    "handlers.teardown": 50,
+    "src.main": 300,
+}
+IMPORT_REPORT_REPEAT = 3
+IMPORT_REPORT_TOP = 5
+
+# benchmarks
+BENCHMARK_PAGES = 30
+BENCHMARK_REPEAT = 3
+BENCHMARK_REGRESSION_THRESHOLD = 0.10
+BENCHMARK_RESULTS_PATH = "benchmark_results.json"
+
 # table
 VERT_LINES = [
     19.439992224,
@@ -55,6 +117,39 @@ ALLOCATION_COLUMNS = ["nca_number", "agency", "operating_unit", "amount"]
 # database
 DB_BULK_SIZE = 500
 
+# spool mode: cleaned batches are written under this prefix (gzipped ndjson,
+# one file per page range) and merged into the db in transactions of up to
+# SPOOL_LOAD_ROWS records + allocations
+SPOOL_STORAGE_PREFIX = "spool"
+SPOOL_LOAD_ROWS = 20000
+# a merge is leased per release so only one loader runs it, for as long as
+# an invocation can last; it starts with SPOOL_MERGE_MIN_REMAINING_MS of the
+# invocation left, otherwise (or when it fails) it is queued again, up to
+# SPOOL_MERGE_MAX_ATTEMPTS times
+SPOOL_MERGE_LEASE_S = 300
+SPOOL_MERGE_MIN_REMAINING_MS = 120_000
+SPOOL_MERGE_MAX_ATTEMPTS = 3
+
+# parquet export: cleaned batches are written under this prefix as
+# <table>/year=<year>/release_id=<id>/<first page>-<last page>.parquet
+EXPORT_STORAGE_PREFIX = "exports"
+# groups listed by src/query_exports.py
+EXPORT_QUERY_TOP = 20
+
+# raw table cache: extracted page tables are cached under this prefix, keyed
+# by the release file's content hash, the parser version and the page
+RAW_CACHE_STORAGE_PREFIX = "raw_cache"
+# bump when the pdf table settings change (a new raw cache namespace)
+PDF_PARSER_VERSION = 2
+
+# re-clean: cached pages read/cleaned concurrently, staged in calls of up to
+# RECLEAN_LOAD_ROWS records + allocations
+RECLEAN_WORKERS = 16
+RECLEAN_LOAD_ROWS = 20000
+
+# s3 writer streams stay in memory up to this size, then spill to /tmp
+S3_WRITER_SPOOL_BYTES = 8 * 1024 * 1024
+
 # --------------
 # AWS
 # --------------
@@ -64,11 +159,20 @@ DLQ_NAME = "dbm-nca-ph-failed-queues"
 RELEASE_QUEUE_NAME = "dbm-nca-ph-release-queue"
 RELEASE_BATCH_QUEUE_NAME = "dbm-nca-ph-release-batch-queue"
 
+# sqs attributes (receives before a message is moved to the dlq)
+QUEUE_VISIBILITY_TIMEOUT_S = 600
+QUEUE_MAX_RECEIVE_COUNT = 1
+
+# lambda event source batch sizes (messages per invocation)
+ORCHESTRATOR_QUEUE_BATCH_SIZE = 10
+WORKER_QUEUE_BATCH_SIZE = 1
+
 # lamda
 SCRAPER_FUNCTION_NAME = "dbmScraper"
 ORCHESTRATOR_FUNCTION_NAME = "dbmOrchestrator"
 WORKER_FUNCTION_NAME = "dbmWorker"
 TEARDOWN_FUNCTION_NAME = "dbmTeardown"
+LAMBDA_TIMEOUT_S = 300
 
 # sns topic names
 # RELEASE_SNS_TOPIC_NAME = f"{RELEASE_QUEUE_NAME}-idle-topic"
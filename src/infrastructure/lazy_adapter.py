@@ -0,0 +1,36 @@
+import threading
+from typing import Any, Callable, TypeVar, cast
+
+T = TypeVar("T")
+
+
+class LazyAdapter:
+    """
+    stands in for an adapter and builds it on first attribute access, the
+    factory imports the adapter module so its dependencies (pandas,
+    pdfplumber, supabase, boto3) are only loaded by the paths that use them
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._adapter = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._adapter is None:
+            # the worker pipeline mode touches adapters from several threads
+            with self._lock:
+                if self._adapter is None:
+                    self._adapter = self._factory()
+        return self._adapter
+
+    def is_built(self) -> bool:
+        return self._adapter is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+def lazy(factory: Callable[[], T]) -> T:
+    """typed as the adapter so it can be passed to the use cases as is"""
+    return cast(T, LazyAdapter(factory))
@@ -0,0 +1,13 @@
+from typing import Dict
+
+# helpers for the sqs event a lambda receives, kept free of boto3 so the
+# handlers don't import it just to read a message
+
+
+def get_message_attributes(record: dict) -> Dict[str, str]:
+    """string message attributes of an sqs event record"""
+    return {
+        name: attribute["stringValue"]
+        for name, attribute in (record.get("messageAttributes") or {}).items()
+        if "stringValue" in attribute
+    }
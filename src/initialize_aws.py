@@ -8,7 +8,11 @@ from botocore.exceptions import ClientError
 from src.infrastructure.config import settings
 from src.infrastructure.constants import (
     DLQ_NAME,
+    LAMBDA_TIMEOUT_S,
     ORCHESTRATOR_FUNCTION_NAME,
+    ORCHESTRATOR_QUEUE_BATCH_SIZE,
+    QUEUE_MAX_RECEIVE_COUNT,
+    QUEUE_VISIBILITY_TIMEOUT_S,
     RELEASE_BATCH_ALARM_NAME,
     RELEASE_BATCH_QUEUE_NAME,
     RELEASE_BATCH_SNS_TOPIC_NAME,
@@ -16,6 +20,7 @@ from src.infrastructure.constants import (
     SCRAPER_FUNCTION_NAME,
     TEARDOWN_FUNCTION_NAME,
     WORKER_FUNCTION_NAME,
+    WORKER_QUEUE_BATCH_SIZE,
 )
 from src.logging_config import setup_logging
 
@@ -88,7 +93,7 @@ def main():
             function_name=ORCHESTRATOR_FUNCTION_NAME,
             role_arn=lambda_role_info["arn"],
             queue_arn=release_queue_info.get("arn", None),
-            queue_batch_size=10,
+            queue_batch_size=ORCHESTRATOR_QUEUE_BATCH_SIZE,
             max_cuncurrent_executions=40,
         )
 
@@ -98,7 +103,7 @@ def main():
             function_name=WORKER_FUNCTION_NAME,
             role_arn=lambda_role_info["arn"],
             queue_arn=release_batch_queue_info.get("arn", None),
-            queue_batch_size=1,
+            queue_batch_size=WORKER_QUEUE_BATCH_SIZE,
             max_cuncurrent_executions=40,
         )
 
@@ -208,13 +213,16 @@ def get_queue(queue_name: str, quiet: bool = False) -> dict | None:
 def create_queue(queue_name: str, dlq_arn: str | None = None) -> dict | None:
     sqs = boto3.client("sqs")
     attributes = {
-        "VisibilityTimeout": "600",
+        "VisibilityTimeout": str(QUEUE_VISIBILITY_TIMEOUT_S),
         "MessageRetentionPeriod": "86400",
         "DelaySeconds": "0",
         "ReceiveMessageWaitTimeSeconds": "20",
     }
     if dlq_arn:
-        redrive_policy = {"maxReceiveCount": "1", "deadLetterTargetArn": dlq_arn}
+        redrive_policy = {
+            "maxReceiveCount": str(QUEUE_MAX_RECEIVE_COUNT),
+            "deadLetterTargetArn": dlq_arn,
+        }
         attributes["RedrivePolicy"] = json.dumps(redrive_policy)
 
     try:
@@ -334,7 +342,7 @@ def create_lambda_function(
             FunctionName=function_name,
             Runtime="python3.14",
             Role=role_arn,
-            Timeout=300,
+            Timeout=LAMBDA_TIMEOUT_S,
             MemorySize=512,
             Code={"ZipFile": zipped_code},
             Handler="lambda_function.lambda_handler",
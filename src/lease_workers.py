@@ -0,0 +1,272 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from datetime import timedelta
+from typing import Callable
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.work_lease import WorkLease
+from src.core.interfaces.work_lease import WorkLeaseProvider
+from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.nca_db_loader import NCADBLoader
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+from src.core.use_cases.release_batcher import ReleaseBatcher
+from src.core.use_cases.releases_scraper import ReleasesScraper
+from src.core.use_cases.work_lease_claimer import WorkLeaseClaimer
+from src.core.use_cases.work_lease_completer import WorkLeaseCompleter
+from src.core.use_cases.work_lease_releaser import WorkLeaseReleaser
+from src.core.use_cases.work_lease_renewer import WorkLeaseRenewer
+from src.core.use_cases.work_lease_seeder import WorkLeaseSeeder
+from src.infrastructure.adapter_factory import create_work_lease
+from src.infrastructure.adapters.bs4_scraper import Bs4Scraper
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.infrastructure.adapters.supabase_repository import SupabaseRepository
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    BASE_STORAGE_PATH,
+    DB_BULK_SIZE,
+    LEASE_CHUNK_SIZE,
+    LEASE_DURATION_S,
+    LEASE_POLL_INTERVAL_S,
+    LOCAL_WORK_LEASE_DB_PATH,
+    RECORD_COLUMNS,
+    STITCH_LOOKAHEAD_PAGES,
+    VALID_COLUMNS,
+)
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def seed(db_path: str) -> None:
+    """scrape new/updated releases and split them into small claimable chunks"""
+    storage = LocalStorage(base_storage_path=BASE_STORAGE_PATH)
+    parser = PDFParser()
+    repository = SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
+    work_lease = create_work_lease(db_path)
+
+    scraper_job = ReleasesScraper(
+        scraper=Bs4Scraper(),
+        parser=parser,
+        storage=storage,
+        repository=repository,
+    )
+    chunker_job = ReleaseBatcher(batch_size=LEASE_CHUNK_SIZE)
+    seeder_job = WorkLeaseSeeder(work_lease=work_lease)
+
+    logger.info("Starting Scraping Job...")
+    releases = scraper_job.run(oldest_release_year=2024)
+    logger.info("Scraper Job completed successfully.")
+
+    for release in releases:
+        chunks = chunker_job.run(release)
+        seeder_job.run(chunks)
+
+
+def run_worker(worker_id: str, db_path: str) -> None:
+    """claim chunks until none are left, renewing the lease between pages"""
+    # adapters are built per process (sqlite/http clients must not be forked)
+    storage = LocalStorage(base_storage_path=BASE_STORAGE_PATH)
+    parser = PDFParser()
+    data_cleaner = PdDataCleaner(
+        allocation_comumns=ALLOCATION_COLUMNS,
+        record_columns=RECORD_COLUMNS,
+        valid_columns=VALID_COLUMNS,
+    )
+    repository = SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
+    work_lease = create_work_lease(db_path)
+
+    file_bytes_loader_job = FileBytesMemoLoader(storage=storage)
+    extractor_job = RawTableExtractor(storage=storage, parser=parser)
+    page_cleaner_job = PageTableCleaner(data_cleaner=data_cleaner)
+    continuation_reader_job = PageContinuationReader(
+        extractor=extractor_job,
+        page_cleaner=page_cleaner_job,
+        max_lookahead_pages=STITCH_LOOKAHEAD_PAGES,
+    )
+    stitcher_job = PageStitcher(data_cleaner=data_cleaner)
+    db_loader_job = NCADBLoader(data_cleaner=data_cleaner, repository=repository)
+    claimer_job = WorkLeaseClaimer(
+        work_lease=work_lease, lease_duration_s=LEASE_DURATION_S
+    )
+    renewer_job = WorkLeaseRenewer(
+        work_lease=work_lease, lease_duration_s=LEASE_DURATION_S
+    )
+    completer_job = WorkLeaseCompleter(work_lease=work_lease)
+    releaser_job = WorkLeaseReleaser(work_lease=work_lease)
+
+    drain_leases(
+        worker_id,
+        work_lease,
+        claimer_job,
+        completer_job,
+        releaser_job,
+        lambda lease: process_lease(
+            lease,
+            file_bytes_loader_job,
+            extractor_job,
+            page_cleaner_job,
+            continuation_reader_job,
+            stitcher_job,
+            db_loader_job,
+            renewer_job,
+        ),
+        LEASE_POLL_INTERVAL_S,
+    )
+
+
+def drain_leases(
+    worker_id: str,
+    work_lease: WorkLeaseProvider,
+    claimer_job: WorkLeaseClaimer,
+    completer_job: WorkLeaseCompleter,
+    releaser_job: WorkLeaseReleaser,
+    process: Callable[[WorkLease], bool],
+    poll_interval_s: float,
+) -> int:
+    """
+    claim and process chunks until none are pending or leased: while other
+    workers still hold leases, poll, since a lease of a crashed worker
+    expires and can be claimed. a chunk that fails is released for another
+    attempt (or failed once its attempts are used up), returns the number
+    of chunks this worker completed
+    """
+    chunk_count = 0
+    while True:
+        lease = claimer_job.run(worker_id)
+        if not lease:
+            if work_lease.count_remaining() == 0:
+                break
+            time.sleep(poll_interval_s)
+            continue
+
+        try:
+            is_processed = process(lease)
+        except Exception as e:
+            logger.error(
+                f"{worker_id} failed to process lease {lease.id}: {e}",
+                exc_info=True,
+            )
+            is_processed = False
+
+        if not is_processed:
+            releaser_job.run(lease)
+        elif completer_job.run(lease):
+            chunk_count += 1
+
+    logger.info(f"{worker_id} finished: {chunk_count} chunks completed")
+    return chunk_count
+
+
+def process_lease(
+    lease: WorkLease,
+    file_bytes_loader_job: FileBytesMemoLoader,
+    extractor_job: RawTableExtractor,
+    page_cleaner_job: PageTableCleaner,
+    continuation_reader_job: PageContinuationReader,
+    stitcher_job: PageStitcher,
+    db_loader_job: NCADBLoader,
+    renewer_job: WorkLeaseRenewer,
+) -> bool:
+    batch = lease.batch
+    file_bytes = file_bytes_loader_job.run(batch.release.filename)
+    if not file_bytes:
+        return False
+
+    pages = []
+    for i in range(batch.start_page_num, batch.end_page_num + 1):
+        # a lost lease means another worker took over the chunk
+        if not renewer_job.run(lease):
+            return False
+
+        table = extractor_job.run(file_bytes, i)
+        if not table:
+            logger.warning(
+                f"No tables extracted for {batch.release.filename} page-{i}"
+            )
+            continue
+        pages.append(page_cleaner_job.run(table, batch.release.id, i))
+
+    page_nums = list(range(batch.start_page_num, batch.end_page_num + 1))
+    if not pages:
+        logger.warning(
+            f"No tables extracted for {batch.release.filename} "
+            f"pages {batch.start_page_num}-{batch.end_page_num}"
+        )
+        if batch.release.reload:
+            # the pages still count towards the staged reload
+            db_loader_job.run(
+                batch.release,
+                NCAData(records=[], allocations=[]),
+                batch.batch_num,
+                page_nums,
+            )
+        return True
+
+    if not renewer_job.run(lease):
+        return False
+
+    # small chunks split nca groups often, so close the trailing one here
+    pages.extend(
+        continuation_reader_job.run(file_bytes, batch.release, batch.end_page_num)
+    )
+    nca_data = stitcher_job.run(pages, batch.release.id)
+    db_loader_job.run(batch.release, nca_data, batch.batch_num, page_nums)
+    return True
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Drain leasable page chunks with several local worker processes"
+    )
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument(
+        "--db-path",
+        default=LOCAL_WORK_LEASE_DB_PATH,
+        help="sqlite lease table (WORK_LEASE_BACKEND=sqlite)",
+    )
+    arg_parser.add_argument(
+        "--skip-seed",
+        action="store_true",
+        help="only drain chunks already in the lease table",
+    )
+    args = arg_parser.parse_args()
+
+    start_time = time.monotonic()
+    try:
+        if not args.skip_seed:
+            seed(args.db_path)
+
+        processes = [
+            multiprocessing.Process(
+                target=run_worker, args=(f"worker-{i}", args.db_path)
+            )
+            for i in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        work_lease = create_work_lease(args.db_path)
+        logger.info(f"Remaining chunks: {work_lease.count_remaining()}")
+
+    except Exception as e:
+        logger.critical(f"Lease workers crashed: {e}", exc_info=True)
+        sys.exit(1)
+
+    elapsed_time = timedelta(seconds=time.monotonic() - start_time)
+    logger.info(f"Total elapsed time: {elapsed_time}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import logging
+import sys
+
+from src.core.use_cases.spool_loader import SpoolLoader
+from src.infrastructure.adapter_factory import create_repository, create_storage
+from src.infrastructure.constants import (
+    SPOOL_LOAD_ROWS,
+    SPOOL_MERGE_LEASE_S,
+    SPOOL_STORAGE_PREFIX,
+)
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Merge a release's spooled batches (SPOOL_MODE) into the db"
+    )
+    arg_parser.add_argument("release_id", help="e.g. id_2024")
+    arg_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="load what is spooled even when pages are missing",
+    )
+    args = arg_parser.parse_args()
+
+    # the page count and reload flag come from the spool's manifest
+    spool_loader_job = SpoolLoader(
+        storage=create_storage(),
+        repository=create_repository(),
+        storage_prefix=SPOOL_STORAGE_PREFIX,
+        load_rows=SPOOL_LOAD_ROWS,
+        lease_duration_s=SPOOL_MERGE_LEASE_S,
+    )
+    if not spool_loader_job.run(args.release_id, force=args.force):
+        logger.error(f"Spooled batches of {args.release_id} were not loaded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+import argparse
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from datetime import timedelta
+from typing import Dict, List
+
+from src.core.entities.queue_message import QueueMessage
+from src.infrastructure.constants import (
+    DLQ_NAME,
+    LAMBDA_TIMEOUT_S,
+    LOCAL_QUEUE_DB_PATH,
+    LOCAL_QUEUE_IDLE_TIMEOUT_S,
+    LOCAL_QUEUE_POLL_INTERVAL_S,
+    ORCHESTRATOR_QUEUE_BATCH_SIZE,
+    QUEUE_MAX_RECEIVE_COUNT,
+    QUEUE_VISIBILITY_TIMEOUT_S,
+    WORKER_QUEUE_BATCH_SIZE,
+)
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class LocalLambdaContext:
+    """the parts of the lambda context object the handlers use"""
+
+    def __init__(self, function_name: str, timeout_s: float):
+        self.function_name = function_name
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.monotonic() + timeout_s
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def to_sqs_event(messages: List[QueueMessage]) -> dict:
+    return {
+        "Records": [
+            {
+                "messageId": message.message_id,
+                "receiptHandle": message.receipt_handle,
+                "body": message.body,
+                "attributes": {
+                    "ApproximateReceiveCount": str(message.receive_count),
+                    "SentTimestamp": str(int(message.sent_at * 1000)),
+                },
+                "messageAttributes": {
+                    name: {"stringValue": value, "dataType": "String"}
+                    for name, value in message.attributes.items()
+                },
+                "eventSource": "aws:sqs",
+            }
+            for message in messages
+        ]
+    }
+
+
+# ---------------------
+# consumers
+# ---------------------
+
+
+def run_consumer(
+    consumer_id: str,
+    handler_name: str,
+    queue_name: str,
+    batch_size: int,
+    db_path: str,
+    visibility_timeout_s: float,
+    max_receive_count: int,
+    idle_timeout_s: float,
+    watched_queue_names: List[str],
+    results: multiprocessing.Queue,
+) -> None:
+    """
+    poll the queue and invoke the handler like an sqs event source mapping:
+    a batch is deleted only when the handler returns, otherwise it becomes
+    visible again after the visibility timeout (and ends up in the dlq)
+    """
+    from src.infrastructure.adapters.sqlite_queue import SQLiteQueue
+
+    # handlers build their adapters at import, one set per consumer process
+    handler = importlib.import_module(f"handlers.{handler_name}")
+    queue = SQLiteQueue(
+        db_path=db_path,
+        queue_name=queue_name,
+        visibility_timeout_s=visibility_timeout_s,
+        max_receive_count=max_receive_count,
+        dlq_name=DLQ_NAME,
+    )
+    stats = {
+        "handler": handler_name,
+        "invocations": 0,
+        "failed_invocations": 0,
+        "messages": 0,
+        "redeliveries": 0,
+    }
+
+    idle_since = time.monotonic()
+    while True:
+        messages = queue.receive(max_messages=batch_size)
+        if not messages:
+            # stop once every pipeline queue is drained (in-flight included)
+            if any(queue.count(name) for name in watched_queue_names):
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since >= idle_timeout_s:
+                break
+            time.sleep(LOCAL_QUEUE_POLL_INTERVAL_S)
+            continue
+
+        stats["invocations"] += 1
+        stats["messages"] += len(messages)
+        stats["redeliveries"] += sum(1 for m in messages if m.receive_count > 1)
+        try:
+            handler.lambda_handler(
+                to_sqs_event(messages),
+                LocalLambdaContext(handler_name, LAMBDA_TIMEOUT_S),
+            )
+            queue.delete_batch([m.receipt_handle for m in messages])
+
+        except Exception as e:
+            stats["failed_invocations"] += 1
+            logger.error(
+                f"{consumer_id} {handler_name} invocation failed, "
+                f"{len(messages)} messages will be redelivered: {e}",
+                exc_info=True,
+            )
+        idle_since = time.monotonic()
+
+    logger.info(
+        f"{consumer_id} finished: {stats['invocations']} invocations, "
+        f"{stats['messages']} messages"
+    )
+    results.put(stats)
+
+
+# ---------------------
+# seeding
+# ---------------------
+
+
+def scrape() -> None:
+    """run the real scraper handler once (fills the release queue)"""
+    handler = importlib.import_module("handlers.scraper")
+    handler.lambda_handler({}, LocalLambdaContext("scraper", LAMBDA_TIMEOUT_S))
+
+
+def seed_pdf(pdf_path: str, year: int) -> None:
+    """register a local pdf as a release and queue it without scraping"""
+    from io import BytesIO
+
+    from src.core.entities.release import Release
+    from src.core.use_cases.message_queuer import MessageQueuer
+    from src.core.use_cases.span_tracer import SpanTracer
+    from src.infrastructure.adapter_factory import (
+        create_queue,
+        create_span_recorder,
+        create_storage,
+    )
+    from src.infrastructure.adapters.pdf_parser import PDFParser
+    from src.infrastructure.adapters.supabase_repository import SupabaseRepository
+    from src.infrastructure.config import settings
+    from src.infrastructure.constants import DB_BULK_SIZE
+
+    storage = create_storage()
+    parser = PDFParser()
+    repository = SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
+    queuer_job = MessageQueuer(
+        queue=create_queue(queue_url=settings.AWS_SQS_RELEASE_QUEUE_URL)
+    )
+    tracer = SpanTracer(recorder=create_span_recorder("seed"), function_name="seed")
+
+    with open(pdf_path, "rb") as f:
+        data = BytesIO(f.read())
+    filename = os.path.basename(pdf_path)
+    metadata = parser.get_metadata_by_data(data)
+    release = Release(
+        id=f"id_{year}",
+        title=filename,
+        url=pdf_path,
+        filename=filename,
+        year=year,
+        page_count=parser.get_page_count(data),
+        file_meta_created_at=metadata.created_at if metadata else "",
+        file_meta_modified_at=metadata.modified_at if metadata else "",
+    )
+
+    # stands in for the scraper span of the trace
+    trace = tracer.start_trace()
+    with tracer.span(trace, "scrape", release_id=release.id):
+        storage.save_file(release.filename, data)
+        repository.upsert_release(release)
+        queuer_job.run(release, trace)
+    logger.info(
+        f"Seeded {release.filename} ({release.page_count} pages), "
+        f"trace {trace.trace_id}"
+    )
+
+
+# ---------------------
+# runner
+# ---------------------
+
+
+def log_summary(stats_list: List[Dict], db_path: str, elapsed_s: float) -> None:
+    from src.infrastructure.adapters.sqlite_queue import SQLiteQueue
+
+    elapsed_s = max(elapsed_s, 1e-9)
+    for handler_name in sorted({stats["handler"] for stats in stats_list}):
+        handler_stats = [s for s in stats_list if s["handler"] == handler_name]
+        messages = sum(s["messages"] for s in handler_stats)
+        logger.info(
+            f"{handler_name}: {len(handler_stats)} consumers, "
+            f"{sum(s['invocations'] for s in handler_stats)} invocations "
+            f"({sum(s['failed_invocations'] for s in handler_stats)} failed), "
+            f"{messages} messages "
+            f"({sum(s['redeliveries'] for s in handler_stats)} redelivered), "
+            f"{messages / elapsed_s:.2f} messages/s"
+        )
+
+    dlq = SQLiteQueue(
+        db_path=db_path,
+        queue_name=DLQ_NAME,
+        visibility_timeout_s=QUEUE_VISIBILITY_TIMEOUT_S,
+        max_receive_count=QUEUE_MAX_RECEIVE_COUNT,
+    )
+    logger.info(f"Dead-lettered messages in {DLQ_NAME}: {dlq.count()}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=(
+            "Drive the lambda handlers from local sqlite queues "
+            "(scraper -> orchestrator -> worker)"
+        )
+    )
+    arg_parser.add_argument("--db-path", default=LOCAL_QUEUE_DB_PATH)
+    arg_parser.add_argument("--orchestrators", type=int, default=1)
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument(
+        "--visibility-timeout", type=float, default=QUEUE_VISIBILITY_TIMEOUT_S
+    )
+    arg_parser.add_argument(
+        "--max-receive-count", type=int, default=QUEUE_MAX_RECEIVE_COUNT
+    )
+    arg_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=LOCAL_QUEUE_IDLE_TIMEOUT_S,
+        help="stop consumers after the queues have been empty this long",
+    )
+    seed_group = arg_parser.add_mutually_exclusive_group()
+    seed_group.add_argument(
+        "--scrape", action="store_true", help="run the scraper handler first"
+    )
+    seed_group.add_argument("--seed-pdf", help="queue a local pdf as a release")
+    arg_parser.add_argument("--year", type=int, default=time.localtime().tm_year)
+    args = arg_parser.parse_args()
+
+    # must be set before the handlers (and settings) are imported
+    os.environ["LOCAL_QUEUE_DB_PATH"] = args.db_path
+
+    from src.infrastructure.adapter_factory import get_queue_name
+    from src.infrastructure.config import settings
+
+    release_queue_name = get_queue_name(settings.AWS_SQS_RELEASE_QUEUE_URL)
+    release_batch_queue_name = get_queue_name(
+        settings.AWS_SQS_RELEASE_BATCH_QUEUE_URL
+    )
+    watched_queue_names = [release_queue_name, release_batch_queue_name]
+
+    start_time = time.monotonic()
+    try:
+        if args.scrape:
+            scrape()
+        elif args.seed_pdf:
+            seed_pdf(args.seed_pdf, args.year)
+
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        consumer_specs = [
+            (
+                "orchestrator",
+                release_queue_name,
+                ORCHESTRATOR_QUEUE_BATCH_SIZE,
+                args.orchestrators,
+            ),
+            ("worker", release_batch_queue_name, WORKER_QUEUE_BATCH_SIZE, args.workers),
+        ]
+        processes = []
+        for handler_name, queue_name, batch_size, count in consumer_specs:
+            for i in range(count):
+                processes.append(
+                    multiprocessing.Process(
+                        target=run_consumer,
+                        args=(
+                            f"{handler_name}-{i}",
+                            handler_name,
+                            queue_name,
+                            batch_size,
+                            args.db_path,
+                            args.visibility_timeout,
+                            args.max_receive_count,
+                            args.idle_timeout,
+                            watched_queue_names,
+                            results,
+                        ),
+                    )
+                )
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        # a crashed consumer puts nothing, its messages are redelivered
+        stats_list = []
+        while not results.empty():
+            stats_list.append(results.get())
+
+        log_summary(stats_list, args.db_path, time.monotonic() - start_time)
+
+    except Exception as e:
+        logger.critical(f"Local queue runner crashed: {e}", exc_info=True)
+        sys.exit(1)
+
+    elapsed_time = timedelta(seconds=time.monotonic() - start_time)
+    logger.info(f"Total elapsed time: {elapsed_time}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.release import Release
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.nca_db_loader import NCADBLoader
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_cost_estimator import PageCostEstimator
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+from src.core.use_cases.release_batcher import ReleaseBatcher
+from src.core.use_cases.sharded_nca_writer import ShardedNCAWriter
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.infrastructure.adapters.supabase_repository import SupabaseRepository
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    BASE_STORAGE_PATH,
+    DB_BULK_SIZE,
+    RECORD_COLUMNS,
+    STITCH_LOOKAHEAD_PAGES,
+    VALID_COLUMNS,
+)
+
+logger = logging.getLogger(__name__)
+
+STAGES = ["batch", "extract", "clean", "stitch", "load"]
+
+
+class RunStats:
+    """thread-safe counters for the throughput summary"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.releases = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.pages = 0
+        self.rows = 0
+        self.records = 0
+        self.allocations = 0
+
+    def add(self, **counts) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                if name in self.stage_seconds:
+                    self.stage_seconds[name] += value
+                else:
+                    setattr(self, name, getattr(self, name) + value)
+
+    def log_summary(self, elapsed_s: float) -> None:
+        elapsed_s = max(elapsed_s, 1e-9)
+        logger.info(
+            f"Processed {self.releases} releases, "
+            f"{self.batches} batches ({self.failed_batches} failed), "
+            f"{self.pages} pages, {self.rows} rows, "
+            f"{self.records} records, {self.allocations} allocations "
+            f"in {elapsed_s:.1f}s"
+        )
+        logger.info(
+            f"Throughput: {self.pages / elapsed_s:.2f} pages/s, "
+            f"{self.rows / elapsed_s:.2f} rows/s, "
+            f"{self.records / elapsed_s:.2f} records/s"
+        )
+        # stage time is summed over all processes/threads
+        for stage, seconds in self.stage_seconds.items():
+            logger.info(f"Stage {stage}: {seconds:.1f}s total")
+
+
+# ---------------------
+# worker processes
+# ---------------------
+
+
+class _WorkerJobs:
+    """use cases built once per worker process"""
+
+    def __init__(self):
+        storage = LocalStorage(base_storage_path=BASE_STORAGE_PATH)
+        parser = PDFParser()
+        data_cleaner = PdDataCleaner(
+            allocation_comumns=ALLOCATION_COLUMNS,
+            record_columns=RECORD_COLUMNS,
+            valid_columns=VALID_COLUMNS,
+        )
+        self.file_bytes_loader = FileBytesMemoLoader(storage=storage)
+        self.extractor = RawTableExtractor(storage=storage, parser=parser)
+        self.page_cleaner = PageTableCleaner(data_cleaner=data_cleaner)
+        self.continuation_reader = PageContinuationReader(
+            extractor=self.extractor,
+            page_cleaner=self.page_cleaner,
+            max_lookahead_pages=STITCH_LOOKAHEAD_PAGES,
+        )
+        self.stitcher = PageStitcher(data_cleaner=data_cleaner)
+
+
+_worker_jobs: _WorkerJobs | None = None
+
+
+def _init_worker_process() -> None:
+    global _worker_jobs
+    _worker_jobs = _WorkerJobs()
+
+
+def _process_batch(batch: ReleaseBatch) -> Tuple[NCAData, Dict[str, float]]:
+    jobs = _worker_jobs or _WorkerJobs()
+    stats = {"extract": 0.0, "clean": 0.0, "stitch": 0.0, "pages": 0, "rows": 0}
+    empty = NCAData(records=[], allocations=[])
+
+    file_bytes = jobs.file_bytes_loader.run(batch.release.filename)
+    if not file_bytes:
+        return empty, stats
+
+    pages = []
+    for i in range(batch.start_page_num, batch.end_page_num + 1):
+        start_time = time.monotonic()
+        table = jobs.extractor.run(file_bytes, i)
+        stats["extract"] += time.monotonic() - start_time
+        stats["pages"] += 1
+        if not table:
+            continue
+        stats["rows"] += len(table)
+
+        start_time = time.monotonic()
+        pages.append(jobs.page_cleaner.run(table, batch.release.id, i))
+        stats["clean"] += time.monotonic() - start_time
+
+    if not pages:
+        return empty, stats
+
+    start_time = time.monotonic()
+    pages.extend(
+        jobs.continuation_reader.run(file_bytes, batch.release, batch.end_page_num)
+    )
+    nca_data = jobs.stitcher.run(pages, batch.release.id)
+    stats["stitch"] += time.monotonic() - start_time
+    return nca_data, stats
+
+
+# ---------------------
+# runner
+# ---------------------
+
+
+class ConcurrentPipelineRunner:
+    """
+    orchestrator stage (main thread) -> worker processes (extract, clean,
+    stitch) -> loader threads (db), with at most queue_size batches of
+    extracted data held in memory between the stages; with shards, the
+    loader threads hand each batch to single-writer shards (by nca number)
+    """
+
+    def __init__(
+        self,
+        page_cost_estimator: PageCostEstimator,
+        batcher: ReleaseBatcher,
+        processes: int,
+        threads: int,
+        queue_size: int,
+        batch_limit: int | None = None,
+        shards: int = 0,
+    ):
+        self.page_cost_estimator = page_cost_estimator
+        self.batcher = batcher
+        self.processes = processes
+        self.threads = threads
+        self.queue_size = queue_size
+        self.batch_limit = batch_limit
+        self.shards = shards
+        self._thread_local = threading.local()
+        self._sharded_writer: ShardedNCAWriter | None = None
+
+    def run(self, releases: List[Release]) -> RunStats:
+        stats = RunStats()
+        in_flight = threading.BoundedSemaphore(self.queue_size)
+        futures: List[Future] = []
+        start_time = time.monotonic()
+        if self.shards:
+            self._sharded_writer = ShardedNCAWriter(
+                loader_factory=self._create_db_loader, shard_count=self.shards
+            )
+
+        with ProcessPoolExecutor(
+            max_workers=self.processes, initializer=_init_worker_process
+        ) as process_pool, ThreadPoolExecutor(max_workers=self.threads) as load_pool:
+            for batch in self._iter_batches(releases, stats):
+                # blocks the orchestrator stage while the queue is full
+                in_flight.acquire()
+                future = process_pool.submit(_process_batch, batch)
+                future.add_done_callback(
+                    lambda f, batch=batch: futures.append(
+                        load_pool.submit(
+                            self._load_batch, batch, f, stats, in_flight
+                        )
+                    )
+                )
+
+            # wait until every submitted batch has released its slot
+            for _ in range(self.queue_size):
+                in_flight.acquire()
+
+        for future in futures:
+            future.result()
+        if self._sharded_writer:
+            self._sharded_writer.close()
+
+        stats.log_summary(time.monotonic() - start_time)
+        return stats
+
+    def _iter_batches(
+        self, releases: List[Release], stats: RunStats
+    ) -> Iterable[ReleaseBatch]:
+        for release in releases:
+            start_time = time.monotonic()
+            page_costs = self.page_cost_estimator.run(release)
+            batches = self.batcher.run(release, page_costs)
+            if self.batch_limit is not None:
+                batches = batches[: self.batch_limit]
+            stats.add(batch=time.monotonic() - start_time, releases=1)
+            yield from batches
+
+    def _load_batch(
+        self,
+        batch: ReleaseBatch,
+        process_future: Future,
+        stats: RunStats,
+        in_flight: threading.BoundedSemaphore,
+    ) -> None:
+        try:
+            nca_data, batch_stats = process_future.result()
+            stats.add(**batch_stats)
+
+            start_time = time.monotonic()
+            db_loader = self._sharded_writer or self._get_db_loader()
+            db_loader.run(
+                batch.release,
+                nca_data,
+                batch.batch_num,
+                list(range(batch.start_page_num, batch.end_page_num + 1)),
+            )
+            stats.add(
+                load=time.monotonic() - start_time,
+                batches=1,
+                records=len(nca_data.records),
+                allocations=len(nca_data.allocations),
+            )
+
+        except Exception as e:
+            stats.add(failed_batches=1)
+            logger.error(
+                f"Failed to process/load {batch.release.filename} "
+                f"batch-{batch.batch_num}: {e}",
+                exc_info=True,
+            )
+
+        finally:
+            in_flight.release()
+
+    def _get_db_loader(self) -> NCADBLoader:
+        """one http client per loader thread"""
+        db_loader = getattr(self._thread_local, "db_loader", None)
+        if db_loader is None:
+            db_loader = self._create_db_loader()
+            self._thread_local.db_loader = db_loader
+        return db_loader
+
+    def _create_db_loader(self) -> NCADBLoader:
+        return NCADBLoader(
+            repository=SupabaseRepository(db_bulk_size=DB_BULK_SIZE),
+            data_cleaner=PdDataCleaner(
+                allocation_comumns=ALLOCATION_COLUMNS,
+                record_columns=RECORD_COLUMNS,
+                valid_columns=VALID_COLUMNS,
+            ),
+        )
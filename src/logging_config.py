@@ -2,6 +2,22 @@ import logging.config
 import sys
 import os
 
+# lambda handles one invocation at a time, a module global (unlike a
+# contextvar) is also seen by the executor threads of the worker pipeline
+_trace_id = "-"
+
+
+def set_log_trace_id(trace_id: str | None) -> None:
+    """tag the following log lines with the trace id of the current message"""
+    global _trace_id
+    _trace_id = trace_id or "-"
+
+
+class TraceIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = _trace_id
+        return True
+
 
 def setup_logging():
     is_lambda = os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
@@ -10,6 +26,7 @@ def setup_logging():
         "console": {
             "class": "logging.StreamHandler",
             "formatter": "standard",
+            "filters": ["trace_id"],
             "stream": sys.stdout,
         }
     }
@@ -21,6 +38,7 @@ def setup_logging():
         handlers_definitions["file"] = {
             "class": "logging.FileHandler",
             "formatter": "standard",
+            "filters": ["trace_id"],
             "filename": "pipeline.log",
             "mode": "a",
         }
@@ -29,9 +47,15 @@ def setup_logging():
     LOG_CONFIG = {
         "version": 1,
         "disable_existing_loggers": False,
+        "filters": {
+            "trace_id": {"()": TraceIdFilter},
+        },
         "formatters": {
             "standard": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+                "format": (
+                    "%(asctime)s [%(levelname)s] [%(trace_id)s] "
+                    "%(name)s: %(message)s"
+                ),
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
         },
@@ -1,40 +1,54 @@
-from io import BytesIO
+import argparse
+import os
 import time
 import logging
 import sys
+from typing import List
 from tqdm import tqdm
 from datetime import timedelta
 
+from src.core.entities.nca_data import NCAData
+from src.core.entities.release import Release
 from src.core.use_cases.disable_lambda_triggers import DisableLambdaTriggers
 from src.core.use_cases.enable_lambda_triggers import EnableLambdaTriggers
 from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.invocation_profiler import InvocationProfiler
 from src.core.use_cases.message_queuer import MessageQueuer
 from src.core.use_cases.nca_db_loader import NCADBLoader
-from src.core.use_cases.raw_table_cleaner import RawTableCleaner
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_cost_estimator import PageCostEstimator
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_cache import RawTableCache
 from src.core.use_cases.raw_table_extractor import RawTableExtractor
 from src.core.use_cases.release_batcher import ReleaseBatcher
 from src.core.use_cases.releases_scraper import ReleasesScraper
-from src.infrastructure.adapters.bs4_scraper import Bs4Scraper
-from src.infrastructure.adapters.lambda_serverless_function import (
-    LambdaServerlessFunction,
+from src.infrastructure.adapter_factory import (
+    create_data_cleaner,
+    create_metrics,
+    create_parser,
+    create_repository,
+    create_scraper,
+    create_serverless_function,
 )
-from src.infrastructure.adapters.s3_storage import S3Storage
-from src.infrastructure.adapters.scrapy_scraper import ScrapyScraper
+from src.infrastructure.config import settings
+from src.infrastructure.lazy_adapter import lazy
 from src.logging_config import setup_logging
 
 from src.infrastructure.adapters.mock_queue import MockQueue
-from src.infrastructure.adapters.supabase_repository import SupabaseRepository
 from src.infrastructure.adapters.local_storage import LocalStorage
-from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
-from src.infrastructure.adapters.pdf_parser import PDFParser
 from src.infrastructure.constants import (
-    ALLOCATION_COLUMNS,
+    AVG_PAGE_DURATION_S,
     BASE_STORAGE_PATH,
     BATCH_SIZE,
-    DB_BULK_SIZE,
+    BATCH_TARGET_DURATION_S,
+    MAX_BATCH_SIZE,
     ORCHESTRATOR_FUNCTION_NAME,
-    RECORD_COLUMNS,
-    VALID_COLUMNS,
+    PROFILE_STORAGE_PREFIX,
+    PROFILE_TOP_ALLOCATIONS,
+    PROFILE_TOP_FUNCTIONS,
+    RAW_CACHE_STORAGE_PREFIX,
+    STITCH_LOOKAHEAD_PAGES,
     WORKER_FUNCTION_NAME,
 )
 
@@ -46,20 +60,17 @@ NUMBER_OF_BATCHES_TO_QUEUE = 1
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# adapters
-serverless_function = LambdaServerlessFunction()
-scraper = Bs4Scraper()
-# scraper = ScrapyScraper()
+# adapters (built on first use)
+serverless_function = lazy(create_serverless_function)
+scraper = lazy(create_scraper)
+# scraper = lazy(lambda: create_scraper("scrapy"))
 storage = LocalStorage(base_storage_path=BASE_STORAGE_PATH)
-# storage = S3Storage(base_storage_path=BASE_STORAGE_PATH)
-parser = PDFParser()
+# storage = lazy(create_storage)  # s3
+parser = lazy(create_parser)
 queue = MockQueue()
-data_cleaner = PdDataCleaner(
-    allocation_comumns=ALLOCATION_COLUMNS,
-    record_columns=RECORD_COLUMNS,
-    valid_columns=VALID_COLUMNS,
-)
-repository = SupabaseRepository(db_bulk_size=DB_BULK_SIZE)
+data_cleaner = lazy(create_data_cleaner)
+repository = lazy(create_repository)
+metrics = create_metrics("main")
 
 # use cases
 enable_triggers_job = EnableLambdaTriggers(serverless_function=serverless_function)
@@ -68,23 +79,220 @@ scraper_job = ReleasesScraper(
     parser=parser,
     storage=storage,
     repository=repository,
+    metrics=metrics,
+    staged_reload=settings.STAGED_RELOAD,
+)
+queuer_job = MessageQueuer(queue=queue, metrics=metrics)
+page_cost_estimator_job = PageCostEstimator(
+    storage=storage, parser=parser, metrics=metrics
+)
+batcher_job = ReleaseBatcher(
+    batch_size=BATCH_SIZE,
+    target_batch_duration_s=BATCH_TARGET_DURATION_S,
+    avg_page_duration_s=AVG_PAGE_DURATION_S,
+    max_batch_size=MAX_BATCH_SIZE,
+)
+file_bytes_loader_job = FileBytesMemoLoader(storage=storage, metrics=metrics)
+# raw tables cached for re-cleaning (src/reclean.py) without re-parsing
+raw_cache = (
+    RawTableCache(
+        storage=storage, parser=parser, storage_prefix=RAW_CACHE_STORAGE_PREFIX
+    )
+    if settings.RAW_CACHE_ENABLED
+    else None
 )
-queuer_job = MessageQueuer(queue=queue)
-batcher_job = ReleaseBatcher(batch_size=BATCH_SIZE)
-file_bytes_loader_job = FileBytesMemoLoader(storage=storage)
-extractor_job = RawTableExtractor(storage=storage, parser=parser)
-cleaner_job = RawTableCleaner(data_cleaner=data_cleaner)
+extractor_job = RawTableExtractor(
+    storage=storage, parser=parser, metrics=metrics, cache=raw_cache
+)
+page_cleaner_job = PageTableCleaner(data_cleaner=data_cleaner, metrics=metrics)
+continuation_reader_job = PageContinuationReader(
+    extractor=extractor_job,
+    page_cleaner=page_cleaner_job,
+    max_lookahead_pages=STITCH_LOOKAHEAD_PAGES,
+)
+stitcher_job = PageStitcher(data_cleaner=data_cleaner, metrics=metrics)
 db_loader_job = NCADBLoader(
     data_cleaner=data_cleaner,
     repository=repository,
+    metrics=metrics,
 )
 disable_triggers_job = DisableLambdaTriggers(serverless_function=serverless_function)
+profiler_job = InvocationProfiler(
+    storage=storage,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    storage_prefix=PROFILE_STORAGE_PREFIX,
+    top_functions=PROFILE_TOP_FUNCTIONS,
+    top_allocations=PROFILE_TOP_ALLOCATIONS,
+)
 
 TARGET_FUNCTIONS = [ORCHESTRATOR_FUNCTION_NAME, WORKER_FUNCTION_NAME]
 
 
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description="Run the NCA pipeline locally")
+    arg_parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="run orchestrator/worker stages with process and thread pools",
+    )
+    arg_parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes for extraction/cleaning (concurrent mode)",
+    )
+    arg_parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="loader threads for db writes (concurrent mode)",
+    )
+    arg_parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help=(
+            "route db writes by nca number hash to this many single-writer "
+            "shards (concurrent mode, 0 = off)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=None,
+        help="max batches in flight between stages (default: 2 x processes)",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile the run (cprofile + tracemalloc) into storage",
+    )
+    return arg_parser.parse_args()
+
+
+def run_sequential(releases: List[Release]):
+    for release in releases:
+        prev_time = time.time()
+
+        # ---------------------
+        # orchestrator
+        # ---------------------
+
+        # page cost estimator
+        page_costs = page_cost_estimator_job.run(release)
+
+        # batcher
+        logger.info("Starting batcher job...")
+        batches = batcher_job.run(release, page_costs)
+        logger.info("Batcher job completed.")
+
+        # <test>
+        if NUMBER_OF_BATCHES_TO_QUEUE is not None:
+            batch_count = min(NUMBER_OF_BATCHES_TO_QUEUE, len(batches))
+            batches = batches[:batch_count]
+            logger.info(f"Limiting to {batch_count} batches for testing purposes.")
+        # </test>
+
+        # queuer
+        logger.info("Starting queuer job...")
+        succcess_count = 0
+        for batch in batches:
+            is_queued = queuer_job.run(batch)
+            if is_queued:
+                succcess_count += 1
+        logger.info(
+            f"Successfully queued {succcess_count}/{len(batches)} batches for "
+            f"{release.filename}."
+        )
+        logger.info("Queuer job completed.")
+
+        # ---------------------
+        # worker
+        # ---------------------
+
+        logger.info("Starting Processing & Loading Job...")
+        for batch in tqdm(
+            batches, desc=f"Processing/Loading {release.filename}", unit="batch"
+        ):
+            # file bytes memo loader
+            file_bytes = file_bytes_loader_job.run(batch.release.filename)
+            if not file_bytes:
+                continue
+
+            # extractor
+            logger.debug(
+                f"Extracting {batch.release.filename} "
+                f"batch-{batch.batch_num} tables..."
+            )
+            pages = []
+            for i in range(batch.start_page_num, batch.end_page_num + 1):
+                table = extractor_job.run(file_bytes, i)
+                if not table:
+                    logger.warning(
+                        f"No tables extracted for {batch.release.filename} "
+                        f"batch-{batch.batch_num} page-{i}"
+                    )
+                    continue
+                pages.append(page_cleaner_job.run(table, batch.release.id, i))
+
+            page_nums = list(range(batch.start_page_num, batch.end_page_num + 1))
+            if not pages:
+                logger.warning(
+                    f"No tables extracted for {batch.release.filename} "
+                    f"batch-{batch.batch_num}"
+                )
+                if batch.release.reload:
+                    # the pages still count towards the staged reload
+                    db_loader_job.run(
+                        batch.release,
+                        NCAData(records=[], allocations=[]),
+                        batch.batch_num,
+                        page_nums,
+                    )
+                continue
+            logger.debug(
+                f"Extracted {len(pages)} pages for "
+                f"{batch.release.filename} batch-{batch.batch_num}"
+            )
+            # stitcher
+            logger.debug(
+                f"Stitching {batch.release.id} batch-{batch.batch_num} pages..."
+            )
+            pages.extend(
+                continuation_reader_job.run(
+                    file_bytes, batch.release, batch.end_page_num
+                )
+            )
+            nca_data = stitcher_job.run(pages, batch.release.id)
+            logger.debug(
+                f"Cleaned data for {batch.release.filename} batch-{batch.batch_num}: "
+                f"{len(nca_data.allocations)} allocations, "
+                f"{len(nca_data.records)} records"
+            )
+            # loader
+            logger.debug(
+                f"Loading {batch.release.id} batch-{batch.batch_num} data to db..."
+            )
+            db_loader_job.run(batch.release, nca_data, batch.batch_num, page_nums)
+            logger.debug(
+                f"Loaded {batch.release.filename} batch-{batch.batch_num} data to db"
+            )
+
+        elapsed = str(timedelta(seconds=time.time() - prev_time)).split(":")
+        logger.info(
+            f"Finished processing/loading {release.filename}: "
+            f"{elapsed[0]}h "
+            f"{elapsed[1]}m "
+            f"{elapsed[2]}s: "
+            f"{release.filename}"
+        )
+
+
 def main():
+    args = parse_args()
     logger.info("Initializing NCA Pipeline...")
+    run_id = time.strftime("%Y%m%dT%H%M%S")
+    profile_session = profiler_job.start(force=args.profile)
 
     try:
         # ---------------------
@@ -112,104 +320,26 @@ def main():
         logger.info(f"Successfully queued {success_count}/{len(releases)} releases.")
         logger.info("Queuer completed successfully.")
 
-        for release in releases:
-            prev_time = time.time()
-
-            # ---------------------
-            # orchestrator
-            # ---------------------
-
-            # batcher
-            logger.info("Starting batcher job...")
-            batches = batcher_job.run(release)
-            logger.info("Batcher job completed.")
-
-            # <test>
-            if NUMBER_OF_BATCHES_TO_QUEUE is not None:
-                batch_count = min(NUMBER_OF_BATCHES_TO_QUEUE, len(batches))
-                batches = batches[:batch_count]
-                logger.info(f"Limiting to {batch_count} batches for testing purposes.")
-            # </test>
-
-            # queuer
-            logger.info("Starting queuer job...")
-            succcess_count = 0
-            for batch in batches:
-                is_queued = queuer_job.run(batch)
-                if is_queued:
-                    succcess_count += 1
-            logger.info(
-                f"Successfully queued {succcess_count}/{len(batches)} batches for "
-                f"{release.filename}."
-            )
-            logger.info("Queuer job completed.")
-
-            # ---------------------
-            # worker
-            # ---------------------
-
-            logger.info("Starting Processing & Loading Job...")
-            for batch in tqdm(
-                batches, desc=f"Processing/Loading {release.filename}", unit="batch"
-            ):
-                # file bytes memo loader
-                file_bytes = file_bytes_loader_job.run(batch.release.filename)
-                if not file_bytes:
-                    continue
-
-                # extractor
-                logger.debug(
-                    f"Extracting {batch.release.filename} "
-                    f"batch-{batch.batch_num} tables..."
-                )
-                extracted_table = []
-                for i in range(batch.start_page_num, batch.end_page_num + 1):
-                    table = extractor_job.run(BytesIO(file_bytes), i)
-                    if not table:
-                        logger.warning(
-                            f"No tables extracted for {batch.release.filename} "
-                            f"batch-{batch.batch_num} page-{i}"
-                        )
-                        continue
-                    extracted_table.extend(table)
-
-                if not extracted_table:
-                    logger.warning(
-                        f"No tables extracted for {batch.release.filename} "
-                        f"batch-{batch.batch_num}"
-                    )
-                    continue
-                logger.debug(
-                    f"Extracted {len(extracted_table)} rows for "
-                    f"{batch.release.filename} batch-{batch.batch_num}"
-                )
-                # cleaner
-                logger.debug(
-                    f"Cleaning {batch.release.id} batch-{batch.batch_num} tables..."
-                )
-                nca_data = cleaner_job.run(extracted_table, batch.release.id)
-                logger.debug(
-                    f"Cleaned data for {batch.release.filename} batch-{batch.batch_num}: "
-                    f"{len(nca_data.allocations)} allocations, "
-                    f"{len(nca_data.records)} records"
-                )
-                # loader
-                logger.debug(
-                    f"Loading {batch.release.id} batch-{batch.batch_num} data to db..."
-                )
-                db_loader_job.run(batch.release, nca_data, batch.batch_num)
-                logger.debug(
-                    f"Loaded {batch.release.filename} batch-{batch.batch_num} data to db"
-                )
+        if args.concurrent:
+            # imports the process pool workers' adapters
+            from src.local_runner import ConcurrentPipelineRunner
 
-            elapsed = str(timedelta(seconds=time.time() - prev_time)).split(":")
-            logger.info(
-                f"Finished processing/loading {release.filename}: "
-                f"{elapsed[0]}h "
-                f"{elapsed[1]}m "
-                f"{elapsed[2]}s: "
-                f"{release.filename}"
+            logger.info("Starting Concurrent Pipeline Runner...")
+            runner = ConcurrentPipelineRunner(
+                page_cost_estimator=page_cost_estimator_job,
+                batcher=batcher_job,
+                processes=args.processes,
+                threads=args.threads,
+                queue_size=args.queue_size or 2 * args.processes,
+                batch_limit=NUMBER_OF_BATCHES_TO_QUEUE,
+                shards=args.shards,
             )
+            runner.run(releases)
+            logger.info("Concurrent Pipeline Runner completed.")
+        else:
+            run_sequential(releases)
+        metrics.flush()
+        profiler_job.stop(profile_session, run_id=run_id, name=f"main-{os.getpid()}")
 
         # teardown
         # disable lambda triggers
@@ -0,0 +1,170 @@
+import argparse
+import logging
+import re
+import sys
+from typing import List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from src.core.interfaces.storage import StorageProvider
+from src.infrastructure.adapter_factory import create_storage
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.constants import (
+    BASE_STORAGE_PATH,
+    EXPORT_QUERY_TOP,
+    EXPORT_STORAGE_PREFIX,
+)
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+_PARTITION = re.compile(r"/year=(\d+)/release_id=([^/]+)/[^/]+\.parquet$")
+
+GROUP_BY_CHOICES = [
+    "year",
+    "release_id",
+    "month",
+    "department",
+    "nca_type",
+    "agency",
+    "operating_unit",
+]
+
+
+def read_table(
+    storage: StorageProvider,
+    table: str,
+    years: List[int] | None = None,
+    release_ids: List[str] | None = None,
+) -> pa.Table | None:
+    """
+    one exported table (records or allocations) with its partition columns,
+    partitions outside the years/releases are not read
+    """
+    tables = []
+    for filename in storage.list_files(f"{EXPORT_STORAGE_PREFIX}/{table}/"):
+        match = _PARTITION.search(filename)
+        if not match:
+            continue
+        year, release_id = int(match[1]), match[2]
+        if (years and year not in years) or (
+            release_ids and release_id not in release_ids
+        ):
+            continue
+
+        data = storage.load_file(filename)
+        if data is None:
+            continue
+        file_table = pq.read_table(pa.BufferReader(data))
+        file_table = file_table.append_column(
+            "year", pa.array([year] * file_table.num_rows, pa.int32())
+        ).append_column(
+            "release_id", pa.array([release_id] * file_table.num_rows, pa.string())
+        )
+        tables.append(file_table)
+    return pa.concat_tables(tables) if tables else None
+
+
+def drop_duplicate_records(records: pa.Table) -> pa.Table:
+    """
+    a record exported by two batches (its group repeated at the top of the
+    next batch's first page) is kept once, the join would repeat its
+    allocations
+    """
+    first_rows = (
+        records.append_column("row", pa.array(range(records.num_rows), pa.int64()))
+        .group_by(["release_id", "nca_number"], use_threads=False)
+        .aggregate([("row", "min")])
+    )
+    return records.take(first_rows["row_min"])
+
+
+def aggregate(
+    records: pa.Table, allocations: pa.Table, group_by: List[str]
+) -> pa.Table:
+    """record count, allocation count and total amount per group, largest first"""
+    records = drop_duplicate_records(records)
+    records = records.append_column(
+        "month", pc.strftime(records["released_date"], format="%Y-%m")
+    )
+    # records without allocations still count as records
+    joined = records.join(
+        allocations.drop_columns(["year"]),
+        keys=["release_id", "nca_number"],
+        join_type="left outer",
+    )
+    groups = joined.group_by(group_by).aggregate(
+        [
+            ("nca_number", "count_distinct"),
+            ("amount", "count"),
+            ("amount", "sum"),
+        ]
+    )
+    result = pa.table(
+        {
+            **{column: groups[column] for column in group_by},
+            "record_count": groups["nca_number_count_distinct"],
+            "allocation_count": groups["amount_count"],
+            "total_amount": groups["amount_sum"],
+        }
+    )
+    return result.sort_by([("total_amount", "descending")])
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=(
+            "Aggregate the parquet exports (PARQUET_EXPORT) in storage without "
+            "touching the db: records, allocations and total amount per group"
+        )
+    )
+    arg_parser.add_argument(
+        "--group-by",
+        nargs="+",
+        choices=GROUP_BY_CHOICES,
+        default=["department"],
+    )
+    arg_parser.add_argument("--year", type=int, nargs="+", help="e.g. 2024")
+    arg_parser.add_argument("--release", nargs="+", help="e.g. id_2024")
+    arg_parser.add_argument("--top", type=int, default=EXPORT_QUERY_TOP)
+    arg_parser.add_argument("--out", help="write every group to this csv file")
+    arg_parser.add_argument(
+        "--local", action="store_true", help="read local storage instead of s3"
+    )
+    args = arg_parser.parse_args()
+
+    storage = (
+        LocalStorage(base_storage_path=BASE_STORAGE_PATH)
+        if args.local
+        else create_storage()
+    )
+    records = read_table(storage, "records", args.year, args.release)
+    allocations = read_table(storage, "allocations", args.year, args.release)
+    if records is None or allocations is None:
+        logger.error("No exported records/allocations found")
+        sys.exit(1)
+    logger.info(
+        f"Read {records.num_rows} records and {allocations.num_rows} allocations"
+    )
+
+    result = aggregate(records, allocations, args.group_by)
+    logger.info(f"Top {args.top} of {result.num_rows} groups by total amount:")
+    for row in result.slice(0, args.top).to_pylist():
+        keys = ", ".join(str(row[column]) for column in args.group_by)
+        logger.info(
+            f"{keys}: {row['record_count']} records, "
+            f"{row['allocation_count']} allocations, "
+            f"{row['total_amount'] or 0:,.2f} total"
+        )
+
+    if args.out:
+        pa_csv.write_csv(result, args.out)
+        logger.info(f"Wrote {result.num_rows} groups to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
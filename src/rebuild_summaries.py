@@ -0,0 +1,33 @@
+import argparse
+import logging
+import sys
+
+from src.core.use_cases.summary_rebuilder import SummaryRebuilder
+from src.infrastructure.adapter_factory import create_repository
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=(
+            "Recompute the summary tables (totals by department, agency and "
+            "month) from the loaded records and allocations"
+        )
+    )
+    arg_parser.add_argument(
+        "--fold",
+        action="store_true",
+        help="only add the pending summary deltas of the loads to the summaries",
+    )
+    args = arg_parser.parse_args()
+
+    summary_rebuilder_job = SummaryRebuilder(repository=create_repository())
+    if not summary_rebuilder_job.run(fold=args.fold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import logging
+import sys
+
+from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_cache import RawTableCache
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+from src.core.use_cases.release_recleaner import ReleaseRecleaner
+from src.infrastructure.adapter_factory import (
+    create_data_cleaner,
+    create_parser,
+    create_repository,
+    create_storage,
+)
+from src.infrastructure.constants import (
+    RAW_CACHE_STORAGE_PREFIX,
+    RECLEAN_LOAD_ROWS,
+    RECLEAN_WORKERS,
+)
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=(
+            "Rebuild a release's records and allocations from the raw table "
+            "cache (RAW_CACHE_ENABLED) with the current cleaner, pages missing "
+            "from the cache are parsed"
+        )
+    )
+    arg_parser.add_argument("release_ids", nargs="+", help="e.g. id_2024")
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=RECLEAN_WORKERS,
+        help="pages read and cleaned concurrently",
+    )
+    args = arg_parser.parse_args()
+
+    storage = create_storage()
+    parser = create_parser()
+    data_cleaner = create_data_cleaner()
+    repository = create_repository()
+    cache = RawTableCache(
+        storage=storage, parser=parser, storage_prefix=RAW_CACHE_STORAGE_PREFIX
+    )
+    recleaner_job = ReleaseRecleaner(
+        file_bytes_loader=FileBytesMemoLoader(storage=storage),
+        parser=parser,
+        extractor=RawTableExtractor(storage=storage, parser=parser, cache=cache),
+        page_cleaner=PageTableCleaner(data_cleaner=data_cleaner),
+        stitcher=PageStitcher(data_cleaner=data_cleaner),
+        repository=repository,
+        load_rows=RECLEAN_LOAD_ROWS,
+        max_workers=args.workers,
+    )
+
+    failed = []
+    for release_id in args.release_ids:
+        release = repository.get_release(release_id)
+        if not release:
+            logger.error(f"No release found for {release_id}")
+            failed.append(release_id)
+        elif not recleaner_job.run(release):
+            failed.append(release_id)
+
+    if failed:
+        logger.error(f"Failed to re-clean {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import argparse
+import json
+import logging
+import random
+import zlib
+from datetime import date, timedelta
+from io import BytesIO
+from typing import List, Tuple
+
+from pdfminer.fontmetrics import FONT_METRICS
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.record import Record
+from src.infrastructure.constants import VALID_COLUMNS, VERT_LINES
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# landscape letter/legal width used by the dbm releases (pdf points)
+PAGE_WIDTH = 1224
+PAGE_HEIGHT = 792
+FONT_SIZE = 10
+# smaller than the body so "NCA TYPE" ends before "RELEASED DATE" starts
+# (words closer than 3pt are merged and the column is not found)
+HEADER_FONT_SIZE = 8
+LINE_HEIGHT = 12  # < 3pt between lines: rows of one cell block stay joined
+BLOCK_GAP = 10  # > 3pt: the text strategy turns it into an empty row
+HEADER_TOP = 20
+BODY_TOP = 36
+BOTTOM_MARGIN = 24
+CELL_PADDING = 6
+
+_HELVETICA_WIDTHS = FONT_METRICS["Helvetica"][1]
+
+_NCA_TYPES = ["TR", "REG", "SUB"]
+_DEPARTMENT_WORDS = [
+    "Department", "of", "Public", "Works", "and", "Highways", "Health",
+    "Education", "Agriculture", "Interior", "Local", "Government", "Finance",
+    "Other", "Executive", "Offices", "(OEOs)", "Social", "Welfare",
+    "Development", "Transportation", "National", "Defense",
+]
+_AGENCY_WORDS = [
+    "Office", "of", "the", "Secretary", "Bureau", "Regional", "Central",
+    "Commission", "Authority", "Council", "for", "Government-Owned", "or",
+    "Controlled", "Corporations", "Hospital", "Medical", "Center", "Board",
+]
+_UNIT_WORDS = [
+    "Region", "I", "II", "III", "IV-A", "V", "VII", "NCR", "CAR", "BARMM",
+    "Central", "Office", "District", "Field", "Unit", "Provincial",
+]
+_PURPOSE_WORDS = [
+    "To", "cover", "the", "payment", "of", "refund", "retention", "fee",
+    "relative", "to", "completion", "projects", "personnel", "services",
+    "requirements", "for", "month", "implementation", "programs",
+    "maintenance", "and", "other", "operating", "expenses", "capital",
+    "outlays", "Trends", "&", "Technologies,", "Inc.,", "procured",
+    "allowances", "benefits", "subsidy", "assistance", "calamity", "fund",
+]
+
+
+def text_width(text: str, font_size: float = FONT_SIZE) -> float:
+    return sum(_HELVETICA_WIDTHS.get(c, 556) for c in text) * font_size / 1000
+
+
+class SyntheticNCAPDF:
+    """
+    nca release pdfs in the dbm layout (column x positions from VERT_LINES,
+    header repeated on every page) plus the NCAData they should clean to:
+    - an nca group is a first block (record columns + first allocation)
+      followed by one block per extra allocation, blocks are separated by
+      an empty row, like the real releases
+    - groups may continue on the next page between two allocation blocks
+    """
+
+    def __init__(
+        self,
+        pages: int,
+        rows_per_page: int | None = None,
+        max_purpose_lines: int = 3,
+        max_allocations: int = 3,
+        straddle_pages: bool = True,
+        release_id: str = "id_synthetic",
+        year: int = 2026,
+        seed: int = 0,
+    ):
+        capacity = self.get_page_row_capacity()
+        self.pages = pages
+        self.rows_per_page = min(rows_per_page or capacity, capacity)
+        self.max_purpose_lines = max(1, max_purpose_lines)
+        self.max_allocations = max(1, max_allocations)
+        self.straddle_pages = straddle_pages
+        self.release_id = release_id
+        self.year = year
+        self.random = random.Random(seed)
+
+        self.column_starts = dict(zip(VALID_COLUMNS, VERT_LINES[:-1]))
+        self.column_ends = dict(zip(VALID_COLUMNS, VERT_LINES[1:]))
+
+    @staticmethod
+    def get_page_row_capacity() -> int:
+        """body rows that fit on a page when no block gaps are used"""
+        return int((PAGE_HEIGHT - BOTTOM_MARGIN - BODY_TOP) // LINE_HEIGHT)
+
+    def generate(self) -> Tuple[BytesIO, NCAData]:
+        # page -> list of (top, {column: text}) lines
+        page_lines: List[List[Tuple[float, dict]]] = [[]]
+        cursor = (0, 0, float(BODY_TOP))  # page index, rows on page, next top
+        records: List[Record] = []
+        allocations: List[Allocation] = []
+        nca_count = 0
+
+        while True:
+            nca_count += 1
+            record, group_allocations, blocks = self._create_group(nca_count)
+
+            placed = self._place_blocks(blocks, cursor)
+            if placed is None:
+                break
+            placements, cursor = placed
+
+            for page_index, block_top, block in placements:
+                while page_index >= len(page_lines):
+                    page_lines.append([])
+                for i, line in enumerate(block):
+                    page_lines[page_index].append((block_top + i * LINE_HEIGHT, line))
+
+            records.append(record)
+            allocations.extend(group_allocations)
+
+        logger.info(
+            f"Generated {len(page_lines)} pages: {len(records)} records, "
+            f"{len(allocations)} allocations"
+        )
+        pdf = self._write_pdf(page_lines)
+        return pdf, NCAData(records=records, allocations=allocations)
+
+    # ---------------------
+    # layout
+    # ---------------------
+
+    def _place_blocks(
+        self, blocks: List[List[dict]], cursor: Tuple[int, int, float]
+    ) -> Tuple[List[Tuple[int, float, List[dict]]], Tuple[int, int, float]] | None:
+        """
+        page index and top of every block plus the cursor after the group,
+        or None when the group would need a page past the requested count
+        """
+        page_index, page_rows, top = cursor
+        if not self.straddle_pages:
+            group_rows = sum(len(block) for block in blocks)
+            group_height = group_rows * LINE_HEIGHT + (len(blocks) - 1) * BLOCK_GAP
+            if not self._fits(page_rows, group_rows, top, group_height):
+                page_index, page_rows, top = page_index + 1, 0, float(BODY_TOP)
+
+        placements = []
+        for block in blocks:
+            height = len(block) * LINE_HEIGHT
+            if not self._fits(page_rows, len(block), top, height):
+                page_index, page_rows, top = page_index + 1, 0, float(BODY_TOP)
+            if page_index >= self.pages:
+                return None
+            placements.append((page_index, top, block))
+            page_rows += len(block)
+            top += height + BLOCK_GAP
+        return placements, (page_index, page_rows, top)
+
+    def _fits(self, page_rows: int, rows: int, top: float, height: float) -> bool:
+        return (
+            page_rows + rows <= self.rows_per_page
+            and top + height <= PAGE_HEIGHT - BOTTOM_MARGIN
+        )
+
+    def _create_group(
+        self, nca_count: int
+    ) -> Tuple[Record, List[Allocation], List[List[dict]]]:
+        nca_number = (
+            f"BMB-{self.random.choice('ABCDE')}-{self.year % 100}-{nca_count:07d}"
+        )
+        released_date = date(self.year, 1, 1) + timedelta(
+            days=self.random.randrange(365)
+        )
+        department_lines = self._wrap(
+            self._words(_DEPARTMENT_WORDS, 2, 6), "department", 2
+        )
+        purpose_lines = self._wrap(
+            self._words(_PURPOSE_WORDS, 6, 30), "purpose", self.max_purpose_lines
+        )
+        nca_type = self.random.choice(_NCA_TYPES)
+
+        record = Record(
+            nca_number=nca_number,
+            nca_type=nca_type,
+            released_date=released_date.strftime("%Y-%m-%dT%H:%M:%S"),
+            department=" ".join(department_lines),
+            purpose=" ".join(purpose_lines),
+            release_id=self.release_id,
+        )
+
+        allocations: List[Allocation] = []
+        blocks: List[List[dict]] = []
+        for i in range(self.random.randint(1, self.max_allocations)):
+            agency_lines = self._wrap(self._words(_AGENCY_WORDS, 2, 8), "agency", 3)
+            unit_lines = self._wrap(
+                self._words(_UNIT_WORDS, 1, 4), "operating_unit", 2
+            )
+            amount = round(self.random.uniform(10_000, 500_000_000), 2)
+            allocations.append(
+                Allocation(
+                    nca_number=nca_number,
+                    agency=" ".join(agency_lines),
+                    operating_unit=" ".join(unit_lines),
+                    amount=amount,
+                )
+            )
+
+            columns = {
+                "agency": agency_lines,
+                "operating_unit": unit_lines,
+                "amount": [f"{amount:,.2f}"],
+            }
+            if i == 0:
+                columns.update(
+                    {
+                        "nca_number": [nca_number],
+                        "nca_type": [nca_type],
+                        "released_date": [released_date.strftime("%m/%d/%Y")],
+                        "department": department_lines,
+                        "purpose": purpose_lines,
+                    }
+                )
+            block_rows = max(len(lines) for lines in columns.values())
+            blocks.append(
+                [
+                    {
+                        column: lines[row]
+                        for column, lines in columns.items()
+                        if row < len(lines)
+                    }
+                    for row in range(block_rows)
+                ]
+            )
+
+        return record, allocations, blocks
+
+    def _words(
+        self, vocabulary: List[str], min_count: int, max_count: int
+    ) -> List[str]:
+        count = self.random.randint(min_count, max_count)
+        return [self.random.choice(vocabulary) for _ in range(count)]
+
+    def _wrap(self, words: List[str], column: str, max_lines: int) -> List[str]:
+        """greedy word wrap to the column width, extra words are dropped"""
+        max_width = self.column_ends[column] - self.column_starts[column] - CELL_PADDING
+        lines: List[str] = []
+        for word in words:
+            if lines and text_width(f"{lines[-1]} {word}") <= max_width:
+                lines[-1] = f"{lines[-1]} {word}"
+            elif len(lines) < max_lines:
+                lines.append(word)
+            else:
+                break
+        return lines
+
+    # ---------------------
+    # pdf writer
+    # ---------------------
+
+    def _write_pdf(self, page_lines: List[List[Tuple[float, dict]]]) -> BytesIO:
+        header = {column: column.replace("_", " ").upper() for column in VALID_COLUMNS}
+        pages_id = 2
+        font_id = 3
+        objects: List[bytes] = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"",  # page tree, written once the page ids are known
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            b"/Encoding /WinAnsiEncoding >>",
+        ]
+
+        page_ids = []
+        for lines in page_lines:
+            content = self._page_content(
+                [(HEADER_TOP, header)], HEADER_FONT_SIZE, align_amount=False
+            ) + self._page_content(lines, FONT_SIZE, align_amount=True)
+            stream = zlib.compress(content)
+            objects.append(
+                b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+                + stream
+                + b"\nendstream"
+            )
+            objects.append(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font_id, len(objects))
+            )
+            page_ids.append(len(objects))
+
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+        objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            kids,
+            len(page_ids),
+        )
+        timestamp = f"D:{self.year}0101000000+08'00'".encode()
+        objects.append(
+            b"<< /Producer (dbm-nca-ph synthetic) /CreationDate (%s) "
+            b"/ModDate (%s) >>" % (timestamp, timestamp)
+        )
+        info_id = len(objects)
+
+        pdf = BytesIO()
+        pdf.write(b"%PDF-1.4\n")
+        offsets = []
+        for i, obj in enumerate(objects, start=1):
+            offsets.append(pdf.tell())
+            pdf.write(b"%d 0 obj\n" % i + obj + b"\nendobj\n")
+        xref_offset = pdf.tell()
+        pdf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            pdf.write(b"%010d 00000 n \n" % offset)
+        pdf.write(
+            b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\n"
+            b"startxref\n%d\n%%%%EOF\n" % (len(objects) + 1, info_id, xref_offset)
+        )
+        pdf.seek(0)
+        return pdf
+
+    def _page_content(
+        self, lines: List[Tuple[float, dict]], font_size: float, align_amount: bool
+    ) -> bytes:
+        ascent = FONT_METRICS["Helvetica"][0]["Ascent"] * font_size / 1000
+        ops = [b"BT", b"/F1 %d Tf" % font_size]
+        for top, line in lines:
+            baseline = PAGE_HEIGHT - top - ascent
+            for column, text in line.items():
+                if column == "amount" and align_amount:
+                    # right aligned like the releases
+                    x = (
+                        self.column_ends[column]
+                        - CELL_PADDING
+                        - text_width(text, font_size)
+                    )
+                else:
+                    x = self.column_starts[column]
+                ops.append(
+                    b"1 0 0 1 %.2f %.2f Tm (%s) Tj"
+                    % (x, baseline, self._escape(text))
+                )
+        ops.append(b"ET")
+        return b"\n".join(ops) + b"\n"
+
+    def _escape(self, text: str) -> bytes:
+        return (
+            text.replace("\\", "\\\\")
+            .replace("(", "\\(")
+            .replace(")", "\\)")
+            .encode("cp1252")
+        )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Generate an nca release pdf and its expected NCAData"
+    )
+    arg_parser.add_argument("--pages", type=int, default=100)
+    arg_parser.add_argument("--rows-per-page", type=int, default=None)
+    arg_parser.add_argument("--max-purpose-lines", type=int, default=3)
+    arg_parser.add_argument("--max-allocations", type=int, default=3)
+    arg_parser.add_argument(
+        "--no-straddle",
+        action="store_true",
+        help="keep every nca group on a single page",
+    )
+    arg_parser.add_argument("--release-id", default="id_synthetic")
+    arg_parser.add_argument("--year", type=int, default=2026)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--out", default="synthetic_nca.pdf")
+    arg_parser.add_argument(
+        "--truth", default=None, help="defaults to <out>.json"
+    )
+    args = arg_parser.parse_args()
+
+    generator = SyntheticNCAPDF(
+        pages=args.pages,
+        rows_per_page=args.rows_per_page,
+        max_purpose_lines=args.max_purpose_lines,
+        max_allocations=args.max_allocations,
+        straddle_pages=not args.no_straddle,
+        release_id=args.release_id,
+        year=args.year,
+        seed=args.seed,
+    )
+    pdf, nca_data = generator.generate()
+
+    with open(args.out, "wb") as f:
+        f.write(pdf.getvalue())
+    truth_path = args.truth or f"{args.out}.json"
+    with open(truth_path, "w") as f:
+        json.dump(nca_data.model_dump(mode="json"), f)
+    logger.info(f"Saved {args.out} and {truth_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import logging
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import BaseModel
+
+from src.core.entities.span import Span
+from src.infrastructure.constants import LOCAL_TRACES_DIR, TRACE_REPORT_TOP
+from src.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class BatchTiming(BaseModel):
+    trace_id: str
+    release_id: str
+    batch_num: int
+    attempts: int  # process spans, > 1 when pages were re-enqueued
+    failures: int
+    queue_wait_s: float  # summed over attempts
+    processing_s: float  # summed over attempts
+    time_to_data_s: float  # trace start -> end of the last attempt
+
+
+class ReleaseTiming(BaseModel):
+    trace_id: str
+    release_id: str
+    batches: int
+    failures: int
+    release_queue_wait_s: float  # release queue, before the orchestrator
+    orchestrate_s: float
+    max_batch_queue_wait_s: float  # batch queue, before a worker
+    processing_s: float  # worker time summed over batches
+    time_to_data_s: float  # trace start -> last batch loaded
+
+
+def load_spans(paths: Iterable[str]) -> List[Span]:
+    """
+    span lines from ndjson files (or directories of them) written locally,
+    or from exported cloudwatch log lines (prefix before the json is ignored)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+            )
+        else:
+            files.append(path)
+
+    spans = []
+    for file_path in files:
+        with open(file_path) as f:
+            for line in f:
+                start = line.find('{"span"')
+                if start == -1:
+                    continue
+                try:
+                    spans.append(Span(**json.loads(line[start:])["span"]))
+                except Exception as e:
+                    logger.warning(f"Skipping invalid span line in {file_path}: {e}")
+    return spans
+
+
+def summarize(spans: List[Span]) -> Tuple[List[ReleaseTiming], List[BatchTiming]]:
+    """per release and per batch timings, slowest time-to-data first"""
+    orchestrate_spans: Dict[Tuple[str, str], List[Span]] = defaultdict(list)
+    process_spans: Dict[Tuple[str, str, int], List[Span]] = defaultdict(list)
+    for span in spans:
+        if span.release_id is None:
+            continue
+        if span.stage == "orchestrate":
+            orchestrate_spans[(span.trace_id, span.release_id)].append(span)
+        elif span.stage == "process" and span.batch_num is not None:
+            key = (span.trace_id, span.release_id, span.batch_num)
+            process_spans[key].append(span)
+
+    batch_timings = [
+        BatchTiming(
+            trace_id=trace_id,
+            release_id=release_id,
+            batch_num=batch_num,
+            attempts=len(batch_spans),
+            failures=sum(1 for s in batch_spans if s.status != "ok"),
+            queue_wait_s=sum(s.queue_wait_s for s in batch_spans),
+            processing_s=sum(s.processing_s for s in batch_spans),
+            time_to_data_s=max(s.time_to_data_s for s in batch_spans),
+        )
+        for (trace_id, release_id, batch_num), batch_spans in process_spans.items()
+    ]
+
+    batches_by_release: Dict[Tuple[str, str], List[BatchTiming]] = defaultdict(list)
+    for batch in batch_timings:
+        batches_by_release[(batch.trace_id, batch.release_id)].append(batch)
+
+    release_timings = []
+    for key in set(orchestrate_spans) | set(batches_by_release):
+        release_spans = orchestrate_spans.get(key, [])
+        batches = batches_by_release.get(key, [])
+        release_timings.append(
+            ReleaseTiming(
+                trace_id=key[0],
+                release_id=key[1],
+                batches=len(batches),
+                failures=sum(1 for s in release_spans if s.status != "ok")
+                + sum(b.failures for b in batches),
+                release_queue_wait_s=sum(s.queue_wait_s for s in release_spans),
+                orchestrate_s=sum(s.processing_s for s in release_spans),
+                max_batch_queue_wait_s=max(
+                    (b.queue_wait_s for b in batches), default=0.0
+                ),
+                processing_s=sum(b.processing_s for b in batches),
+                time_to_data_s=max(
+                    [b.time_to_data_s for b in batches]
+                    + [s.time_to_data_s for s in release_spans]
+                ),
+            )
+        )
+
+    release_timings.sort(key=lambda r: r.time_to_data_s, reverse=True)
+    batch_timings.sort(key=lambda b: b.time_to_data_s, reverse=True)
+    return release_timings, batch_timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Queue wait, processing time and time-to-data from trace spans"
+    )
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[LOCAL_TRACES_DIR],
+        help="span ndjson files/directories or exported cloudwatch logs",
+    )
+    arg_parser.add_argument("--top", type=int, default=TRACE_REPORT_TOP)
+    arg_parser.add_argument("--out", help="write all timings to this json file")
+    args = arg_parser.parse_args()
+
+    spans = load_spans(args.paths)
+    release_timings, batch_timings = summarize(spans)
+    logger.info(
+        f"Loaded {len(spans)} spans: {len(release_timings)} releases, "
+        f"{len(batch_timings)} batches"
+    )
+
+    logger.info(f"Slowest {args.top} releases (time-to-data):")
+    for r in release_timings[: args.top]:
+        logger.info(
+            f"{r.release_id} [{r.trace_id}]: {r.time_to_data_s:.1f}s to data, "
+            f"release queue wait {r.release_queue_wait_s:.1f}s, "
+            f"orchestrate {r.orchestrate_s:.1f}s, "
+            f"max batch queue wait {r.max_batch_queue_wait_s:.1f}s, "
+            f"processing {r.processing_s:.1f}s over {r.batches} batches, "
+            f"{r.failures} failures"
+        )
+
+    logger.info(f"Slowest {args.top} batches (time-to-data):")
+    for b in batch_timings[: args.top]:
+        logger.info(
+            f"{b.release_id} batch-{b.batch_num} [{b.trace_id}]: "
+            f"{b.time_to_data_s:.1f}s to data, queue wait {b.queue_wait_s:.1f}s, "
+            f"processing {b.processing_s:.1f}s, {b.attempts} attempts, "
+            f"{b.failures} failures"
+        )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                {
+                    "releases": [r.model_dump(mode="json") for r in release_timings],
+                    "batches": [b.model_dump(mode="json") for b in batch_timings],
+                },
+                f,
+                indent=2,
+            )
+        logger.info(f"Saved timings to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
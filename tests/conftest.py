@@ -0,0 +1,13 @@
+import os
+
+# src.infrastructure.config reads these when imported
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test")
+os.environ.setdefault("AWS_S3_BUCKET_NAME", "test")
+os.environ.setdefault(
+    "AWS_SQS_RELEASE_QUEUE_URL", "https://sqs.local/0/dbm-nca-ph-release-queue"
+)
+os.environ.setdefault(
+    "AWS_SQS_RELEASE_BATCH_QUEUE_URL",
+    "https://sqs.local/0/dbm-nca-ph-release-batch-queue",
+)
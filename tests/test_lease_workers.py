@@ -0,0 +1,170 @@
+from io import BytesIO
+from typing import List, Tuple
+
+import pytest
+from PyPDF2 import PdfWriter
+
+from src.core.entities.nca_data import NCAData
+from src.core.entities.release import Release
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.entities.work_lease import WorkLease
+from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+from src.core.use_cases.work_lease_claimer import WorkLeaseClaimer
+from src.core.use_cases.work_lease_completer import WorkLeaseCompleter
+from src.core.use_cases.work_lease_releaser import WorkLeaseReleaser
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.infrastructure.adapters.sqlite_work_lease import SQLiteWorkLease
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    RECORD_COLUMNS,
+    VALID_COLUMNS,
+)
+from src.lease_workers import drain_leases, process_lease
+from src.synthetic_nca_pdf import SyntheticNCAPDF
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=3,
+)
+
+
+class FakeRenewer:
+    def run(self, lease: WorkLease) -> bool:
+        return True
+
+
+class FakeDBLoader:
+    def __init__(self):
+        self.loaded: List[Tuple[NCAData, List[int] | None]] = []
+
+    def run(self, release, nca_data, batch_num, page_nums=None):
+        self.loaded.append((nca_data, page_nums))
+
+
+def create_lease(release: Release) -> WorkLease:
+    return WorkLease(
+        id="lease-1",
+        batch=ReleaseBatch(
+            batch_num=1, release=release, start_page_num=1, end_page_num=2
+        ),
+        worker_id="worker-0",
+        expires_at=0,
+    )
+
+
+def process(tmp_path, pdf: bytes, release: Release) -> FakeDBLoader:
+    storage = LocalStorage(base_storage_path=str(tmp_path))
+    storage.save_file(release.filename, pdf)
+    data_cleaner = PdDataCleaner(
+        allocation_comumns=ALLOCATION_COLUMNS,
+        record_columns=RECORD_COLUMNS,
+        valid_columns=VALID_COLUMNS,
+    )
+    extractor = RawTableExtractor(storage=storage, parser=PDFParser())
+    page_cleaner = PageTableCleaner(data_cleaner=data_cleaner)
+    db_loader = FakeDBLoader()
+    assert process_lease(
+        create_lease(release),
+        FileBytesMemoLoader(storage=storage),
+        extractor,
+        page_cleaner,
+        PageContinuationReader(
+            extractor=extractor, page_cleaner=page_cleaner, max_lookahead_pages=1
+        ),
+        PageStitcher(data_cleaner=data_cleaner),
+        db_loader,  # pyright: ignore
+        FakeRenewer(),  # pyright: ignore
+    )
+    return db_loader
+
+
+@pytest.mark.parametrize("reload", [False, True])
+def test_leased_pages_are_loaded_with_their_page_nums(tmp_path, reload):
+    pdf, _ = SyntheticNCAPDF(pages=3, release_id=RELEASE.id).generate()
+    release = RELEASE.model_copy(update={"reload": reload})
+
+    db_loader = process(tmp_path, pdf.getvalue(), release)
+
+    assert [page_nums for _, page_nums in db_loader.loaded] == [[1, 2]]
+    assert db_loader.loaded[0][0].records
+
+
+def test_leased_pages_without_tables_are_staged(tmp_path):
+    writer = PdfWriter()
+    for _ in range(RELEASE.page_count):
+        writer.add_blank_page(width=612, height=792)
+    pdf = BytesIO()
+    writer.write(pdf)
+
+    assert process(tmp_path, pdf.getvalue(), RELEASE).loaded == []
+
+    release = RELEASE.model_copy(update={"reload": True})
+    db_loader = process(tmp_path, pdf.getvalue(), release)
+
+    assert [page_nums for _, page_nums in db_loader.loaded] == [[1, 2]]
+    assert db_loader.loaded[0][0] == NCAData(records=[], allocations=[])
+
+
+def drain(work_lease: SQLiteWorkLease, process, worker_id="worker-0") -> int:
+    return drain_leases(
+        worker_id,
+        work_lease,
+        WorkLeaseClaimer(work_lease=work_lease, lease_duration_s=60),
+        WorkLeaseCompleter(work_lease=work_lease),
+        WorkLeaseReleaser(work_lease=work_lease),
+        process,
+        poll_interval_s=0.01,
+    )
+
+
+@pytest.fixture
+def work_lease(tmp_path):
+    work_lease = SQLiteWorkLease(
+        db_path=str(tmp_path / "work_leases.db"), max_attempts=2
+    )
+    work_lease.add_batches([create_lease(RELEASE).batch])
+    return work_lease
+
+
+def test_failed_chunk_is_released_and_retried(work_lease):
+    attempts = []
+
+    def process(lease: WorkLease) -> bool:
+        attempts.append(lease.attempts)
+        if lease.attempts == 1:
+            raise RuntimeError("worker crashed mid-chunk")
+        return True
+
+    assert drain(work_lease, process) == 1
+    assert attempts == [1, 2]
+    assert work_lease.count_remaining() == 0
+
+
+def test_chunk_failing_every_attempt_is_failed(work_lease):
+    attempts = []
+
+    def process(lease: WorkLease) -> bool:
+        attempts.append(lease.attempts)
+        return False
+
+    assert drain(work_lease, process) == 0
+    assert attempts == [1, 2]
+    assert work_lease.count_remaining() == 0
+
+
+def test_idle_worker_waits_for_another_workers_lease_to_expire(work_lease):
+    # the other worker crashed: its lease expires, nothing releases it
+    assert work_lease.claim("worker-1", 0.2)
+
+    assert drain(work_lease, lambda lease: True) == 1
+    assert work_lease.count_remaining() == 0
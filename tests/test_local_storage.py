@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.infrastructure.adapters.local_storage import LocalStorage
+
+
+def test_concurrent_writers_of_a_file_do_not_mix(tmp_path):
+    storage = LocalStorage(base_storage_path=str(tmp_path))
+    contents = [bytes([i]) * 100_000 for i in range(8)]
+
+    def write(data: bytes) -> None:
+        with storage.open_file_writer("raw/00001.json.gz") as f:
+            # interleave the writers' chunks
+            for i in range(0, len(data), 1000):
+                f.write(data[i: i + 1000])
+
+    with ThreadPoolExecutor(max_workers=len(contents)) as executor:
+        list(executor.map(write, contents))
+
+    loaded = storage.load_file("raw/00001.json.gz")
+    assert loaded is not None and bytes(loaded) in contents
+    assert storage.list_files("raw/") == ["raw/00001.json.gz"]
+    assert sorted(p.name for p in (tmp_path / "raw").iterdir()) == ["00001.json.gz"]
+
+
+def test_failed_write_leaves_no_file(tmp_path):
+    storage = LocalStorage(base_storage_path=str(tmp_path))
+
+    try:
+        with storage.open_file_writer("spool/a.ndjson.gz") as f:
+            f.write(b"partial")
+            raise RuntimeError("writer failed")
+    except RuntimeError:
+        pass
+
+    assert storage.load_file("spool/a.ndjson.gz") is None
+    assert list((tmp_path / "spool").iterdir()) == []
@@ -0,0 +1,154 @@
+from typing import List
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.record import Record
+from src.core.entities.release import Release
+from src.core.use_cases.nca_db_loader import NCADBLoader
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    RECORD_COLUMNS,
+    VALID_COLUMNS,
+)
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=4,
+)
+
+NCA_DATA = NCAData(
+    records=[
+        Record(
+            nca_number="A-1",
+            nca_type="REG",
+            released_date="2026-01-02T00:00:00",
+            department="Department of Health",
+            purpose="personnel services",
+            release_id=RELEASE.id,
+        )
+    ],
+    allocations=[
+        Allocation(
+            nca_number="A-1",
+            agency="Office of the Secretary",
+            operating_unit="Central Office",
+            amount=1000.0,
+        )
+    ],
+)
+
+
+class FakeRepository:
+    def __init__(self, swap_failures: int = 0):
+        self.staged_pages: List[int] = []
+        self.swap_failures = swap_failures
+        self.swap_count = 0
+        self.fold_count = 0
+
+    def load_batch(self, records, allocations):
+        return len(records), len(allocations)
+
+    def stage_batch(self, release, page_nums, records, allocations):
+        self.staged_pages.extend(page_nums)
+        is_complete = len(self.staged_pages) >= release.page_count
+        return len(records), len(allocations), is_complete
+
+    def complete_staged_release(self, release):
+        if self.swap_failures:
+            self.swap_failures -= 1
+            raise TimeoutError("canceling statement due to statement timeout")
+        if len(self.staged_pages) < release.page_count:
+            return False
+        # like the db, the swap consumes the staged rows
+        self.staged_pages = []
+        self.swap_count += 1
+        return True
+
+    def fold_summaries(self):
+        self.fold_count += 1
+        return 0, 0, 0
+
+
+def create_loader(repository, swap_max_attempts: int = 3) -> NCADBLoader:
+    return NCADBLoader(
+        repository=repository,  # pyright: ignore
+        swap_max_attempts=swap_max_attempts,
+        data_cleaner=PdDataCleaner(
+            allocation_comumns=ALLOCATION_COLUMNS,
+            record_columns=RECORD_COLUMNS,
+            valid_columns=VALID_COLUMNS,
+        ),
+    )
+
+
+def test_summaries_are_folded_after_every_loaded_batch():
+    repository = FakeRepository()
+    loader = create_loader(repository)
+
+    # out of order, the last batch first
+    loader.run(RELEASE, NCA_DATA, 2, [3, 4])
+    assert repository.fold_count == 1
+
+    loader.run(RELEASE, NCA_DATA, 1, [1, 2])
+    assert repository.fold_count == 2
+
+
+def test_summaries_are_folded_without_page_nums():
+    repository = FakeRepository()
+
+    create_loader(repository).run(RELEASE, NCA_DATA, 1)
+
+    assert repository.fold_count == 1
+
+
+def test_empty_batch_is_not_folded():
+    repository = FakeRepository()
+
+    create_loader(repository).run(
+        RELEASE, NCAData(records=[], allocations=[]), 2, [3, 4]
+    )
+
+    assert repository.fold_count == 0
+
+
+def test_summaries_are_folded_after_a_staged_swap():
+    repository = FakeRepository()
+    loader = create_loader(repository)
+    release = RELEASE.model_copy(update={"reload": True})
+
+    # out of order: the swap comes with the last page staged, not page 4
+    loader.run(release, NCA_DATA, 2, [3, 4])
+    assert repository.fold_count == 0
+
+    loader.run(release, NCA_DATA, 1, [1, 2])
+    assert repository.fold_count == 1
+
+
+def test_failed_swap_is_retried_after_the_staging_call():
+    repository = FakeRepository(swap_failures=1)
+    loader = create_loader(repository)
+    release = RELEASE.model_copy(update={"reload": True})
+
+    loader.run(release, NCA_DATA, 1, [1, 2, 3, 4])
+
+    assert repository.swap_count == 1
+    assert repository.fold_count == 1
+
+
+def test_swap_failing_every_attempt_is_left_to_the_next_staging():
+    repository = FakeRepository(swap_failures=2)
+    loader = create_loader(repository, swap_max_attempts=2)
+    release = RELEASE.model_copy(update={"reload": True})
+
+    loader.run(release, NCA_DATA, 1, [1, 2, 3, 4])
+    assert repository.swap_count == 0
+    assert repository.fold_count == 0
+
+    # the retried batch stages its pages again, and the swap goes through
+    loader.run(release, NCA_DATA, 1, [1, 2, 3, 4])
+    assert repository.swap_count == 1
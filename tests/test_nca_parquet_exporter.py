@@ -0,0 +1,115 @@
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.record import Record
+from src.core.entities.release import Release
+from src.core.use_cases.nca_parquet_exporter import (
+    NCAParquetExporter,
+    get_export_prefix,
+)
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.parquet_columnar import ParquetColumnar
+from src.infrastructure.constants import EXPORT_STORAGE_PREFIX
+from src.query_exports import aggregate, read_table
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=8,
+)
+
+
+def create_nca_data(*rows) -> NCAData:
+    """rows are (nca_number, amount)"""
+    records = {
+        nca_number: Record(
+            nca_number=nca_number,
+            nca_type="REG",
+            released_date="2026-01-02T00:00:00",
+            department="Department of Health",
+            purpose="personnel services",
+            release_id=RELEASE.id,
+        )
+        for nca_number, _ in rows
+    }
+    allocations = [
+        Allocation(
+            nca_number=nca_number,
+            agency="Office of the Secretary",
+            operating_unit="Central Office",
+            amount=amount,
+        )
+        for nca_number, amount in rows
+    ]
+    return NCAData(records=list(records.values()), allocations=allocations)
+
+
+def create_exporter(storage) -> NCAParquetExporter:
+    return NCAParquetExporter(
+        storage=storage,
+        columnar=ParquetColumnar(),
+        storage_prefix=EXPORT_STORAGE_PREFIX,
+    )
+
+
+def get_exported_files(storage, table: str):
+    prefix = get_export_prefix(EXPORT_STORAGE_PREFIX, table, RELEASE)
+    return sorted(
+        filename.rsplit("/", 1)[-1] for filename in storage.list_files(prefix)
+    )
+
+
+def test_retry_split_elsewhere_replaces_the_overlapped_files(tmp_path):
+    storage = LocalStorage(base_storage_path=str(tmp_path))
+    exporter = create_exporter(storage)
+    # first run: split at page 7, its remainder exported pages 7-8
+    exporter.run(RELEASE, create_nca_data(("A-5", 5.0)), 3, [5, 6])
+    exporter.run(RELEASE, create_nca_data(("A-7", 7.0)), 3, [7, 8])
+
+    # the retry got further before its deadline, then its remainder ran
+    exporter.run(RELEASE, create_nca_data(("A-5", 5.0), ("A-7", 7.0)), 3, [5, 6, 7])
+    assert get_exported_files(storage, "records") == ["00005-00007.parquet"]
+    exporter.run(RELEASE, create_nca_data(("A-8", 8.0)), 3, [8])
+
+    assert get_exported_files(storage, "allocations") == [
+        "00005-00007.parquet",
+        "00008-00008.parquet",
+    ]
+    result = aggregate(
+        read_table(storage, "records"),  # pyright: ignore
+        read_table(storage, "allocations"),  # pyright: ignore
+        ["release_id"],
+    ).to_pylist()
+    assert result == [
+        {
+            "release_id": RELEASE.id,
+            "record_count": 3,
+            "allocation_count": 3,
+            "total_amount": 20.0,
+        }
+    ]
+
+
+def test_record_exported_by_two_batches_is_counted_once(tmp_path):
+    storage = LocalStorage(base_storage_path=str(tmp_path))
+    exporter = create_exporter(storage)
+    # A-4 is repeated at the top of page 5, the next batch's first page
+    exporter.run(RELEASE, create_nca_data(("A-1", 1.0), ("A-4", 4.0)), 1, [1, 4])
+    exporter.run(RELEASE, create_nca_data(("A-4", 5.0)), 2, [5, 8])
+
+    result = aggregate(
+        read_table(storage, "records"),  # pyright: ignore
+        read_table(storage, "allocations"),  # pyright: ignore
+        ["release_id"],
+    ).to_pylist()
+
+    assert result == [
+        {
+            "release_id": RELEASE.id,
+            "record_count": 2,
+            "allocation_count": 3,
+            "total_amount": 10.0,
+        }
+    ]
@@ -0,0 +1,117 @@
+from typing import Dict, List
+
+from src.core.entities.page_rows import PageRows
+from src.core.entities.release import Release
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_cache import RawTableCache
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+from src.infrastructure.adapters.local_storage import LocalStorage
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=5,
+)
+HEADER = ["nca_number", "operating_unit", "amount"]
+
+
+class FakeParser:
+    def __init__(self, tables: Dict[int, List[List[str | None]]]):
+        self.tables = tables
+        self.extracted: List[int] = []
+
+    def get_version(self) -> str:
+        return "fake-1"
+
+    def extract_table_by_page_num(self, data, page_num):
+        self.extracted.append(page_num)
+        return self.tables.get(page_num, [])
+
+
+class FakeDataCleaner:
+    """a row with an nca number starts a group, the rows before it lead"""
+
+    def split_page(self, raw_rows, page_num) -> PageRows:
+        rows = raw_rows[1:]
+        group_starts = [i for i, row in enumerate(rows) if row[0]]
+        first_start = group_starts[0] if group_starts else len(rows)
+        return PageRows(
+            page_num=page_num,
+            header=raw_rows[0],
+            leading_rows=rows[:first_start],
+            closed_rows=[],
+            trailing_rows=rows[first_start:],
+            has_group_start=bool(group_starts),
+        )
+
+
+def create_reader(parser, storage=None) -> PageContinuationReader:
+    cache = (
+        RawTableCache(storage=storage, parser=parser, storage_prefix="raw")
+        if storage
+        else None
+    )
+    return PageContinuationReader(
+        extractor=RawTableExtractor(
+            storage=storage, parser=parser, cache=cache  # pyright: ignore
+        ),
+        page_cleaner=PageTableCleaner(data_cleaner=FakeDataCleaner()),
+        max_lookahead_pages=3,
+    )
+
+
+def test_reads_until_a_page_starts_a_group():
+    parser = FakeParser(
+        {
+            2: [HEADER, [None, "Region II", "1.0"]],
+            3: [HEADER, [None, "Region III", "2.0"], ["A-2", "Region I", "3.0"]],
+            4: [HEADER, [None, "Region IV", "4.0"]],
+        }
+    )
+
+    pages = create_reader(parser).run(b"pdf", RELEASE, 1)
+
+    assert parser.extracted == [2, 3]
+    assert [page.leading_rows for page in pages] == [
+        [[None, "Region II", "1.0"]],
+        [[None, "Region III", "2.0"]],
+    ]
+    # only the continuation is kept, the page's own groups are its batch's
+    assert pages[1].trailing_rows == [] and not pages[1].has_group_start
+
+
+def test_stops_at_a_page_without_a_table():
+    parser = FakeParser({3: [HEADER, [None, "Region III", "2.0"]]})
+
+    assert create_reader(parser).run(b"pdf", RELEASE, 1) == []
+    assert parser.extracted == [2]
+
+
+def test_stops_at_the_last_page():
+    parser = FakeParser({5: [HEADER, [None, "Region V", "1.0"]]})
+
+    pages = create_reader(parser).run(b"pdf", RELEASE, 4)
+
+    assert [page.page_num for page in pages] == [5]
+    assert parser.extracted == [5]
+
+
+def test_pages_are_read_through_the_raw_table_cache(tmp_path):
+    storage = LocalStorage(base_storage_path=str(tmp_path))
+    parser = FakeParser({2: [HEADER, ["A-2", "Region I", "1.0"]]})
+    data = b"pdf"
+
+    # the page's own batch extracted (and cached) it first
+    RawTableExtractor(
+        storage=storage,
+        parser=parser,  # pyright: ignore
+        cache=RawTableCache(storage=storage, parser=parser, storage_prefix="raw"),
+    ).run(data, 2)
+    pages = create_reader(parser, storage).run(data, RELEASE, 1)
+
+    assert parser.extracted == [2]
+    assert [page.page_num for page in pages] == [2]
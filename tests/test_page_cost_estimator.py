@@ -0,0 +1,58 @@
+import pytest
+
+from src.core.entities.release import Release
+from src.core.use_cases.page_cost_estimator import PageCostEstimator
+from src.core.use_cases.release_batcher import ReleaseBatcher
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.synthetic_nca_pdf import SyntheticNCAPDF
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=6,
+)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(base_storage_path=str(tmp_path))
+
+
+def estimate(storage, rows_per_page: int | None = None):
+    pdf, _ = SyntheticNCAPDF(pages=6, rows_per_page=rows_per_page).generate()
+    storage.save_file(RELEASE.filename, pdf.getvalue())
+    return PageCostEstimator(storage=storage, parser=PDFParser()).run(RELEASE)
+
+
+def test_denser_pages_cost_more(storage):
+    sparse_costs = estimate(storage, rows_per_page=4)
+    dense_costs = estimate(storage)
+
+    assert sparse_costs and dense_costs
+    assert len(dense_costs) == RELEASE.page_count
+    assert min(dense_costs) > 2 * max(sparse_costs)
+
+
+def test_estimated_costs_batch_every_page(storage):
+    page_costs = estimate(storage)
+    batcher = ReleaseBatcher(
+        batch_size=10, target_batch_duration_s=2.0, avg_page_duration_s=1.0
+    )
+
+    batches = batcher.run(RELEASE, page_costs)
+
+    page_nums = [
+        page_num
+        for batch in batches
+        for page_num in range(batch.start_page_num, batch.end_page_num + 1)
+    ]
+    assert page_nums == list(range(1, RELEASE.page_count + 1))
+    assert len(batches) > 1
+
+
+def test_missing_file_has_no_costs(storage):
+    assert PageCostEstimator(storage=storage, parser=PDFParser()).run(RELEASE) is None
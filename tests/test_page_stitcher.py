@@ -0,0 +1,139 @@
+from typing import List
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.page_nca_data import PageNCAData
+from src.core.entities.record import Record
+from src.core.use_cases.page_stitcher import PageStitcher
+
+RELEASE_ID = "id_2026"
+HEADER = ["nca_number", "operating_unit", "amount"]
+
+
+class FakeDataCleaner:
+    """rows are [nca_number or None, operating_unit, amount]"""
+
+    def clean_raw_data(self, raw_rows, release_id) -> NCAData:
+        return create_nca_data(raw_rows[1:])
+
+
+def create_nca_data(rows) -> NCAData:
+    records = {}
+    allocations = []
+    nca_number = None
+    for row_nca_number, operating_unit, amount in rows:
+        nca_number = row_nca_number or nca_number
+        records[nca_number] = Record(
+            nca_number=nca_number,
+            nca_type="REG",
+            released_date="2026-01-02T00:00:00",
+            department="Department of Health",
+            purpose="personnel services",
+            release_id=RELEASE_ID,
+        )
+        allocations.append(
+            Allocation(
+                nca_number=nca_number,
+                agency="Office of the Secretary",
+                operating_unit=operating_unit,
+                amount=float(amount),
+            )
+        )
+    return NCAData(records=list(records.values()), allocations=allocations)
+
+
+def create_page(
+    page_num: int, leading_rows=(), closed_rows=(), trailing_rows=()
+) -> PageNCAData:
+    return PageNCAData(
+        page_num=page_num,
+        header=HEADER,
+        leading_rows=list(leading_rows),
+        nca_data=create_nca_data(closed_rows),
+        trailing_rows=list(trailing_rows),
+        has_group_start=bool(closed_rows or trailing_rows),
+    )
+
+
+def stitch(pages: List[PageNCAData]) -> NCAData:
+    return PageStitcher(data_cleaner=FakeDataCleaner()).run(  # pyright: ignore
+        pages, RELEASE_ID
+    )
+
+
+def get_rows(nca_data: NCAData):
+    return [
+        (allocation.nca_number, allocation.operating_unit, allocation.amount)
+        for allocation in nca_data.allocations
+    ]
+
+
+def test_open_group_is_closed_with_the_next_pages_leading_rows():
+    pages = [
+        create_page(2, leading_rows=[[None, "Region II", "1.0"]]),
+        create_page(3, leading_rows=[[None, "Region III", "2.0"]]),
+        create_page(
+            1,
+            closed_rows=[["A-1", "Central Office", "3.0"]],
+            trailing_rows=[["A-2", "Region I", "4.0"]],
+        ),
+    ]
+
+    nca_data = stitch(pages)
+
+    assert [record.nca_number for record in nca_data.records] == ["A-1", "A-2"]
+    assert get_rows(nca_data) == [
+        ("A-1", "Central Office", 3.0),
+        ("A-2", "Region I", 4.0),
+        ("A-2", "Region II", 1.0),
+        ("A-2", "Region III", 2.0),
+    ]
+
+
+def test_leading_rows_without_an_open_group_are_skipped():
+    pages = [create_page(5, leading_rows=[[None, "Region V", "1.0"]])]
+
+    nca_data = stitch(pages)
+
+    assert nca_data == NCAData(records=[], allocations=[])
+
+
+def test_group_repeated_at_the_top_of_the_next_page_is_kept_once():
+    # page 2 repeats page 1's trailing group, then continues it
+    pages = [
+        create_page(1, trailing_rows=[["A-1", "Region I", "1.0"]]),
+        create_page(
+            2,
+            closed_rows=[
+                ["A-1", "Region I", "1.0"],
+                [None, "Region II", "2.0"],
+            ],
+            trailing_rows=[["A-2", "Region I", "3.0"]],
+        ),
+    ]
+
+    nca_data = stitch(pages)
+
+    assert [record.nca_number for record in nca_data.records] == ["A-1", "A-2"]
+    assert get_rows(nca_data) == [
+        ("A-1", "Region I", 1.0),
+        ("A-1", "Region II", 2.0),
+        ("A-2", "Region I", 3.0),
+    ]
+
+
+def test_rows_repeated_within_a_group_are_kept():
+    pages = [
+        create_page(
+            1,
+            closed_rows=[
+                ["A-1", "Region I", "1.0"],
+                [None, "Region I", "1.0"],
+            ],
+        )
+    ]
+
+    assert get_rows(stitch(pages)) == [
+        ("A-1", "Region I", 1.0),
+        ("A-1", "Region I", 1.0),
+    ]
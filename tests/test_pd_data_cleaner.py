@@ -0,0 +1,89 @@
+import pytest
+
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    RECORD_COLUMNS,
+    VALID_COLUMNS,
+)
+
+RELEASE_ID = "id_2026"
+HEADER = [
+    "NCA NUMBER",
+    "NCA TYPE",
+    "RELEASED DATE",
+    "DEPARTMENT",
+    "AGENCY",
+    "OPERATING UNIT",
+    "AMOUNT",
+    "PURPOSE",
+]
+
+
+BLANK = [""] * len(HEADER)
+
+
+def create_row(nca_number: str, operating_unit: str, amount: str):
+    if not nca_number:
+        return ["", "", "", "", "Office", operating_unit, amount, ""]
+    return [
+        nca_number,
+        "REG",
+        "01/02/2026",
+        "Health",
+        "Office",
+        operating_unit,
+        amount,
+        "personnel services",
+    ]
+
+
+@pytest.fixture
+def data_cleaner():
+    return PdDataCleaner(
+        allocation_comumns=ALLOCATION_COLUMNS,
+        record_columns=RECORD_COLUMNS,
+        valid_columns=VALID_COLUMNS,
+    )
+
+
+def test_page_is_split_into_leading_closed_and_trailing_groups(data_cleaner):
+    raw_rows = [
+        HEADER,
+        create_row("", "Region I", "1.00"),
+        BLANK,
+        create_row("A-2", "Central Office", "2.00"),
+        BLANK,
+        create_row("", "Region II", "3.00"),
+        # a header repeated mid-table is not a row
+        HEADER,
+        create_row("A-3", "Central Office", "4.00"),
+    ]
+
+    page_rows = data_cleaner.split_page(raw_rows, 2)
+
+    assert page_rows.has_group_start
+    assert page_rows.leading_rows == [create_row("", "Region I", "1.00"), BLANK]
+    assert page_rows.closed_rows == raw_rows[3:6]
+    assert page_rows.trailing_rows == [create_row("A-3", "Central Office", "4.00")]
+
+    page = PageTableCleaner(data_cleaner=data_cleaner).run(raw_rows, RELEASE_ID, 2)
+
+    assert page.leading_rows == page_rows.leading_rows
+    assert [record.nca_number for record in page.nca_data.records] == ["A-2"]
+    assert [a.operating_unit for a in page.nca_data.allocations] == [
+        "Central Office",
+        "Region II",
+    ]
+    assert page.trailing_rows == [create_row("A-3", "Central Office", "4.00")]
+
+
+def test_page_without_a_group_start_only_continues(data_cleaner):
+    raw_rows = [HEADER, create_row("", "Region I", "1.00")]
+
+    page_rows = data_cleaner.split_page(raw_rows, 3)
+
+    assert not page_rows.has_group_start
+    assert page_rows.leading_rows == raw_rows[1:]
+    assert page_rows.closed_rows == [] and page_rows.trailing_rows == []
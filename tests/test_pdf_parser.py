@@ -0,0 +1,112 @@
+import pytest
+
+from src.core.entities.release import Release
+from src.core.use_cases.page_continuation_reader import PageContinuationReader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    RECORD_COLUMNS,
+    VALID_COLUMNS,
+)
+from src.synthetic_nca_pdf import SyntheticNCAPDF
+
+RELEASE_ID = "id_2026"
+
+
+@pytest.fixture(scope="module")
+def synthetic_release():
+    pdf, nca_data = SyntheticNCAPDF(pages=3, release_id=RELEASE_ID).generate()
+    return pdf.getvalue(), nca_data
+
+
+@pytest.fixture
+def data_cleaner():
+    return PdDataCleaner(
+        allocation_comumns=ALLOCATION_COLUMNS,
+        record_columns=RECORD_COLUMNS,
+        valid_columns=VALID_COLUMNS,
+    )
+
+
+def test_extract_table_by_page_num_is_one_based(synthetic_release):
+    data, nca_data = synthetic_release
+    parser = PDFParser()
+
+    first_page = parser.extract_table_by_page_num(data, 1)
+    cells = [cell for row in first_page for cell in row if cell]
+    assert nca_data.records[0].nca_number in cells
+
+    page_count = parser.get_page_count(data)
+    assert parser.extract_table_by_page_num(data, page_count)
+    assert parser.extract_table_by_page_num(data, 0) == []
+    assert parser.extract_table_by_page_num(data, page_count + 1) == []
+
+
+def test_stitched_pages_match_expected(synthetic_release, data_cleaner):
+    data, expected = synthetic_release
+    parser = PDFParser()
+    page_cleaner = PageTableCleaner(data_cleaner=data_cleaner)
+
+    pages = [
+        page_cleaner.run(
+            parser.extract_table_by_page_num(data, page_num), RELEASE_ID, page_num
+        )
+        for page_num in range(1, parser.get_page_count(data) + 1)
+    ]
+    nca_data = PageStitcher(data_cleaner=data_cleaner).run(pages, RELEASE_ID)
+
+    # stitched groups close after the page's own groups, compare unordered
+    assert sorted(nca_data.records, key=lambda r: r.nca_number) == sorted(
+        expected.records, key=lambda r: r.nca_number
+    )
+    assert sorted(a.model_dump_json() for a in nca_data.allocations) == sorted(
+        a.model_dump_json() for a in expected.allocations
+    )
+
+
+def test_single_page_batches_stitch_to_expected(
+    synthetic_release, data_cleaner, tmp_path
+):
+    # every page is its own batch: groups straddle every batch boundary
+    data, expected = synthetic_release
+    parser = PDFParser()
+    release = Release(
+        id=RELEASE_ID,
+        title="NCA 2026",
+        url="https://example.com/nca_2026.pdf",
+        filename="nca_2026.pdf",
+        year=2026,
+        page_count=parser.get_page_count(data),
+    )
+    extractor = RawTableExtractor(
+        storage=LocalStorage(base_storage_path=str(tmp_path)), parser=parser
+    )
+    page_cleaner = PageTableCleaner(data_cleaner=data_cleaner)
+    continuation_reader = PageContinuationReader(
+        extractor=extractor, page_cleaner=page_cleaner, max_lookahead_pages=2
+    )
+    stitcher = PageStitcher(data_cleaner=data_cleaner)
+
+    records = []
+    allocations = []
+    for page_num in range(1, release.page_count + 1):
+        table = extractor.run(data, page_num)
+        assert table
+        pages = [page_cleaner.run(table, RELEASE_ID, page_num)]
+        pages.extend(continuation_reader.run(data, release, page_num))
+        nca_data = stitcher.run(pages, RELEASE_ID)
+        records.extend(nca_data.records)
+        allocations.extend(nca_data.allocations)
+
+    # each group is loaded once, by the batch it starts in
+    assert sorted(r.nca_number for r in records) == sorted(
+        r.nca_number for r in expected.records
+    )
+    assert sorted(a.model_dump_json() for a in allocations) == sorted(
+        a.model_dump_json() for a in expected.allocations
+    )
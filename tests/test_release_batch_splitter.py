@@ -0,0 +1,47 @@
+import pytest
+
+from src.core.entities.release import Release
+from src.core.entities.release_batch import ReleaseBatch
+from src.core.use_cases.release_batch_splitter import ReleaseBatchSplitter
+
+BATCH = ReleaseBatch(
+    batch_num=3,
+    release=Release(
+        id="id_2026",
+        title="NCA 2026",
+        url="https://example.com/nca_2026.pdf",
+        filename="nca_2026.pdf",
+        year=2026,
+        page_count=20,
+    ),
+    start_page_num=9,
+    end_page_num=12,
+)
+
+
+def test_remaining_pages_keep_the_batch_num():
+    remaining_batch = ReleaseBatchSplitter().run(BATCH, 11)
+
+    assert remaining_batch == BATCH.model_copy(
+        update={"start_page_num": 11, "split_num": 1}
+    )
+    assert remaining_batch.batch_id == "3.1"
+
+
+def test_remainder_of_a_remainder_gets_the_next_split_num():
+    remaining_batch = ReleaseBatchSplitter().run(BATCH, 10)
+    assert remaining_batch
+
+    remaining_batch = ReleaseBatchSplitter().run(remaining_batch, 12)
+
+    assert remaining_batch
+    assert (remaining_batch.start_page_num, remaining_batch.batch_id) == (12, "3.2")
+
+
+def test_finished_batch_has_no_remaining_pages():
+    assert ReleaseBatchSplitter().run(BATCH, 13) is None
+
+
+def test_batch_without_progress_is_not_split():
+    with pytest.raises(ValueError):
+        ReleaseBatchSplitter().run(BATCH, 9)
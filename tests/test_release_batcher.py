@@ -0,0 +1,107 @@
+from io import BytesIO
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from src.core.entities.release import Release
+from src.core.use_cases.release_batcher import ReleaseBatcher
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.synthetic_nca_pdf import SyntheticNCAPDF
+
+
+def create_release(page_count: int) -> Release:
+    return Release(
+        id="id_2026",
+        title="NCA 2026",
+        url="https://example.com/nca_2026.pdf",
+        filename="nca_2026.pdf",
+        year=2026,
+        page_count=page_count,
+    )
+
+
+def get_page_ranges(batches):
+    return [(batch.start_page_num, batch.end_page_num) for batch in batches]
+
+
+def test_fixed_batches_cover_every_page():
+    batches = ReleaseBatcher(batch_size=4).run(create_release(10))
+
+    assert get_page_ranges(batches) == [(1, 4), (5, 8), (9, 10)]
+    assert [batch.batch_num for batch in batches] == [1, 2, 3]
+
+
+def test_weighted_batches_close_at_the_target_duration():
+    batcher = ReleaseBatcher(
+        batch_size=4, target_batch_duration_s=4.0, avg_page_duration_s=1.0
+    )
+    # mean cost 2: pages 3 and 4 take 2s each, the others 0.5s
+    page_costs = [1.0, 1.0, 4.0, 4.0, 1.0, 1.0, 1.0, 1.0, 1.0, 5.0]
+
+    batches = batcher.run(create_release(len(page_costs)), page_costs)
+
+    assert get_page_ranges(batches) == [(1, 3), (4, 8), (9, 10)]
+
+
+def test_weighted_batches_are_capped_at_max_batch_size():
+    batcher = ReleaseBatcher(
+        batch_size=4,
+        target_batch_duration_s=100.0,
+        avg_page_duration_s=1.0,
+        max_batch_size=3,
+    )
+
+    batches = batcher.run(create_release(7), [1.0] * 7)
+
+    assert get_page_ranges(batches) == [(1, 3), (4, 6), (7, 7)]
+
+
+def test_weighted_batches_fall_back_on_a_page_count_mismatch():
+    batcher = ReleaseBatcher(
+        batch_size=4, target_batch_duration_s=4.0, avg_page_duration_s=1.0
+    )
+
+    batches = batcher.run(create_release(10), [1.0] * 9)
+
+    assert get_page_ranges(batches) == [(1, 4), (5, 8), (9, 10)]
+
+
+def test_page_over_the_target_duration_is_batched_alone():
+    batcher = ReleaseBatcher(
+        batch_size=4, target_batch_duration_s=2.0, avg_page_duration_s=1.0
+    )
+
+    batches = batcher.run(create_release(4), [1.0, 1.0, 10.0, 1.0])
+
+    assert get_page_ranges(batches) == [(1, 2), (3, 3), (4, 4)]
+
+
+def test_blank_pages_are_weighted_as_average_pages():
+    batcher = ReleaseBatcher(
+        batch_size=2, target_batch_duration_s=4.0, avg_page_duration_s=1.0
+    )
+
+    batches = batcher.run(create_release(10), [0.0] * 10)
+
+    assert get_page_ranges(batches) == [(1, 4), (5, 8), (9, 10)]
+
+
+def test_page_costs_follow_the_page_numbers():
+    # a blank 2nd page: its cost and its table are both the 2nd page's
+    pdf, _ = SyntheticNCAPDF(pages=2).generate()
+    reader = PdfReader(pdf)
+    writer = PdfWriter()
+    writer.add_page(reader.pages[0])
+    writer.add_blank_page()
+    writer.add_page(reader.pages[1])
+    out = BytesIO()
+    writer.write(out)
+    data = out.getvalue()
+    parser = PDFParser()
+
+    page_costs = parser.get_page_costs(data)
+
+    assert len(page_costs) == parser.get_page_count(data) == 3
+    assert page_costs[1] == 0.0
+    assert page_costs[0] > 0.0 and page_costs[2] > 0.0
+    assert parser.extract_table_by_page_num(data, 2) == []
+    assert parser.extract_table_by_page_num(data, 3)
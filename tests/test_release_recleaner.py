@@ -0,0 +1,147 @@
+from io import BytesIO
+from typing import Dict, List, Set
+
+import pytest
+
+from src.core.entities.release import Release
+from src.core.use_cases.file_stream_memo_loader import FileBytesMemoLoader
+from src.core.use_cases.page_stitcher import PageStitcher
+from src.core.use_cases.page_table_cleaner import PageTableCleaner
+from src.core.use_cases.raw_table_cache import RawTableCache
+from src.core.use_cases.raw_table_extractor import RawTableExtractor
+from src.core.use_cases.release_recleaner import ReleaseRecleaner
+from src.core.use_cases.releases_scraper import ReleasesScraper
+from src.infrastructure.adapters.local_storage import LocalStorage
+from src.infrastructure.adapters.pd_data_cleaner import PdDataCleaner
+from src.infrastructure.adapters.pdf_parser import PDFParser
+from src.infrastructure.constants import (
+    ALLOCATION_COLUMNS,
+    RECORD_COLUMNS,
+    VALID_COLUMNS,
+)
+from src.synthetic_nca_pdf import SyntheticNCAPDF
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+)
+
+
+class FakeScraper:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def get_releases(self, oldest_year: int) -> List[Release]:
+        return [RELEASE.model_copy()]
+
+    def download_release(self, release: Release) -> BytesIO:
+        return BytesIO(self.data)
+
+
+class FakeRepository:
+    """
+    keeps copies of the releases like the db does, and swaps a staged
+    release once its page count is reached like complete_staged_release
+    """
+
+    def __init__(self):
+        self.releases: Dict[str, Release] = {}
+        self.staged_pages: Dict[str, Set[int]] = {}
+        self.staged_records: Dict[str, list] = {}
+        self.page_counts: List[int] = []
+        self.live_records: Dict[str, list] = {}
+        self.fold_count = 0
+
+    def get_release(self, id: str) -> Release | None:
+        release = self.releases.get(id)
+        return release.model_copy() if release else None
+
+    def upsert_release(self, release: Release) -> None:
+        self.releases[release.id] = release.model_copy()
+
+    def clear_staged_release(self, id: str) -> None:
+        self.staged_pages.pop(id, None)
+        self.staged_records.pop(id, None)
+
+    def fold_summaries(self):
+        self.fold_count += 1
+        return 0, 0, 0
+
+    def stage_batch(self, release, page_nums, records, allocations):
+        self.page_counts.append(release.page_count)
+        self.staged_pages.setdefault(release.id, set()).update(page_nums)
+        self.staged_records.setdefault(release.id, []).extend(records)
+        is_complete = len(self.staged_pages[release.id]) >= release.page_count
+        return len(records), len(allocations), is_complete
+
+    def complete_staged_release(self, release):
+        if len(self.staged_pages.get(release.id, ())) < release.page_count:
+            return False
+        self.live_records[release.id] = self.staged_records[release.id]
+        self.clear_staged_release(release.id)
+        return True
+
+
+@pytest.fixture
+def data_cleaner():
+    return PdDataCleaner(
+        allocation_comumns=ALLOCATION_COLUMNS,
+        record_columns=RECORD_COLUMNS,
+        valid_columns=VALID_COLUMNS,
+    )
+
+
+def test_scraped_release_is_stored_with_its_page_count(tmp_path):
+    pdf, _ = SyntheticNCAPDF(pages=2, release_id=RELEASE.id).generate()
+    repository = FakeRepository()
+    scraper_job = ReleasesScraper(
+        scraper=FakeScraper(pdf.getvalue()),
+        storage=LocalStorage(base_storage_path=str(tmp_path)),
+        parser=PDFParser(),
+        repository=repository,
+    )
+
+    releases = scraper_job.run(oldest_release_year=2026)
+
+    assert [release.page_count for release in releases] == [2]
+    assert repository.get_release(RELEASE.id).page_count == 2  # pyright: ignore
+
+
+def test_reclean_release_read_back_from_the_repository(tmp_path, data_cleaner):
+    pdf, expected = SyntheticNCAPDF(pages=3, release_id=RELEASE.id).generate()
+    storage = LocalStorage(base_storage_path=str(tmp_path))
+    storage.save_file(RELEASE.filename, pdf.getvalue())
+    parser = PDFParser()
+    repository = FakeRepository()
+    # a row written before the page count was known
+    repository.upsert_release(RELEASE)
+    recleaner_job = ReleaseRecleaner(
+        file_bytes_loader=FileBytesMemoLoader(storage=storage),
+        parser=parser,
+        extractor=RawTableExtractor(
+            storage=storage,
+            parser=parser,
+            cache=RawTableCache(
+                storage=storage, parser=parser, storage_prefix="raw_cache"
+            ),
+        ),
+        page_cleaner=PageTableCleaner(data_cleaner=data_cleaner),
+        stitcher=PageStitcher(data_cleaner=data_cleaner),
+        repository=repository,
+        load_rows=50,
+        max_workers=2,
+    )
+
+    release = repository.get_release(RELEASE.id)
+    assert release is not None and release.page_count == 0
+    assert recleaner_job.run(release)
+
+    assert set(repository.page_counts) == {3}
+    assert repository.staged_pages == {}
+    assert repository.fold_count == 1
+    assert sorted(r.nca_number for r in repository.live_records[RELEASE.id]) == (
+        sorted(r.nca_number for r in expected.records)
+    )
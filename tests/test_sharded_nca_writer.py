@@ -0,0 +1,146 @@
+import threading
+from typing import List, Tuple
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.record import Record
+from src.core.entities.release import Release
+from src.core.use_cases.sharded_nca_writer import (
+    ShardedNCAWriter,
+    get_shard,
+    split_by_shard,
+)
+
+NCA_NUMBERS = [f"A-{i}" for i in range(20)]
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=8,
+)
+
+
+class FakeLoader:
+    """records the writer thread, nca numbers and page nums of each write"""
+
+    def __init__(self, writes: List[Tuple[str, List[str], List[int] | None]]):
+        self.writes = writes
+
+    def run(self, release, nca_data, batch_num, page_nums=None):
+        self.writes.append(
+            (
+                threading.current_thread().name,
+                [record.nca_number for record in nca_data.records],
+                page_nums,
+            )
+        )
+
+
+def create_writer(writes) -> ShardedNCAWriter:
+    return ShardedNCAWriter(
+        loader_factory=lambda: FakeLoader(writes),  # pyright: ignore
+        shard_count=4,
+    )
+
+
+def create_nca_data() -> NCAData:
+    return NCAData(
+        records=[
+            Record(
+                nca_number=nca_number,
+                nca_type="REG",
+                released_date="2026-01-02T00:00:00",
+                department="Department of Health",
+                purpose="personnel services",
+                release_id="id_2026",
+            )
+            for nca_number in NCA_NUMBERS
+        ],
+        allocations=[
+            Allocation(
+                nca_number=nca_number,
+                agency="Office of the Secretary",
+                operating_unit=operating_unit,
+                amount=1000.0,
+            )
+            for nca_number in NCA_NUMBERS
+            for operating_unit in ["Central Office", "Region I"]
+        ],
+    )
+
+
+def test_shard_is_stable():
+    # crc32, not the per-process salted hash()
+    assert get_shard("A-1", 4) == get_shard("A-1", 4) == 0
+    assert {get_shard(nca_number, 4) for nca_number in NCA_NUMBERS} == {
+        0,
+        1,
+        2,
+        3,
+    }
+
+
+def test_records_are_split_with_their_allocations():
+    nca_data = create_nca_data()
+
+    shards = split_by_shard(nca_data, 4)
+
+    for shard, shard_data in shards.items():
+        nca_numbers = {record.nca_number for record in shard_data.records}
+        assert {get_shard(nca_number, 4) for nca_number in nca_numbers} == {shard}
+        assert {
+            allocation.nca_number for allocation in shard_data.allocations
+        } == nca_numbers
+    assert sorted(
+        record.nca_number
+        for shard_data in shards.values()
+        for record in shard_data.records
+    ) == sorted(NCA_NUMBERS)
+    assert sum(
+        len(shard_data.allocations) for shard_data in shards.values()
+    ) == len(nca_data.allocations)
+
+
+def test_empty_shards_are_left_out():
+    nca_data = create_nca_data()
+    nca_data = NCAData(
+        records=nca_data.records[:1], allocations=nca_data.allocations[:2]
+    )
+
+    assert list(split_by_shard(nca_data, 4)) == [get_shard("A-0", 4)]
+
+
+def test_each_shard_is_written_by_its_own_writer():
+    writes = []
+    writer = create_writer(writes)
+    nca_data = create_nca_data()
+
+    writer.run(RELEASE, nca_data, 1, [1, 2, 3, 4])
+    writer.run(RELEASE, nca_data, 2, [5, 6, 7, 8])
+    writer.close()
+
+    assert len(writes) == 8
+    threads_by_shard = {}
+    for thread_name, nca_numbers, page_nums in writes:
+        shards = {get_shard(nca_number, 4) for nca_number in nca_numbers}
+        assert len(shards) == 1
+        threads_by_shard.setdefault(shards.pop(), set()).add(thread_name)
+        assert page_nums in ([1, 2, 3, 4], [5, 6, 7, 8])
+    # the same thread across batches, a different one per shard
+    assert all(len(threads) == 1 for threads in threads_by_shard.values())
+    assert len(set.union(*threads_by_shard.values())) == 4
+
+
+def test_staged_pages_follow_every_shard_of_the_batch():
+    writes = []
+    writer = create_writer(writes)
+    release = RELEASE.model_copy(update={"reload": True})
+
+    writer.run(release, create_nca_data(), 1, [1, 2, 3, 4])
+    writer.close()
+
+    # the shards stage their rows without pages, then the pages alone
+    assert [page_nums for _, _, page_nums in writes[:-1]] == [[]] * 4
+    assert writes[-1] == ("shard-0_0", [], [1, 2, 3, 4])
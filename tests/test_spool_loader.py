@@ -0,0 +1,189 @@
+from typing import Dict, List, Tuple
+
+import pytest
+
+from src.core.entities.allocation import Allocation
+from src.core.entities.nca_data import NCAData
+from src.core.entities.record import Record
+from src.core.entities.release import Release
+from src.core.use_cases.nca_data_spooler import NCADataSpooler
+from src.core.use_cases.spool_loader import SpoolLoader
+from src.infrastructure.adapters.local_storage import LocalStorage
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=4,
+)
+
+
+class FakeRepository:
+    def __init__(self):
+        self.loaded: List[Tuple[List[Record], List[Allocation]]] = []
+        self.staged: List[Tuple[int, List[int], List[Record]]] = []
+        self.merge_owners: Dict[str, str] = {}
+        self.swapped: List[str] = []
+        self.fold_count = 0
+
+    def claim_spool_merge(self, release_id, owner, lease_duration_s):
+        if self.merge_owners.get(release_id, owner) != owner:
+            return False
+        self.merge_owners[release_id] = owner
+        return True
+
+    def end_spool_merge(self, release_id, owner):
+        if self.merge_owners.get(release_id) == owner:
+            del self.merge_owners[release_id]
+
+    def fold_summaries(self):
+        self.fold_count += 1
+        return 0, 0, 0
+
+    def load_batch(self, records, allocations):
+        self.loaded.append((records, allocations))
+        return len(records), len(allocations)
+
+    def stage_batch(self, release, page_nums, records, allocations):
+        self.staged.append((release.page_count, page_nums, records))
+        return len(records), len(allocations), page_nums != []
+
+    def complete_staged_release(self, release):
+        self.swapped.append(release.id)
+        return True
+
+
+def create_nca_data(*nca_numbers: str) -> NCAData:
+    return NCAData(
+        records=[
+            Record(
+                nca_number=nca_number,
+                nca_type="REG",
+                released_date="2026-01-02T00:00:00",
+                department="Department of Health",
+                purpose="personnel services",
+                release_id=RELEASE.id,
+            )
+            for nca_number in nca_numbers
+        ],
+        allocations=[
+            Allocation(
+                nca_number=nca_number,
+                agency="Office of the Secretary",
+                operating_unit="Central Office",
+                amount=1000.0,
+            )
+            for nca_number in nca_numbers
+        ],
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(base_storage_path=str(tmp_path))
+
+
+def create_loader(storage, repository) -> SpoolLoader:
+    return SpoolLoader(
+        storage=storage,
+        repository=repository,
+        storage_prefix="spool",
+        load_rows=2,
+        lease_duration_s=60,
+    )
+
+
+def test_partial_spool_is_not_merged(storage):
+    spooler = NCADataSpooler(storage=storage, storage_prefix="spool")
+    repository = FakeRepository()
+    spooler.run(RELEASE, create_nca_data("A-1"), 1, [1, 2])
+
+    assert not create_loader(storage, repository).run(RELEASE.id)
+    assert repository.loaded == []
+    assert len(storage.list_files("spool/")) == 2
+    assert repository.fold_count == 0
+
+
+def test_complete_spool_is_merged_and_deleted(storage):
+    spooler = NCADataSpooler(storage=storage, storage_prefix="spool")
+    repository = FakeRepository()
+    spooler.run(RELEASE, create_nca_data("A-1", "A-2"), 1, [1, 2])
+    spooler.run(RELEASE, create_nca_data("A-3"), 2, [3, 4])
+
+    assert create_loader(storage, repository).run(RELEASE.id)
+
+    loaded = [r.nca_number for records, _ in repository.loaded for r in records]
+    assert loaded == ["A-1", "A-2", "A-3"]
+    assert repository.staged == []
+    assert storage.list_files("spool/") == []
+    assert repository.fold_count == 1
+
+
+def test_reload_is_staged_with_the_manifest_page_count(storage):
+    spooler = NCADataSpooler(storage=storage, storage_prefix="spool")
+    repository = FakeRepository()
+    release = RELEASE.model_copy(update={"reload": True})
+    spooler.run(release, create_nca_data("A-1", "A-2"), 1, [1, 2])
+    spooler.run(release, create_nca_data("A-3"), 2, [3, 4])
+
+    assert create_loader(storage, repository).run(release.id)
+
+    assert repository.loaded == []
+    assert [page_count for page_count, _, _ in repository.staged] == [4, 4, 4]
+    # only the last call stages the pages, then the release is swapped in
+    assert [page_nums for _, page_nums, _ in repository.staged] == [
+        [],
+        [],
+        [1, 2, 3, 4],
+    ]
+    assert repository.swapped == [release.id]
+
+
+def test_spool_without_manifest_is_not_merged(storage):
+    spooler = NCADataSpooler(storage=storage, storage_prefix="spool")
+    repository = FakeRepository()
+    spooler.run(RELEASE, create_nca_data("A-1"), 1, [1, 2, 3, 4])
+    storage.delete_file("spool/id_2026/release.json")
+
+    assert not create_loader(storage, repository).run(RELEASE.id, force=True)
+    assert repository.loaded == []
+
+
+def test_merge_leased_to_another_loader_is_skipped(storage):
+    spooler = NCADataSpooler(storage=storage, storage_prefix="spool")
+    repository = FakeRepository()
+    spooler.run(RELEASE, create_nca_data("A-1"), 1, [1, 2, 3, 4])
+    repository.merge_owners[RELEASE.id] = "another-loader"
+    loader = create_loader(storage, repository)
+
+    assert loader.is_complete(RELEASE.id)
+    assert not loader.run(RELEASE.id)
+    assert repository.loaded == []
+
+    del repository.merge_owners[RELEASE.id]
+    assert loader.run(RELEASE.id)
+    assert not loader.is_complete(RELEASE.id)
+    assert repository.merge_owners == {}
+
+
+def test_merge_that_lost_the_race_loads_nothing(storage):
+    spooler = NCADataSpooler(storage=storage, storage_prefix="spool")
+    repository = FakeRepository()
+    spooler.run(RELEASE, create_nca_data("A-1"), 1, [1, 2, 3, 4])
+    loader = create_loader(storage, repository)
+    other_loader = create_loader(storage, repository)
+
+    # the other loader merges between this one's check and its lease
+    claim_spool_merge = repository.claim_spool_merge
+
+    def claim_after_other_merge(release_id, owner, lease_duration_s):
+        repository.claim_spool_merge = claim_spool_merge
+        assert other_loader.run(release_id)
+        return claim_spool_merge(release_id, owner, lease_duration_s)
+
+    repository.claim_spool_merge = claim_after_other_merge
+
+    assert not loader.run(RELEASE.id)
+    assert len(repository.loaded) == 1
@@ -0,0 +1,77 @@
+import pytest
+
+from src.core.entities.release import Release
+from src.core.entities.release_batch import ReleaseBatch
+from src.infrastructure.adapters.sqlite_work_lease import SQLiteWorkLease
+
+RELEASE = Release(
+    id="id_2026",
+    title="NCA 2026",
+    url="https://example.com/nca_2026.pdf",
+    filename="nca_2026.pdf",
+    year=2026,
+    page_count=4,
+)
+BATCHES = [
+    ReleaseBatch(
+        batch_num=i, release=RELEASE, start_page_num=2 * i - 1, end_page_num=2 * i
+    )
+    for i in (1, 2)
+]
+
+
+@pytest.fixture
+def work_lease(tmp_path):
+    work_lease = SQLiteWorkLease(
+        db_path=str(tmp_path / "work_leases.db"), max_attempts=2
+    )
+    work_lease.add_batches(BATCHES)
+    return work_lease
+
+
+def test_chunks_are_claimed_once_in_page_order(work_lease):
+    first = work_lease.claim("worker-0", 60)
+    second = work_lease.claim("worker-1", 60)
+
+    assert first and second
+    assert [first.batch, second.batch] == BATCHES
+    assert work_lease.claim("worker-2", 60) is None
+    assert work_lease.count_remaining() == 2
+
+    assert work_lease.complete(first) and work_lease.complete(second)
+    assert work_lease.count_remaining() == 0
+
+
+def test_only_the_owner_renews_or_completes(work_lease):
+    lease = work_lease.claim("worker-0", 60)
+    assert lease
+    other = lease.model_copy(update={"worker_id": "worker-1"})
+
+    assert not work_lease.renew(other, 60)
+    assert not work_lease.complete(other)
+    assert work_lease.renew(lease, 60)
+
+
+def test_expired_lease_is_claimed_by_another_worker(work_lease):
+    lease = work_lease.claim("worker-0", -1)
+    assert lease
+
+    reclaimed = work_lease.claim("worker-1", 60)
+
+    assert reclaimed and reclaimed.id == lease.id and reclaimed.attempts == 2
+    assert not work_lease.renew(lease, 60)
+
+
+def test_released_lease_is_retried_then_failed(work_lease):
+    lease = work_lease.claim("worker-0", 60)
+    work_lease.claim("worker-0", 60)
+    assert lease
+
+    assert work_lease.release(lease)
+    retried = work_lease.claim("worker-1", 60)
+    assert retried and retried.id == lease.id
+
+    assert work_lease.release(retried)
+    assert work_lease.claim("worker-2", 60) is None
+    # the other chunk is still leased
+    assert work_lease.count_remaining() == 1